@@ -0,0 +1,110 @@
+"""Prediction-cache lookups: pooled WAL connections vs. the old
+connect-per-call pattern, with concurrent readers and a background writer.
+
+    python -m benchmarks.bench_cache_db --rows 5000 --lookups 20000 --threads 8
+"""
+import argparse
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from services import cache_db
+
+
+def _legacy_get(path, input_hash):
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    cursor.execute("SELECT result FROM salary_cache WHERE input_hash = ?", (input_hash,))
+    row = cursor.fetchone()
+    conn.close()
+    return row[0] if row else None
+
+
+def _legacy_save(path, input_hash, result):
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "INSERT OR REPLACE INTO salary_cache (input_hash, result, created_at) VALUES (?, ?, ?)",
+        (input_hash, result, str(datetime.now()))
+    )
+    conn.commit()
+    conn.close()
+
+
+def _keys(n):
+    return [hashlib.sha256(str(i).encode()).hexdigest() for i in range(n)]
+
+
+def _timed_readers(get, keys, lookups, threads, writer=None):
+    per_thread = lookups // threads
+    stop = threading.Event()
+    writes = [0]
+
+    def read(offset):
+        for i in range(per_thread):
+            get(keys[(offset + i * 7) % len(keys)])
+
+    def write():
+        i = 0
+        while not stop.is_set():
+            writer(f"w{i}", "₹1 - ₹2 per annum")
+            writes[0] += 1
+            i += 1
+
+    background = threading.Thread(target=write) if writer else None
+    if background:
+        background.start()
+    workers = [threading.Thread(target=read, args=(i * per_thread,)) for i in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    if background:
+        background.join()
+    return elapsed / (per_thread * threads) * 1e6, writes[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--lookups", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    keys = _keys(args.rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, "legacy.db")
+        conn = sqlite3.connect(legacy_path)
+        conn.execute(cache_db.SCHEMA)
+        conn.executemany(
+            "INSERT INTO salary_cache (input_hash, result) VALUES (?, ?)",
+            [(k, "₹6,00,000 - ₹8,50,000 per annum") for k in keys]
+        )
+        conn.commit()
+        conn.close()
+
+        pooled_path = os.path.join(tmp, "pooled.db")
+        cache_db.init_db(pooled_path)
+        cache_db.save_results([(k, "₹6,00,000 - ₹8,50,000 per annum") for k in keys], pooled_path)
+
+        cases = [
+            ("per-call connect", lambda k: _legacy_get(legacy_path, k),
+             lambda k, r: _legacy_save(legacy_path, k, r)),
+            ("pooled WAL", lambda k: cache_db.get_cached_result(k, pooled_path),
+             lambda k, r: cache_db.save_result(k, r, pooled_path)),
+        ]
+        for name, get, save in cases:
+            single, _ = _timed_readers(get, keys, args.lookups // 4, 1)
+            concurrent, writes = _timed_readers(get, keys, args.lookups, args.threads, writer=save)
+            print(f"{name:<18} 1 thread {single:8.1f} µs/lookup   "
+                  f"{args.threads} threads + writer {concurrent:8.1f} µs/lookup ({writes} writes)")
+
+
+if __name__ == "__main__":
+    main()
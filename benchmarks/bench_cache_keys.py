@@ -0,0 +1,65 @@
+"""Prediction-cache hit rate (and model calls) per experience bucket size.
+
+Replays a synthetic stream of Predict clicks: popular profiles from the
+dataset, experience typed at the form's 0.5 step or as free decimals, and
+the same numbers spelled differently ("4.5" vs 4.50). The legacy key is
+the raw-string hash generate_input_hash used before key version 2.
+
+    python -m benchmarks.bench_cache_keys --lookups 20000
+"""
+import argparse
+
+import numpy as np
+
+from services.cache_keys import PROFILE_COLUMNS, cache_key, legacy_key
+from services.dataset import load_dataset
+
+
+def _stream(data, n_lookups, seed):
+    rng = np.random.default_rng(seed)
+    combos = data[list(PROFILE_COLUMNS.values())].dropna().drop_duplicates().astype(str)
+    combos = combos.rename(columns={col: key for key, col in PROFILE_COLUMNS.items()}).to_dict("records")
+    # Zipf-like popularity: a few profiles are asked for far more often
+    weights = 1.0 / np.arange(1, len(combos) + 1)
+    picks = rng.choice(len(combos), n_lookups, p=weights / weights.sum())
+    max_years = float(data["YearsExperience"].max())
+    for pick in picks:
+        if rng.random() < 0.8:
+            years = float(np.round(rng.uniform(0, max_years) * 2) / 2)  # stepper
+        else:
+            years = float(np.round(rng.uniform(0, max_years), 1))  # typed
+        spelled = years if rng.random() < 0.5 else f"{years:.2f}"
+        yield dict(combos[pick], years_exp=spelled)
+
+
+def _replay(stream, key_fn):
+    seen, hits, lookups = set(), 0, 0
+    for profile in stream:
+        lookups += 1
+        key = key_fn(profile)
+        if key in seen:
+            hits += 1
+        else:
+            seen.add(key)
+    return hits / lookups, len(seen)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument("--buckets", type=float, nargs="+", default=[0, 0.5, 1, 2, 3, 5])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    data = load_dataset()
+    stream = list(_stream(data, args.lookups, args.seed))
+    hit_rate, calls = _replay(stream, legacy_key)
+    print(f"{'legacy raw key':<18} hit rate {hit_rate:6.1%}  model calls {calls:>6}")
+    for bucket in args.buckets:
+        hit_rate, calls = _replay(stream, lambda p: cache_key(p, "model", 1, bucket))
+        label = "exact (0.1 yr)" if bucket == 0 else f"{bucket:g} yr bands"
+        print(f"{label:<18} hit rate {hit_rate:6.1%}  model calls {calls:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Cold start: parsing the CSV vs. loading the memory-mapped Arrow snapshot.
+Each measurement runs in a fresh interpreter.
+
+    python -m benchmarks.bench_cold_start --sizes 10000 1000000 10000000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import write_csv
+
+_PROBE = """
+import json, sys, time
+from services import dataset
+start = time.perf_counter()
+frame = dataset.load_dataset(sys.argv[1])
+elapsed = time.perf_counter() - start
+mem = {}
+try:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(("RssAnon", "RssFile")):
+                key, value = line.split(":")
+                mem[key] = int(value.split()[0]) // 1024
+except OSError:
+    pass
+print(json.dumps({"seconds": elapsed, "rows": len(frame), "source": dataset.load_stats()["source"], **mem}))
+"""
+
+
+def _probe(csv_path, snapshot_enabled):
+    env = dict(os.environ, SALARY_SNAPSHOT="1" if snapshot_enabled else "0")
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE, csv_path], env=env, check=True,
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.sizes:
+            csv_path = os.path.join(tmp, f"salary_{rows}.csv")
+            start = time.perf_counter()
+            write_csv(csv_path, rows)
+            generated = time.perf_counter() - start
+
+            csv = _probe(csv_path, snapshot_enabled=False)
+            first = _probe(csv_path, snapshot_enabled=True)  # parses and writes the snapshot
+            snap = _probe(csv_path, snapshot_enabled=True)
+            assert snap["source"] == "snapshot" and snap["rows"] == rows
+
+            print(
+                f"{rows:>10,} rows (generated in {generated:.1f}s)\n"
+                f"    csv parse     {csv['seconds']:8.3f}s   private {csv.get('RssAnon', '?'):>6} MiB\n"
+                f"    csv + write   {first['seconds']:8.3f}s\n"
+                f"    snapshot      {snap['seconds']:8.3f}s   private {snap.get('RssAnon', '?'):>6} MiB"
+                f"   shared (mmap) {snap.get('RssFile', '?'):>6} MiB   speedup {csv['seconds'] / snap['seconds']:.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Sustained concurrent contribution throughput: append-only journal vs. the
+old read/concat/rewrite path. Run from the repo root:
+
+    python -m benchmarks.bench_contributions --threads 8 --per-thread 200
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import make_rows, write_csv
+from services import contributions
+
+
+def _legacy_append(row, path):
+    # The pre-journal Contribute handler; racing sessions can read a half-written file
+    try:
+        df = pd.read_csv(path)
+    except Exception:
+        return
+    df = pd.concat([df, pd.DataFrame([row])], ignore_index=True)
+    df.to_csv(path, index=False)
+
+
+def _run_threads(fn, path, threads, per_thread):
+    rows = make_rows(threads * per_thread, seed=1)
+
+    def worker(i):
+        for row in rows[i * per_thread:(i + 1) * per_thread]:
+            fn(row, path)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return time.perf_counter() - start
+
+
+def _process_worker(path, seed, count):
+    for row in make_rows(count, seed=seed):
+        contributions.append_row(row, path)
+
+
+def _run_processes(path, processes, per_process):
+    procs = [
+        multiprocessing.Process(target=_process_worker, args=(path, 100 + i, per_process))
+        for i in range(processes)
+    ]
+    start = time.perf_counter()
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    return time.perf_counter() - start
+
+
+def _count_rows(path):
+    contributions.compact(path)
+    return len(pd.read_csv(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-rows", type=int, default=10_000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--per-thread", type=int, default=200)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--legacy-per-thread", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_csv(os.path.join(tmp, "journal.csv"), args.base_rows)
+        elapsed = _run_threads(lambda row, p: contributions.append_row(row, p), path, args.threads, args.per_thread)
+        total = args.threads * args.per_thread
+        print(f"journal  threads={args.threads:<3} rows={total:<6} {total / elapsed:10.0f} rows/s  "
+              f"kept {_count_rows(path) - args.base_rows}/{total}")
+
+        path = write_csv(os.path.join(tmp, "procs.csv"), args.base_rows)
+        elapsed = _run_processes(path, args.processes, args.per_thread)
+        total = args.processes * args.per_thread
+        print(f"journal  procs={args.processes:<5} rows={total:<6} {total / elapsed:10.0f} rows/s  "
+              f"kept {_count_rows(path) - args.base_rows}/{total}")
+
+        path = write_csv(os.path.join(tmp, "legacy.csv"), args.base_rows)
+        elapsed = _run_threads(_legacy_append, path, args.threads, args.legacy_per_thread)
+        total = args.threads * args.legacy_per_thread
+        try:
+            kept = len(pd.read_csv(path)) - args.base_rows
+        except Exception:
+            kept = "corrupt"
+        print(f"rewrite  threads={args.threads:<3} rows={total:<6} {total / elapsed:10.0f} rows/s  "
+              f"kept {kept}/{total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Bulk upload ingestion: rows/s and peak memory for growing upload sizes.
+
+Each size runs in a fresh process against the same dataset, so the peak
+RSS figures are comparable; with chunked streaming they should stay flat
+as the upload grows.
+
+    python -m benchmarks.bench_ingest --dataset-rows 100000 --upload-rows 100000 1000000 4000000
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+
+from benchmarks.synthetic import make_frame, write_csv
+
+
+def _write_upload(path, n_rows, chunk=500_000):
+    # Written in pieces so the benchmark itself never holds the whole file
+    for i, start in enumerate(range(0, n_rows, chunk)):
+        make_frame(min(chunk, n_rows - start), seed=100 + i).to_csv(
+            path, mode="a" if i else "w", header=not i, index=False
+        )
+
+
+def _peak_rss_mb():
+    # VmHWM starts afresh at exec; ru_maxrss would carry over the parent's peak
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run(csv_path, upload, chunk_rows, dry_run, results):
+    from services import dataset, ingest
+    dataset.load_dataset(csv_path)
+    ingest.existing_hashes(dataset.load_dataset(csv_path))
+    before = _peak_rss_mb()
+    report = ingest.ingest(upload, csv_path, dry_run=dry_run, chunk_rows=chunk_rows)
+    peak = _peak_rss_mb()
+    results.put((report.as_dict(), before, peak))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dataset-rows", type=int, default=100_000)
+    parser.add_argument("--upload-rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--chunk-rows", type=int, default=50_000)
+    parser.add_argument("--append", action="store_true", help="append the accepted rows (default: dry run)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="salary-ingest-")
+    try:
+        source = write_csv(os.path.join(workdir, "dataset.csv"), args.dataset_rows, seed=1)
+        ctx = multiprocessing.get_context("spawn")
+        print(f"dataset {args.dataset_rows:,} rows, chunks of {args.chunk_rows:,}")
+        for n in args.upload_rows:
+            csv_path = os.path.join(workdir, "Employee_Salary_Data.csv")
+            shutil.copyfile(source, csv_path)
+            for suffix in (".journal", ".arrow"):
+                if os.path.exists(csv_path + suffix):
+                    os.remove(csv_path + suffix)
+            upload = os.path.join(workdir, "upload.csv")
+            _write_upload(upload, n)
+            results = ctx.Queue()
+            process = ctx.Process(target=_run, args=(csv_path, upload, args.chunk_rows, not args.append, results))
+            process.start()
+            report, before, peak = results.get()
+            process.join()
+            size_mb = os.path.getsize(upload) / 2 ** 20
+            print(f"{n:>10,} rows ({size_mb:6.0f} MB)  {report['rows_per_second']:>9,.0f} rows/s  "
+                  f"{report['accepted']:>10,} accepted  peak RSS {peak:6.1f} MB "
+                  f"(dataset loaded: {before:.1f} MB)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
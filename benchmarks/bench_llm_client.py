@@ -0,0 +1,68 @@
+"""Burst load test of the async model client against a local fake server.
+
+The fake server has its own per-second quota and answers 429 above it.
+"with limiter" paces requests to that quota; "no limiter" fires at will
+and relies on retries alone.
+
+    python -m benchmarks.bench_llm_client --requests 300 --quota 20
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from services.llm_client import AsyncLLMClient, BudgetExceeded, FakeBackend
+
+
+async def _burst(client, n_requests, budget):
+    latencies, outcomes = [], {"ok": 0, "budget_exceeded": 0, "failed": 0}
+
+    async def one(i):
+        start = time.monotonic()
+        try:
+            await client.generate(f"profile {i}", budget=budget)
+            outcomes["ok"] += 1
+            latencies.append(time.monotonic() - start)
+        except BudgetExceeded:
+            outcomes["budget_exceeded"] += 1
+        except Exception:
+            outcomes["failed"] += 1
+
+    start = time.monotonic()
+    await asyncio.gather(*(one(i) for i in range(n_requests)))
+    return time.monotonic() - start, latencies, outcomes
+
+
+def run(label, args, rate_per_minute, burst):
+    backend = FakeBackend(latency=args.latency, quota_per_second=args.quota,
+                          error_rate=args.error_rate, seed=1)
+    client = AsyncLLMClient(backend, rate_per_minute=rate_per_minute, burst=burst,
+                            max_retries=args.retries, budget=args.budget, seed=1)
+    elapsed, latencies, outcomes = asyncio.run(_burst(client, args.requests, args.budget))
+    p50, p99 = np.percentile(latencies, [50, 99]) if latencies else (float("nan"),) * 2
+    print(f"{label:<14} ok={outcomes['ok']:>4} over_budget={outcomes['budget_exceeded']:>4} "
+          f"failed={outcomes['failed']:>3}  p50={p50:6.2f}s p99={p99:6.2f}s  "
+          f"throughput={outcomes['ok'] / elapsed:6.1f}/s  upstream calls={backend.received:>5} "
+          f"429s={backend.rejected:>5} retries={client.stats['retries']:>5}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--quota", type=int, default=20, help="fake server requests/second")
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--retries", type=int, default=6)
+    parser.add_argument("--budget", type=float, default=30.0)
+    args = parser.parse_args()
+
+    print(f"burst of {args.requests} requests, server quota {args.quota}/s, budget {args.budget:.0f}s")
+    # Any one-second window sees at most burst + rate requests: keep it at the quota
+    burst = max(1, args.quota // 5)
+    run("with limiter", args, rate_per_minute=(args.quota - burst) * 60, burst=burst)
+    run("no limiter", args, rate_per_minute=1e9, burst=10**9)
+
+
+if __name__ == "__main__":
+    main()
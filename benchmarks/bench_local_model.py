@@ -0,0 +1,112 @@
+"""Local salary model vs. the cached LLM path: latency and accuracy.
+
+    python -m benchmarks.bench_local_model                    # real CSV
+    python -m benchmarks.bench_local_model --synthetic 200000 # synthetic data
+"""
+import argparse
+import os
+import re
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_frame
+from services import cache_db
+from services.dataset import CSV_FILE
+from services.local_model import PROFILE_KEYS, SalaryModel
+from services.prediction_cache import generate_input_hash
+
+_AMOUNT = re.compile(r"₹\s*([\d,]+)")
+
+
+def _profile(row):
+    profile = {key: row[field] for field, key in PROFILE_KEYS.items()}
+    profile["years_exp"] = row["YearsExperience"]
+    return profile
+
+
+def _per_call_us(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def _cross_validate(frame, folds=5, seed=0):
+    order = np.random.default_rng(seed).permutation(len(frame))
+    errors, covered = [], []
+    for k in range(folds):
+        test_idx = order[k::folds]
+        train = frame.drop(frame.index[test_idx])
+        model = SalaryModel().fit(train)
+        for _, row in frame.iloc[test_idx].iterrows():
+            point, low, high = model.predict(_profile(row))
+            actual = float(row["Salary (in INR)"])
+            errors.append(abs(point - actual))
+            covered.append(low <= actual <= high)
+    return float(np.mean(errors)), float(np.mean(covered))
+
+
+def _llm_accuracy(frame, db_path):
+    # Midpoint of any cached Gemini answer for the dataset's own profiles
+    if not os.path.exists(db_path):
+        return None
+    hashes = [generate_input_hash(**_profile(row)) for _, row in frame.iterrows()]
+    found = cache_db.get_cached_results(set(hashes), path=db_path)
+    errors = []
+    for input_hash, (_, row) in zip(hashes, frame.iterrows()):
+        amounts = [int(a.replace(",", "")) for a in _AMOUNT.findall(found.get(input_hash, ""))]
+        if len(amounts) >= 2:
+            errors.append(abs((amounts[0] + amounts[1]) / 2 - float(row["Salary (in INR)"])))
+    return (float(np.mean(errors)), len(errors)) if errors else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--synthetic", type=int, default=0, help="Rows of synthetic data instead of the CSV")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    frame = make_frame(args.synthetic) if args.synthetic else pd.read_csv(CSV_FILE)
+    print(f"dataset: {len(frame)} rows")
+
+    start = time.perf_counter()
+    model = SalaryModel().fit(frame)
+    print(f"full fit              {(time.perf_counter() - start) * 1000:10.1f} ms")
+
+    row = frame.iloc[0]
+    profile = _profile(row)
+    # What a contribution costs: the appended delta is fitted into the model
+    delta = frame.iloc[:1]
+    print(f"incremental update    {_per_call_us(lambda: model.fit(delta), 200):10.1f} µs/row")
+    print(f"local predict         {_per_call_us(lambda: model.predict_text(profile), args.repeat):10.1f} µs")
+
+    # Cached LLM path: the same two-tier lookup the Prediction page does
+    tmp = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(tmp, "salary_cache.db")
+        cache_db.init_db(db_path)
+        input_hash = generate_input_hash(**profile)
+        cache_db.save_result(input_hash, "₹6,00,000 - ₹8,50,000 per annum", db_path)
+        print(f"cached LLM (sqlite)   "
+              f"{_per_call_us(lambda: cache_db.get_cached_result(input_hash, db_path), args.repeat):10.1f} µs")
+    finally:
+        shutil.rmtree(tmp)
+    print("uncached LLM          network round trip, typically 1-5 s")
+
+    sample = frame if len(frame) <= 20_000 else frame.sample(20_000, random_state=0)
+    mae, coverage = _cross_validate(sample.reset_index(drop=True))
+    print(f"local model 5-fold    MAE ₹{mae:,.0f}   80% range covers {coverage:.0%} of actuals")
+
+    llm = None if args.synthetic else _llm_accuracy(frame, cache_db.DB_FILE)
+    if llm:
+        print(f"cached LLM answers    MAE ₹{llm[0]:,.0f} over {llm[1]} dataset profiles (range midpoint)")
+    else:
+        print("cached LLM answers    none cached for dataset profiles; run services.batch on the CSV first")
+
+
+if __name__ == "__main__":
+    main()
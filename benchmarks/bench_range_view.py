@@ -0,0 +1,87 @@
+"""Home "Range" view: vectorized range_view() vs. the previous
+apply/lambda implementation.
+
+    python -m benchmarks.bench_range_view --rows 1000000 --bucket 2
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import make_frame
+from services.aggregations import range_view
+
+OPTIONAL_FIELDS = ["Education Level", "Location", "Employment Type", "Company Size", "Remote"]
+
+
+# The Range branch of routes/home.py before vectorization, verbatim
+def legacy_range_view(data, bucket_size, group_selections):
+    data["YearsExperience_Float"] = pd.to_numeric(data["YearsExperience"], errors="coerce")
+
+    def get_dynamic_range(x, bucket):
+        if pd.isna(x):
+            return "Unknown"
+        lower = int((x // bucket) * bucket)
+        upper = lower + bucket
+        return f"{lower}-{upper} Years"
+
+    def get_dynamic_sort_key(x):
+        if x == "Unknown":
+            return -1
+        return int(x.split("-")[0])
+
+    data["Experience_Range"] = data["YearsExperience_Float"].apply(lambda x: get_dynamic_range(x, bucket_size))
+    data["Experience_Range_Sort"] = data["Experience_Range"].apply(get_dynamic_sort_key)
+
+    group_cols = ["Experience_Range", "Job Title", "Industry"] + group_selections
+
+    grouped = data.groupby(group_cols).agg(
+        Avg_Salary=pd.NamedAgg(column="Salary (in INR)", aggfunc=lambda x: round(x.astype(float).mean(), 1)),
+        Grouped=pd.NamedAgg(column="Salary (in INR)", aggfunc="count"),
+        Sort_Key=pd.NamedAgg(column="Experience_Range_Sort", aggfunc="first")
+    ).reset_index()
+
+    grouped = grouped[grouped["Experience_Range"] != "Unknown"]
+    return grouped.sort_values(by="Sort_Key").drop(columns=["Sort_Key"])
+
+
+def _best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def _same(a, b, keys):
+    a = a.assign(Experience_Range=a["Experience_Range"].astype(str)).sort_values(keys).reset_index(drop=True)
+    b = b.assign(Experience_Range=b["Experience_Range"].astype(str)).sort_values(keys).reset_index(drop=True)
+    return (
+        len(a) == len(b)
+        and (a[keys].astype(str).to_numpy() == b[keys].astype(str).to_numpy()).all()
+        and ((a["Avg_Salary"] - b["Avg_Salary"]).abs() < 0.11).all()
+        and (a["Grouped"].to_numpy() == b["Grouped"].to_numpy()).all()
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--bucket", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    frame = make_frame(args.rows)
+    for groups in ([], OPTIONAL_FIELDS):
+        keys = ["Experience_Range", "Job Title", "Industry"] + groups
+        fast, result = _best_of(lambda: range_view(frame, args.bucket, groups), args.repeat)
+        # The legacy code mutates its input, so give it a private copy
+        slow, expected = _best_of(lambda: legacy_range_view(frame.copy(), args.bucket, groups), 1)
+        print(f"{args.rows} rows, {len(groups) + 2} group fields: legacy {slow:7.2f}s  "
+              f"vectorized {fast:7.3f}s  speedup {slow / fast:6.1f}x  "
+              f"groups={len(result)} identical={_same(result, expected, keys)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Sessions served per second with 1..N worker processes (serve.py layout).
+
+Every worker process runs complete app sessions through Streamlit's
+AppTest: the Home page, then a prediction answered by the local model, and
+every --contribute-every sessions a contribution. Workers share the
+coordinator (shared prediction-cache tier, single contribution writer) and
+map the same dataset snapshot, as they do under serve.py. Scaling is
+reported against the single-worker rate; it can only be near-linear up to
+the number of cores the machine has.
+
+    python -m benchmarks.bench_serving --workers 1 2 4 --seconds 20 --rows 100000
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import secrets
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import write_csv
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+def _session(rng, contribute):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=120).run()
+    at.sidebar.radio[0].set_value("Prediction").run()
+    at.number_input[0].set_value(round(rng.uniform(0, 15) * 2) / 2)
+    [b for b in at.button if b.label == "Predict"][0].click().run()
+    if contribute:
+        at.sidebar.radio[0].set_value("Contribute").run()
+        [b for b in at.button if b.label == "Add Data"][0].click().run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+
+
+def _worker(workdir, seconds, contribute_every, barrier, results, seed):
+    os.chdir(workdir)
+    rng = random.Random(seed)
+    _session(rng, False)  # warm-up: imports, snapshot map, index and model builds
+    barrier.wait()
+    sessions = 0
+    cpu = time.process_time()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        sessions += 1
+        _session(rng, contribute_every and sessions % contribute_every == 0)
+    results.put((sessions, time.process_time() - cpu))
+
+
+def _coordinator_up(address, authkey):
+    from services.coordinator import ServiceManager, parse_address
+    try:
+        ServiceManager(address=parse_address(address), authkey=authkey.encode()).connect()
+        return True
+    except OSError:
+        return False
+
+
+def run(n_workers, workdir, seconds, contribute_every):
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(n_workers + 1)
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=_worker, args=(workdir, seconds, contribute_every, barrier, results, i))
+        for i in range(n_workers)
+    ]
+    for process in processes:
+        process.start()
+    barrier.wait()
+    start = time.monotonic()
+    outcomes = [results.get() for _ in processes]
+    elapsed = time.monotonic() - start
+    for process in processes:
+        process.join()
+    sessions = sum(n for n, _ in outcomes)
+    cpu = sum(c for _, c in outcomes)
+    return sessions / elapsed, cpu / max(sessions, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--contribute-every", type=int, default=10, help="0 disables contributions")
+    parser.add_argument("--service", default="127.0.0.1:8698")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="salary-serving-")
+    write_csv(os.path.join(workdir, "Employee_Salary_Data.csv"), args.rows, seed=1)
+    authkey = secrets.token_hex(16)
+    # Inherited by the coordinator and the (spawned) workers
+    os.environ.update(
+        SALARY_SERVICE_ADDR=args.service, SALARY_SERVICE_KEY=authkey,
+        SALARY_CACHE_DB=os.path.join(workdir, "cache.db"), LOCAL_MODEL_MODE="serve", SALARY_METRICS="0",
+    )
+    coordinator = subprocess.Popen(
+        [sys.executable, "-m", "services.coordinator", "--address", args.service],
+        cwd=workdir, env=dict(os.environ, PYTHONPATH=os.path.dirname(APP)), stdout=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 60
+        while not _coordinator_up(args.service, authkey):
+            if time.monotonic() > deadline:
+                raise RuntimeError("coordinator did not start")
+            time.sleep(0.2)
+
+        cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+        print(f"{args.rows:,} rows, {cores} core(s) available, {args.seconds:g}s per run")
+        baseline = None
+        for n in args.workers:
+            rate, cpu_per_session = run(n, workdir, args.seconds, args.contribute_every)
+            baseline = baseline or rate / n
+            print(f"{n:>2} workers  {rate:7.2f} sessions/s  {rate / n:6.2f} per worker  "
+                  f"{cpu_per_session * 1000:7.1f} ms CPU/session  scaling {rate / (baseline * n):5.0%}")
+    finally:
+        coordinator.terminate()
+        coordinator.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
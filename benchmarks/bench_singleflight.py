@@ -0,0 +1,69 @@
+"""N concurrent identical Predict submissions must cost exactly one model
+call. Exits non-zero if the single-flight registry lets duplicates through.
+
+    python -m benchmarks.bench_singleflight --sessions 50
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Keep the real salary_cache.db out of this run
+os.environ["SALARY_CACHE_DB"] = os.path.join(tempfile.mkdtemp(), "salary_cache.db")
+
+from routes import prediction  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+    prediction.prediction_cache.startup()  # app.py does this at process start
+
+    calls = []
+    calls_lock = threading.Lock()
+
+    def fake_gemini(prompt):
+        with calls_lock:
+            calls.append(prompt)
+        time.sleep(args.latency)
+        return "₹6,00,000 - ₹8,50,000 per annum"
+
+    prediction.call_gemini = fake_gemini
+    input_hash = prediction.generate_input_hash(
+        "Data Scientist", "Full-time", "SaaS", "Large", 4.5, "Yes", "Pune", "Masters"
+    )
+
+    barrier = threading.Barrier(args.sessions)
+    results = []
+
+    def session():
+        barrier.wait()
+        # Same path as show(): cache miss, then join or start the flight
+        if prediction.prediction_cache.get(input_hash) is None:
+            future = prediction._inflight.submit(
+                input_hash, prediction.predict_and_cache, input_hash, "prompt"
+            )
+            results.append(future.result(timeout=10))
+        else:
+            results.append(prediction.prediction_cache.get(input_hash))
+
+    threads = [threading.Thread(target=session) for _ in range(args.sessions)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.sessions} concurrent sessions -> {len(calls)} model call(s), "
+          f"{len(set(results))} distinct result(s), {elapsed:.2f}s total")
+    if len(calls) != 1 or len(results) != args.sessions or len(set(results)) != 1:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
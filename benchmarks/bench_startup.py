@@ -0,0 +1,133 @@
+"""Cold start profile: what each page imports on its first render, and what
+that costs, with a budget check for CI.
+
+Every page is rendered once (through Streamlit's AppTest) in a fresh
+interpreter started with `-X importtime`. Streamlit and AppTest are imported
+before the measurement starts, so the report covers only what the app pulls
+in. The app runs in a temp dir on a copy of the dataset, with its own cache
+DB, so nothing is written next to the real data. The exit status is 1 when
+a page imports more than its budget or loads a module it must not need yet.
+
+    python -m benchmarks.bench_startup                    # report and check
+    python -m benchmarks.bench_startup --top 25 --budget-ms Home=800
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from collections import Counter
+
+from services.dataset import CSV_FILE
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MARKER = "--- app start ---"
+
+# Import time (ms, sum of every module's own import time) allowed per page,
+# about twice what a laptop measures, so only real regressions fail
+BUDGET_MS = {"Home": 1500, "Prediction": 1000, "Contribute": 1000}
+# Modules that must stay out of a page's first render
+FORBIDDEN = {
+    "Home": ["google.generativeai", "routes.prediction", "routes.contribute"],
+    "Prediction": ["google.generativeai", "matplotlib.pyplot", "routes.home", "routes.contribute"],
+    "Contribute": ["google.generativeai", "matplotlib.pyplot", "routes.home", "routes.prediction"],
+}
+
+_PROBE = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+print({marker!r}, file=sys.stderr, flush=True)
+start = time.perf_counter()
+at = AppTest.from_file({app!r}, default_timeout=300)
+# First render straight on the page (the navigation radio's key is "nav")
+at.session_state["nav"] = {page!r}
+at.run()
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "error": str(at.exception[0].value) if at.exception else None}}))
+"""
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def _profile(page, env, workdir):
+    probe = _PROBE.format(marker=MARKER, app=os.path.join(ROOT, "app.py"), page=page)
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe], cwd=workdir, env=env,
+        capture_output=True, text=True, check=True,
+    )
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    lines = out.stderr.splitlines()
+    modules = []
+    for line in lines[lines.index(MARKER) + 1:]:
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append((name, int(self_us), int(cumulative_us)))
+    return result, modules
+
+
+def _owner(name):
+    # The app's own modules are listed one by one, libraries per package
+    root = name.split(".")[0]
+    return name if root in ("services", "routes") else root
+
+
+def _check(args, budgets, env, workdir):
+    failures = []
+    for page in args.pages:
+        result, modules = _profile(page, env, workdir)
+        total_ms = sum(self_us for _, self_us, _ in modules) / 1000
+        loaded = {name for name, _, _ in modules}
+        print(f"{page}: first render {result['seconds'] * 1000:.0f} ms, "
+              f"{len(modules)} modules imported in {total_ms:.0f} ms (budget {budgets[page]:.0f} ms)")
+        # Own import time (nested imports excluded) summed per package
+        cost = Counter()
+        count = Counter()
+        for name, self_us, _ in modules:
+            cost[_owner(name)] += self_us
+            count[_owner(name)] += 1
+        for owner, us in cost.most_common(args.top):
+            print(f"    {us / 1000:8.1f} ms  {owner} ({count[owner]} modules)")
+        if result["error"]:
+            failures.append(f"{page}: render failed: {result['error']}")
+        if total_ms > budgets[page]:
+            failures.append(f"{page}: imports took {total_ms:.0f} ms, budget {budgets[page]:.0f} ms")
+        for name in FORBIDDEN.get(page, []):
+            if name in loaded:
+                failures.append(f"{page}: imported {name} on its first render")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", nargs="+", default=list(BUDGET_MS))
+    parser.add_argument("--top", type=int, default=10, help="heaviest packages to list")
+    parser.add_argument("--budget-ms", nargs="*", default=[], metavar="PAGE=MS", help="override a page's budget")
+    args = parser.parse_args()
+
+    budgets = dict(BUDGET_MS)
+    for item in args.budget_ms:
+        page, _, ms = item.partition("=")
+        budgets[page] = float(ms)
+    # The dataset path is relative to the working directory: the app finds
+    # the copy, and its snapshot, journal and lock files land beside it
+    workdir = tempfile.mkdtemp(prefix="salary-startup-")
+    shutil.copy2(os.path.join(ROOT, CSV_FILE), workdir)
+    env = dict(os.environ, PYTHONPATH=ROOT, SALARY_METRICS="0",
+               SALARY_CACHE_DB=os.path.join(workdir, "cache.db"))
+    env.pop("SALARY_SERVICE_ADDR", None)
+    try:
+        failures = _check(args, budgets, env, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Home "Show Data" table: full filtered frame vs. one server-side page.
+
+Payload is the Arrow IPC size st.dataframe would ship to the browser.
+
+    python -m benchmarks.bench_table --rows 1000000 10000000
+"""
+import argparse
+import time
+
+import pyarrow as pa
+
+from benchmarks.synthetic import make_frame
+from services.dataset import apply_schema, format_for_display
+from services.filter_index import FilterIndex
+from services.table import SortIndex, page_bounds, window
+
+SELECTIONS = [
+    {},
+    {"Location": "Pune"},
+    {"Location": "Pune", "Remote": "Yes", "Company Size": "MNC"},
+]
+
+
+def _payload(frame):
+    sink = pa.BufferOutputStream()
+    table = pa.Table.from_pandas(frame)
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().size
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--legacy-max-rows", type=int, default=1_000_000,
+                        help="skip the full-frame path above this size")
+    args = parser.parse_args()
+
+    for n_rows in args.rows:
+        data, _ = apply_schema(make_frame(n_rows))
+        index, sort_index = FilterIndex(data), SortIndex(data)
+        sort_index.rank("Salary (in INR)", ascending=False)  # warm, as after the first request
+        for selections in SELECTIONS:
+            label = ",".join(f"{k}={v}" for k, v in selections.items()) or "no filter"
+
+            def page():
+                positions = index.filter(selections)
+                _, _, start, stop = page_bounds(len(positions), 3, args.page_size)
+                positions = sort_index.sort(positions, "Salary (in INR)", ascending=False, limit=stop)
+                return format_for_display(window(data, positions, start, stop))
+
+            paged_s, rows = _timed(page)
+            line = (f"{n_rows:>9} rows  {label:<40} page {paged_s * 1000:7.1f} ms "
+                    f"{_payload(rows) / 1024:8.1f} KiB")
+            if n_rows <= args.legacy_max_rows:
+                full_s, full = _timed(lambda: format_for_display(
+                    index.select(data, selections).sort_values("Salary (in INR)", ascending=False)))
+                line += f"   | full {full_s * 1000:8.1f} ms {_payload(full) / 1024:10.1f} KiB"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,425 @@
+"""Benchmark suite: the app's real code paths on synthetic datasets.
+
+Every case runs offline (Gemini is replaced by the stub client, the cache
+DB and contribution files live in a temp dir). Results go to a JSON file;
+with --baseline each case is compared to a saved run and the exit status
+is 1 when something got slower than the tolerance allows.
+
+    python -m benchmarks.run --sizes 10000 100000 1000000 -o bench-results.json
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json --tolerance 0.25
+    python -m benchmarks.run --cases "home.*" "load.*" --sizes 10000000
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+# Keep the cache DB away from the real salary_cache.db; must happen before
+# services.cache_db is imported
+_WORKDIR = tempfile.mkdtemp(prefix="salary-bench-")
+os.environ["SALARY_CACHE_DB"] = os.path.join(_WORKDIR, "cache.db")
+os.environ.setdefault("SALARY_METRICS", "0")
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from benchmarks.synthetic import make_rows, write_csv  # noqa: E402
+from services import cache_db, chart_cache, contributions, dataset, ingest, local_model, prediction_cache, snapshot  # noqa: E402
+from services.aggregations import range_view  # noqa: E402
+from services.dataset import format_for_display  # noqa: E402
+from services.filter_index import FILTER_FIELDS, FilterIndex, get_index  # noqa: E402
+from services.gemini import StubClient, build_prompt  # noqa: E402
+from services.prediction_cache import generate_input_hash  # noqa: E402
+from services.table import SortIndex, page_bounds, window  # noqa: E402
+
+CASES = []
+RANGE_FIELDS = ["Education Level", "Location", "Employment Type", "Company Size", "Remote"]
+SELECTIONS = [
+    {},
+    {"Location": "Pune"},
+    {"Location": "Pune", "Remote": "Yes", "Company Size": "MNC"},
+]
+
+
+class Context:
+    # One synthetic dataset (CSV on disk + loaded typed frame) per size
+    def __init__(self, rows, data_dir):
+        self.rows = rows
+        self.csv_path = os.path.join(data_dir, f"salary_{rows}.csv")
+        if not os.path.exists(self.csv_path):
+            write_csv(self.csv_path, rows, seed=rows)
+        self._data = None
+
+    @property
+    def data(self):
+        if self._data is None:
+            enabled = snapshot.ENABLED
+            snapshot.ENABLED = False
+            try:
+                dataset.invalidate()
+                self._data = dataset.load_dataset(self.csv_path)
+            finally:
+                snapshot.ENABLED = enabled
+        return self._data
+
+
+# 👉 Register a case. setup(ctx) returns the operation to time; `ops` is how
+# many logical operations one call performs (timings are reported per op).
+# Cases with sized=False do not depend on the dataset and run once.
+def case(name, ops=1, sized=True, repeat=None):
+    def register(setup):
+        CASES.append({"name": name, "setup": setup, "ops": ops, "sized": sized, "repeat": repeat})
+        return setup
+    return register
+
+
+@case("load.csv_parse", repeat=3)
+def _load_csv(ctx):
+    def run():
+        enabled = snapshot.ENABLED
+        snapshot.ENABLED = False
+        try:
+            dataset.invalidate()
+            dataset.load_dataset(ctx.csv_path)
+        finally:
+            snapshot.ENABLED = enabled
+    return run
+
+
+@case("load.snapshot")
+def _load_snapshot(ctx):
+    if not snapshot.ENABLED:
+        return None
+    dataset.invalidate()
+    dataset.load_dataset(ctx.csv_path)  # writes the snapshot
+
+    def run():
+        dataset.invalidate()
+        dataset.load_dataset(ctx.csv_path)
+    return run
+
+
+@case("load.format_page")
+def _format_page(ctx):
+    data = ctx.data
+    return lambda: format_for_display(window(data, None, 0, 100))
+
+
+@case("options.index_build")
+def _options_build(ctx):
+    data = ctx.data
+    return lambda: FilterIndex(data)
+
+
+@case("options.extract", ops=len(FILTER_FIELDS))
+def _options_extract(ctx):
+    index = FilterIndex(ctx.data)
+    return lambda: [index.options(field) for field in FILTER_FIELDS]
+
+
+@case("home.default_view", ops=len(SELECTIONS))
+def _default_view(ctx):
+    data = ctx.data
+    index, sort_index = FilterIndex(data), SortIndex(data)
+    sort_index.rank("Salary (in INR)", ascending=False)
+
+    def run():
+        for selections in SELECTIONS:
+            positions = index.filter(selections)
+            _, _, start, stop = page_bounds(len(positions), 2, 100)
+            positions = sort_index.sort(positions, "Salary (in INR)", ascending=False, limit=stop)
+            format_for_display(window(data, positions, start, stop))
+    return run
+
+
+@case("home.sort_index_build")
+def _sort_build(ctx):
+    data = ctx.data
+    return lambda: SortIndex(data).rank("Salary (in INR)", ascending=False)
+
+
+@case("home.range_view_2_fields")
+def _range_2(ctx):
+    data = ctx.data
+    return lambda: range_view(data, 2, [])
+
+
+@case("home.range_view_7_fields")
+def _range_7(ctx):
+    data = ctx.data
+    return lambda: range_view(data, 2, RANGE_FIELDS)
+
+
+def _threaded(worker, threads, per_thread):
+    errors = []
+
+    def target(offset):
+        try:
+            for i in range(per_thread):
+                worker(offset * per_thread + i)
+        except Exception as e:  # surfaced after join
+            errors.append(e)
+
+    pool = [threading.Thread(target=target, args=(t,)) for t in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+@case("cache_db.get_concurrent", ops=8 * 500, sized=False)
+def _cache_get(ctx):
+    cache_db.init_db()
+    keys = [f"bench-{i}" for i in range(5000)]
+    cache_db.save_results([(key, "₹6,00,000 - ₹8,50,000 per annum") for key in keys])
+    return lambda: _threaded(lambda i: cache_db.get_cached_result(keys[(i * 7) % len(keys)]), 8, 500)
+
+
+@case("cache_db.save_concurrent", ops=8 * 50, sized=False)
+def _cache_save(ctx):
+    cache_db.init_db()
+    counter = iter(range(10**9))
+    return lambda: _threaded(
+        lambda i: cache_db.save_result(f"bench-save-{next(counter)}", "₹6,00,000 - ₹8,50,000 per annum"), 8, 50
+    )
+
+
+@case("prediction.miss_with_stub", ops=200, sized=False)
+def _prediction_miss(ctx):
+    cache_db.init_db()
+    client = StubClient()
+    rows = make_rows(200, seed=7)
+    counter = iter(range(10**9))
+
+    def run():
+        run_id = next(counter)
+        for row in rows:
+            profile = {
+                "job_title": f"{row['Job Title']} {run_id}", "industry": row["Industry"],
+                "employment_type": row["Employment Type"], "company_size": row["Company Size"],
+                "years_exp": row["YearsExperience"], "remote": row["Remote"],
+                "location": row["Location"], "education_level": row["Education Level"],
+            }
+            input_hash = generate_input_hash(**profile)
+            if prediction_cache.get(input_hash) is None:
+                prediction_cache.put(input_hash, client.generate(build_prompt(profile)))
+    return run
+
+
+@case("contribute.append", ops=100)
+def _contribute_append(ctx):
+    path = os.path.join(_WORKDIR, f"contrib_{ctx.rows}.csv")
+    shutil.copyfile(ctx.csv_path, path)
+    rows = make_rows(100, seed=3)
+
+    def run():
+        for row in rows:
+            contributions.append_row(row, path)
+    return run
+
+
+def _loaded_copy(ctx, name):
+    # A private copy of the dataset, loaded with its derived state built
+    path = os.path.join(_WORKDIR, f"{name}_{ctx.rows}.csv")
+    shutil.copyfile(ctx.csv_path, path)
+    dataset.invalidate()
+    data = dataset.load_dataset(path)
+    get_index(data)
+    chart_cache.get_stats(data)
+    local_model.get_model(data)
+    return path
+
+
+# 👉 A contribution that reaches the in-memory dataset as a delta: the
+# frame, filter index, chart stats and local model move to a new version
+@case("contribute.append_delta", ops=20)
+def _append_delta(ctx):
+    path = _loaded_copy(ctx, "delta")
+    rows = make_rows(20, seed=5)
+
+    def run():
+        for row in rows:
+            contributions.append_row(row, path)
+            data = dataset.load_dataset(path)
+            get_index(data)
+            chart_cache.get_stats(data)
+            local_model.get_model(data)
+    return run
+
+
+# The same contribution followed by a full reload and rebuild, for comparison
+@case("contribute.append_reload", ops=5, repeat=3)
+def _append_reload(ctx):
+    path = _loaded_copy(ctx, "reload")
+    rows = make_rows(5, seed=5)
+
+    def run():
+        for row in rows:
+            contributions.append_row(row, path)
+            dataset.invalidate()
+            data = dataset.load_dataset(path)
+            get_index(data)
+            chart_cache.get_stats(data)
+            local_model.get_model(data)
+    return run
+
+
+# 👉 Bulk upload through the validation pipeline (dry run: nothing is
+# appended, so every repeat sees the same dataset)
+@case("ingest.upload_20k", ops=20_000)
+def _ingest_upload(ctx):
+    path = _loaded_copy(ctx, "ingest")
+    upload = os.path.join(_WORKDIR, "upload_20k.csv")
+    if not os.path.exists(upload):
+        write_csv(upload, 20_000, seed=7)
+    return lambda: ingest.ingest(upload, path, dry_run=True)
+
+
+def _measure(fn, repeat):
+    fn()  # warm-up: imports, lazily built caches, page cache
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(sizes, patterns, repeat, data_dir, log=print):
+    results = []
+    selected = [c for c in CASES if any(fnmatch.fnmatch(c["name"], p) for p in patterns)]
+    unsized = [c for c in selected if not c["sized"]]
+    for rows in sizes:
+        ctx = Context(rows, data_dir)
+        for spec in [c for c in selected if c["sized"]] + (unsized if rows == sizes[0] else []):
+            fn = spec["setup"](ctx)
+            if fn is None:
+                continue
+            times = _measure(fn, spec["repeat"] or repeat)
+            result = {
+                "case": spec["name"],
+                "rows": rows if spec["sized"] else None,
+                "ops": spec["ops"],
+                "repeat": len(times),
+                "median_s": statistics.median(times) / spec["ops"],
+                "min_s": min(times) / spec["ops"],
+            }
+            results.append(result)
+            log(f"{spec['name']:<28} {_rows_label(result['rows']):>10}  "
+                f"median {_fmt(result['median_s'])}/op  min {_fmt(result['min_s'])}/op")
+    return results
+
+
+def _rows_label(rows):
+    return "-" if rows is None else f"{rows:,}"
+
+
+def _fmt(seconds):
+    if seconds >= 1:
+        return f"{seconds:8.3f} s "
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:8.3f} ms"
+    return f"{seconds * 1e6:8.2f} µs"
+
+
+# 👉 Slower than baseline * (1 + tolerance), ignoring sub-`floor_s` noise.
+# Best-of-N times are compared: they are far less sensitive to other load
+# on the machine than medians.
+def compare(results, baseline, tolerance, floor_s=0.001):
+    base = {(r["case"], r["rows"]): r for r in baseline["results"]}
+    report = []
+    for result in results:
+        old = base.get((result["case"], result["rows"]))
+        if old is None:
+            continue
+        ratio = result["min_s"] / old["min_s"] if old["min_s"] else float("inf")
+        slower_by = (result["min_s"] - old["min_s"]) * result["ops"]
+        regressed = ratio > 1 + tolerance and slower_by > floor_s
+        report.append(dict(result, baseline_s=old["min_s"], ratio=ratio, regressed=regressed))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--cases", nargs="+", default=["*"], help="glob patterns of case names")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "salary-bench-data"),
+                        help="where synthetic CSVs are generated (reused across runs)")
+    parser.add_argument("-o", "--output", default="bench-results.json")
+    parser.add_argument("--baseline", help="compare against this results file")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed slowdown, 0.5 = 50%% (shared machines are noisy)")
+    parser.add_argument("--save-baseline", help="also write the results here")
+    parser.add_argument("--list", action="store_true", help="list case names and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for spec in CASES:
+            print(spec["name"])
+        return 0
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    try:
+        results = run_suite(sorted(args.sizes), args.cases, args.repeat, args.data_dir)
+    finally:
+        shutil.rmtree(_WORKDIR, ignore_errors=True)
+
+    payload = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "sizes": sorted(args.sizes),
+            "snapshot": snapshot.ENABLED,
+        },
+        "results": results,
+    }
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+        print(f"Results written to {path}")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    report = compare(results, baseline, args.tolerance)
+    print(f"\nAgainst {args.baseline} (commit {baseline['meta'].get('commit')}), tolerance {args.tolerance:.0%}:")
+    for item in report:
+        flag = "REGRESSION" if item["regressed"] else ""
+        print(f"{item['case']:<28} {_rows_label(item['rows']):>10}  {_fmt(item['baseline_s'])} -> "
+              f"{_fmt(item['min_s'])}  x{item['ratio']:.2f}  {flag}")
+    regressions = [item for item in report if item["regressed"]]
+    print(f"{len(regressions)} regression(s) in {len(report)} compared cases")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
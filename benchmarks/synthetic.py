@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from services.dataset import COLUMNS
+
+# Category pools shaped like Employee_Salary_Data.csv
+JOB_TITLES = [
+    "Cloud Engineer", "Human Resource", "Full Stack Developer", "Machine Learning Engineer",
+    "Data Analyst", "Data Scientist", "DevOps Engineer", "Product Manager",
+    "Backend Developer", "Frontend Developer", "Business Analyst", "QA Engineer"
+]
+INDUSTRIES = ["SaaS", "FinTech", "IT Services", "E-commerce", "Healthcare", "EdTech", "Consulting"]
+EDUCATION_LEVELS = ["Secondary Education", "Diploma", "Bachelors", "Masters", "PhD"]
+LOCATIONS = ["Hyderabad", "Gurgaon", "Pune", "Bangalore", "Mumbai", "Chennai", "Noida", "Delhi"]
+EMPLOYMENT_TYPES = ["Full-time", "Part-time", "Internship", "Contract"]
+COMPANY_SIZES = ["Startup", "Mid-size", "Large", "MNC"]
+REMOTE = ["Yes", "No"]
+
+
+# 👉 Synthetic salary frame with the same columns and rough value ranges
+def make_frame(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    years = np.round(rng.uniform(0, 15, n_rows), 1)
+    salary = np.round(300_000 + years * 120_000 + rng.normal(0, 250_000, n_rows)).clip(100_000)
+    frame = pd.DataFrame({
+        "Job Title": rng.choice(JOB_TITLES, n_rows),
+        "Industry": rng.choice(INDUSTRIES, n_rows),
+        "Education Level": rng.choice(EDUCATION_LEVELS, n_rows),
+        "Location": rng.choice(LOCATIONS, n_rows),
+        "Employment Type": rng.choice(EMPLOYMENT_TYPES, n_rows),
+        "YearsExperience": years,
+        "Salary (in INR)": salary.astype(float),
+        "Company Size": rng.choice(COMPANY_SIZES, n_rows),
+        "Remote": rng.choice(REMOTE, n_rows),
+    })
+    return frame[COLUMNS]
+
+
+def make_rows(n_rows, seed=0):
+    return make_frame(n_rows, seed).to_dict("records")
+
+
+def write_csv(path, n_rows, seed=0):
+    make_frame(n_rows, seed).to_csv(path, index=False)
+    return path
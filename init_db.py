@@ -1,21 +1,7 @@
 # Script for creating a table
-import sqlite3
+from services.cache_db import DB_FILE, init_db
 
-# Connect (or create if not exists)
-conn = sqlite3.connect("salary_cache.db")
-cursor = conn.cursor()
+# Connect (or create if not exists), switch to WAL and create the table
+init_db()
 
-# Create table if not exists
-cursor.execute("""
-    CREATE TABLE IF NOT EXISTS salary_cache (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        input_hash TEXT UNIQUE,
-        result TEXT,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-""")
-
-conn.commit()
-conn.close()
-
-print("✅ Database and table created successfully.")
+print(f"✅ Database and table created successfully ({DB_FILE}).")
@@ -1,9 +1,87 @@
 import streamlit as st
 import pandas as pd
-import os
 import plotly.express as px  # We'll use Plotly for beautiful charts
+from plotly import graph_objs as go
+from services import chart_cache, contributions, ingest, metrics
+from services.coordinator import CoordinatorError
+from services.dataset import load_dataset
+from services.filter_index import get_index
+from services.plotting import capped_figure, density_trace
 
-CSV_FILE = "Employee_Salary_Data.csv"
+# The write may or may not have landed: resubmitting could add it twice
+UNCONFIRMED = (
+    "Could not confirm that your data was saved. Please check the dataset "
+    "in a moment before submitting again."
+)
+
+
+def _job_pie(stats):
+    jobs = stats.job_distribution()
+    fig = px.pie(
+        jobs,
+        names="Job Title",
+        values="Count",
+        title="Job Title Distribution",
+        color_discrete_sequence=px.colors.sequential.RdBu,
+        hole=0.4
+    )
+    fig.update_layout(paper_bgcolor="rgba(0,0,0,0)", font_color="white")
+    return fig
+
+def _location_bar(stats):
+    fig = px.bar(
+        stats.location_distribution(),
+        x="Location",
+        y="Count",
+        title="Employees by Location",
+        color="Location",
+        color_discrete_sequence=px.colors.qualitative.Bold
+    )
+    fig.update_layout(paper_bgcolor="rgba(0,0,0,0)", font_color="white")
+    return fig
+
+def _salary_area(stats):
+    fig = px.area(
+        stats.location_average(),
+        x="Location",
+        y="Salary (in INR)",
+        title="Average Salary by Location",
+        color_discrete_sequence=["#00CC96"]
+    )
+    fig.update_layout(paper_bgcolor="rgba(0,0,0,0)", font_color="white")
+    return fig
+
+def _salary_trend(data, stats):
+    def build(mode, frame, bins):
+        if mode == "density":
+            fig = go.Figure(density_trace(frame["YearsExperience"], frame["Salary (in INR)"], bins=bins))
+            fig.update_layout(
+                title="Salary vs. Years of Experience",
+                xaxis_title="YearsExperience",
+                yaxis_title="Salary (in INR)"
+            )
+            return _with_trendline(fig, data, stats)
+        fig = px.scatter(
+            frame,
+            x="YearsExperience",
+            y="Salary (in INR)",
+            title="Salary vs. Years of Experience",
+            render_mode="svg" if mode == "markers" else "webgl",
+            color_discrete_sequence=["#FFA15A"]
+        )
+        return _with_trendline(fig, data, stats)
+
+    fig, caption = capped_figure(data, build)
+    return fig, caption
+
+def _with_trendline(fig, data, stats):
+    # OLS trendline from the running sums instead of a statsmodels refit
+    line = stats.trendline(float(data["YearsExperience"].min()), float(data["YearsExperience"].max()))
+    if line is not None:
+        fig.add_scatter(x=line[0], y=line[1], mode="lines", name="OLS trendline",
+                        line=dict(color="#FFA15A"), showlegend=False)
+    fig.update_layout(paper_bgcolor="rgba(0,0,0,0)", font_color="white")
+    return fig
 
 def show(data: pd.DataFrame):
     st.title("Contribute Data")
@@ -27,13 +105,14 @@ def show(data: pd.DataFrame):
     st.markdown("<br/>", unsafe_allow_html=True)
 
     # Dropdown options
-    job_titles = sorted(set(data["Job Title"].dropna()))
-    industries = sorted(set(data["Industry"].dropna()))
-    education_levels = sorted(set(data["Education Level"].dropna()))
-    locations = sorted(set(data["Location"].dropna()))
-    employment_types = sorted(set(data["Employment Type"].dropna()))
-    company_sizes = sorted(set(data["Company Size"].dropna()))
-    remote_options = sorted(set(data["Remote"].dropna()))
+    index = get_index(data)
+    job_titles = index.options("Job Title")
+    industries = index.options("Industry")
+    education_levels = index.options("Education Level")
+    locations = index.options("Location")
+    employment_types = index.options("Employment Type")
+    company_sizes = index.options("Company Size")
+    remote_options = index.options("Remote")
 
     with st.form(key="contribute_form"):
         # Row 1: Job Title, Industry, Education
@@ -114,13 +193,56 @@ def show(data: pd.DataFrame):
         }
 
         try:
-            df = pd.read_csv(CSV_FILE)
-            df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-        except FileNotFoundError:
-            df = pd.DataFrame([new_row])
+            # Same label cleanup as bulk uploads: " data  scientist" is "Data Scientist".
+            # Blank custom values are refused here, before anything is written
+            new_row = ingest.normalize_row(new_row, data)
+        except ValueError as e:
+            st.error(str(e))
+        else:
+            try:
+                with metrics.span("contribute.submit"):
+                    # Append-only: one locked, fsync'd journal write instead of rewriting the CSV.
+                    # The row reaches the shared frame, option lists, local model and
+                    # dashboard aggregates as a delta (new dataset version, no reload)
+                    contributions.append_row(new_row)
+            except CoordinatorError:
+                st.error(UNCONFIRMED)
+            else:
+                data = load_dataset().copy(deep=False)
+                st.success("Your data has been added. Thank you for contributing!")
 
-        df.to_csv(CSV_FILE, index=False)
-        st.success("Your data has been added. Thank you for contributing!")
+    # ---------------------- BULK UPLOAD ---------------------
+    with st.expander("Bulk upload (CSV)"):
+        st.caption(
+            "A CSV with the dataset's columns. Rows are checked, labels are matched to "
+            "existing ones, duplicates and implausible salaries are skipped, and the rest "
+            "is added in one step."
+        )
+        upload = st.file_uploader("CSV file", type="csv", key="bulk_upload")
+        dry_run = st.checkbox("Validate only", value=True)
+        if upload is not None and st.button("Upload" if not dry_run else "Validate"):
+            try:
+                with st.spinner("Processing upload..."):
+                    report = ingest.ingest(upload, dry_run=dry_run)
+            except ValueError as e:
+                st.error(str(e))
+            except CoordinatorError:
+                st.error(UNCONFIRMED)
+            else:
+                if report.appended:
+                    data = load_dataset().copy(deep=False)
+                    st.success(f"Added {report.appended:,} rows. Thank you for contributing!")
+                st.caption(
+                    f"{report.rows_read:,} rows read, {report.accepted:,} accepted "
+                    f"({report.rows_per_second:,.0f} rows/s)"
+                )
+                if report.rejected:
+                    st.dataframe(
+                        pd.DataFrame(report.rejected.most_common(), columns=["Reason", "Rows"]),
+                        hide_index=True
+                    )
+                    st.markdown("Sample of rejected rows:")
+                    st.dataframe(pd.DataFrame(report.samples), hide_index=True)
 
     # ---------------------- ANALYSIS SECTION ---------------------
     if show_analysis:
@@ -128,56 +250,25 @@ def show(data: pd.DataFrame):
         st.header("Data Analysis Dashboard")
         st.markdown("Gain quick insights from the contributed data:")
 
-        # Ensure Salary is numeric
-        data["Salary (in INR)"] = pd.to_numeric(data["Salary (in INR)"], errors="coerce")
+        # Aggregates are maintained incrementally; figures are cached per dataset version
+        stats = chart_cache.get_stats(data)
 
         # 1️⃣ Pie Chart - Job Title Distribution
-        fig1 = px.pie(
-            data,
-            names=data["Job Title"],
-            title="Job Title Distribution",
-            color_discrete_sequence=px.colors.sequential.RdBu,
-            hole=0.4
-        )
-        fig1.update_layout(paper_bgcolor="rgba(0,0,0,0)", font_color="white")
+        fig1 = chart_cache.get_or_build(data, "contribute.jobs", lambda: _job_pie(stats))
 
         # 2️⃣ Bar Chart - Employees by Location
-        location_count = data["Location"].value_counts().reset_index()
-        location_count.columns = ["Location", "Count"]
-        fig2 = px.bar(
-            location_count,
-            x="Location",
-            y="Count",
-            title="Employees by Location",
-            color="Location",
-            color_discrete_sequence=px.colors.qualitative.Bold
-        )
-        fig2.update_layout(paper_bgcolor="rgba(0,0,0,0)", font_color="white")
+        fig2 = chart_cache.get_or_build(data, "contribute.locations", lambda: _location_bar(stats))
 
         # 3️⃣ Area Chart - Salary by Location (Average)
-        salary_location = data.groupby("Location")["Salary (in INR)"].mean().reset_index()
-        fig3 = px.area(
-            salary_location,
-            x="Location",
-            y="Salary (in INR)",
-            title="Average Salary by Location",
-            color_discrete_sequence=["#00CC96"]
-        )
-        fig3.update_layout(paper_bgcolor="rgba(0,0,0,0)", font_color="white")
+        fig3 = chart_cache.get_or_build(data, "contribute.avg_salary", lambda: _salary_area(stats))
 
         # 4️⃣ Line Chart - Salary vs Years of Experience
-        fig4 = px.scatter(
-            data,
-            x="YearsExperience",
-            y="Salary (in INR)",
-            title="Salary vs. Years of Experience",
-            trendline="ols",
-            color_discrete_sequence=["#FFA15A"]
-        )
-        fig4.update_layout(paper_bgcolor="rgba(0,0,0,0)", font_color="white")
+        # Large datasets switch to a sampled or binned view, capped in size
+        fig4, fig4_caption = chart_cache.get_or_build(data, "contribute.trend", lambda: _salary_trend(data, stats))
 
         # Show all charts nicely
         st.plotly_chart(fig1, use_container_width=True)
         st.plotly_chart(fig2, use_container_width=True)
         st.plotly_chart(fig3, use_container_width=True)
         st.plotly_chart(fig4, use_container_width=True)
+        st.caption(fig4_caption)
@@ -1,7 +1,131 @@
+import io
 import streamlit as st
-import matplotlib.pyplot as plt
 from plotly import graph_objs as go
 import pandas as pd
+from services import chart_cache, metrics
+from services.aggregations import merge_range_sums, range_frame, range_sums
+from services.dataset import format_for_display
+from services.filter_index import FILTER_FIELDS, get_index
+from services.plotting import capped_figure, density_trace, plot_mode
+from services.table import DEFAULT_PAGE_SIZE, PAGE_SIZES, SortIndex, get_sort_index, page_bounds, window
+
+def _matplotlib_scatter(data):
+    # Imported only when this graph type is chosen (it adds ~0.4s to a cold start)
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(8, 5))
+    if plot_mode(len(data)) == "markers":
+        ax.scatter(
+            data["YearsExperience"],
+            data["Salary (in INR)"],
+            color='royalblue',
+            edgecolor='k',
+            alpha=0.7
+        )
+    else:
+        # Large data: hexagonal density instead of one marker per row
+        known = data["YearsExperience"].notna() & data["Salary (in INR)"].notna()
+        hb = ax.hexbin(
+            data.loc[known, "YearsExperience"],
+            data.loc[known, "Salary (in INR)"],
+            gridsize=60,
+            cmap='viridis',
+            mincnt=1
+        )
+        fig.colorbar(hb, ax=ax, label="Rows")
+    ax.set_xlim(left=0)
+    ax.set_xlabel("Years of Experience")
+    ax.set_ylabel("Salary Million (INR)")
+    ax.set_title("Scatter Plot: Experience vs. Salary")
+    ax.grid(True, linestyle='--', alpha=0.5)
+    # Cache the PNG rather than the figure: no re-rendering on later reruns
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", bbox_inches="tight")
+    plt.close(fig)
+    return buf.getvalue()
+
+def _plotly_scatter(mode, data, bins):
+    fig = go.Figure()
+
+    if mode == "density":
+        fig.add_trace(density_trace(data["YearsExperience"], data["Salary (in INR)"], bins=bins))
+    else:
+        # WebGL keeps sampled large-data renders responsive in the browser
+        trace = go.Scatter if mode == "markers" else go.Scattergl
+        fig.add_trace(
+            trace(
+                x=data["YearsExperience"],
+                y=data["Salary (in INR)"],
+                mode="markers",
+                marker=dict(
+                    size=10 if mode == "markers" else 5,
+                    color=data["YearsExperience"],
+                    colorscale='Viridis',
+                    showscale=True,
+                    colorbar=dict(title="Years Exp")
+                ),
+                hovertemplate="<b>Experience:</b> %{x} years<br><b>Salary:</b> ₹%{y}<extra></extra>"
+            )
+        )
+
+    fig.update_layout(
+        title="Interactive Scatter Plot: Experience vs. Salary",
+        xaxis=dict(
+            title="Years of Experience",
+            range=[0, 16],
+            showgrid=True,
+            gridcolor='lightgrey',
+            zeroline=False,
+            color='grey'
+        ),
+        yaxis=dict(
+            title="Salary (INR)",
+            range=[0, 2100000],
+            showgrid=True,
+            gridcolor='lightgrey',
+            zeroline=False,
+            color='grey'
+        ),
+        plot_bgcolor='white',
+        paper_bgcolor='black',
+        height=600
+    )
+    return fig
+
+def _range_sums(data, bucket_size, group_selections):
+    with metrics.span("home.range_view", fields=len(group_selections)):
+        return range_sums(data, bucket_size, group_selections)
+
+def _range_table(sums, bucket_size):
+    grouped = range_frame(sums, bucket_size)
+    return grouped, SortIndex(grouped)
+
+# 👉 Sort / page controls; only the visible window reaches st.dataframe
+def _paged_table(key, frame, sort_index, positions, columns, reset_on):
+    total = len(frame) if positions is None else len(positions)
+    cols = st.columns(4)
+    sort_by = cols[0].selectbox("Sort by", ["Original order"] + columns, key=f"{key}_sort")
+    order = cols[1].selectbox("Order", ["Ascending", "Descending"], key=f"{key}_order")
+    page_size = cols[2].selectbox(
+        "Rows per page", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE), key=f"{key}_size"
+    )
+
+    # New filters, sort or page size start again from the first page
+    signature = (reset_on, sort_by, order, page_size, total)
+    if st.session_state.get(f"{key}_signature") != signature:
+        st.session_state[f"{key}_signature"] = signature
+        st.session_state[f"{key}_page"] = 1
+    _, pages, _, _ = page_bounds(total, 1, page_size)
+    page = cols[3].number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, step=1, key=f"{key}_page")
+
+    with metrics.span("home.table_page", table=key):
+        page, pages, start, stop = page_bounds(total, page, page_size)
+        if sort_by != "Original order":
+            positions = sort_index.sort(positions, sort_by, ascending=order == "Ascending", limit=stop)
+        rows = format_for_display(window(frame, positions, start, stop))
+
+    st.dataframe(rows, use_container_width=True, height=500)
+    st.caption(f"Rows {start + 1 if total else 0:,}–{stop:,} of {total:,}")
 
 def show(data: pd.DataFrame):
     st.title("Employee Dashboard")
@@ -19,65 +143,16 @@ def show(data: pd.DataFrame):
     )
 
     with st.expander("Show Graph"):
+        # Rendered once per dataset version and shared by every session
         if graph_type == "Non-Interactive (Matplotlib)":
-            fig, ax = plt.subplots(figsize=(8, 5))
-            ax.scatter(
-                data["YearsExperience"].astype(float),
-                data["Salary (in INR)"].astype(float),
-                color='royalblue',
-                edgecolor='k',
-                alpha=0.7
-            )
-            ax.set_xlim(left=0)
-            ax.set_xlabel("Years of Experience")
-            ax.set_ylabel("Salary Million (INR)")
-            ax.set_title("Scatter Plot: Experience vs. Salary")
-            ax.grid(True, linestyle='--', alpha=0.5)
-            st.pyplot(fig)
+            st.image(chart_cache.get_or_build(data, "home.matplotlib", lambda: _matplotlib_scatter(data)))
 
         elif graph_type == "Interactive (Plotly)":
-            fig = go.Figure()
-
-            fig.add_trace(
-                go.Scatter(
-                    x=data["YearsExperience"].astype(float),
-                    y=data["Salary (in INR)"].astype(float),
-                    mode="markers",
-                    marker=dict(
-                        size=10,
-                        color=data["YearsExperience"].astype(float),
-                        colorscale='Viridis',
-                        showscale=True,
-                        colorbar=dict(title="Years Exp")
-                    ),
-                    hovertemplate="<b>Experience:</b> %{x} years<br><b>Salary:</b> ₹%{y}<extra></extra>"
-                )
-            )
-
-            fig.update_layout(
-                title="Interactive Scatter Plot: Experience vs. Salary",
-                xaxis=dict(
-                    title="Years of Experience",
-                    range=[0, 16],
-                    showgrid=True,
-                    gridcolor='lightgrey',
-                    zeroline=False,
-                    color='grey'
-                ),
-                yaxis=dict(
-                    title="Salary (INR)",
-                    range=[0, 2100000],
-                    showgrid=True,
-                    gridcolor='lightgrey',
-                    zeroline=False,
-                    color='grey'
-                ),
-                plot_bgcolor='white',
-                paper_bgcolor='black',
-                height=600
+            fig, caption = chart_cache.get_or_build(
+                data, "home.plotly", lambda: capped_figure(data, _plotly_scatter)
             )
-
             st.plotly_chart(fig, use_container_width=True)
+            st.caption(caption)
 
     show_data = st.checkbox("Show Data")
     if show_data:
@@ -88,15 +163,13 @@ def show(data: pd.DataFrame):
 
         if view_mode == "Default":
             st.sidebar.markdown("### Filters")
-            filter_fields = [
-                "Job Title", "Industry", "Education Level",
-                "Location", "Employment Type", "Company Size", "Remote"
-            ]
+            filter_fields = FILTER_FIELDS
+            index = get_index(data)
             if "filters" not in st.session_state:
                 st.session_state.filters = {field: "All" for field in filter_fields}
 
             for field in filter_fields:
-                options = ["All"] + sorted(data[field].dropna().unique().tolist())
+                options = ["All"] + index.options(field)
                 selected = st.sidebar.selectbox(f"{field}", options, index=options.index(st.session_state.filters[field]))
                 st.session_state.filters[field] = selected
 
@@ -105,37 +178,18 @@ def show(data: pd.DataFrame):
                     st.session_state.filters[field] = "All"
                 st.rerun()
 
-            filtered_data = data.copy()
-            for field, selected in st.session_state.filters.items():
-                if selected != "All":
-                    filtered_data = filtered_data[filtered_data[field] == selected]
-
-            filtered_data = filtered_data.reset_index(drop=True)
-            filtered_data.index += 1
-            filtered_data.index.name = "S. No."
-
-            st.dataframe(filtered_data, use_container_width=True, height=500)
+            # Intersect precomputed row positions; only the visible page is materialized
+            with metrics.span("home.filter"):
+                positions = index.filter(st.session_state.filters)
+            _paged_table(
+                "data", data, get_sort_index(data), positions, list(data.columns),
+                reset_on=tuple(st.session_state.filters.items())
+            )
 
         elif view_mode == "Range":
-            data["YearsExperience_Float"] = pd.to_numeric(data["YearsExperience"], errors="coerce")
-            max_years = int(data["YearsExperience_Float"].max()) + 1
+            max_years = int(data["YearsExperience"].max()) + 1
             bucket_size = st.sidebar.slider("Experience Range (in years)", min_value=1, max_value=max_years, value=1, step=1)
 
-            def get_dynamic_range(x, bucket):
-                if pd.isna(x):
-                    return "Unknown"
-                lower = int((x // bucket) * bucket)
-                upper = lower + bucket
-                return f"{lower}-{upper} Years"
-
-            def get_dynamic_sort_key(x):
-                if x == "Unknown":
-                    return -1
-                return int(x.split("-")[0])
-
-            data["Experience_Range"] = data["YearsExperience_Float"].apply(lambda x: get_dynamic_range(x, bucket_size))
-            data["Experience_Range_Sort"] = data["Experience_Range"].apply(get_dynamic_sort_key)
-
             st.sidebar.markdown("###### Grouping Options")
             optional_fields = ["Education Level", "Location", "Employment Type", "Company Size", "Remote"]
 
@@ -146,17 +200,20 @@ def show(data: pd.DataFrame):
                 if col.checkbox(field, value=True):
                     group_selections.append(field)
 
-            group_cols = ["Experience_Range", "Job Title", "Industry"] + group_selections
-
-            grouped = data.groupby(group_cols).agg(
-                Avg_Salary=pd.NamedAgg(column="Salary (in INR)", aggfunc=lambda x: round(x.astype(float).mean(), 1)),
-                Grouped=pd.NamedAgg(column="Salary (in INR)", aggfunc="count"),
-                Sort_Key=pd.NamedAgg(column="Experience_Range_Sort", aggfunc="first")
-            ).reset_index()
-
-            grouped = grouped[grouped["Experience_Range"] != "Unknown"]
-            grouped = grouped.sort_values(by="Sort_Key").drop(columns=["Sort_Key"])
-
-            grouped.index += 1
-            grouped.index.name = "S. No."
-            st.dataframe(grouped, use_container_width=True, height=500)
\ No newline at end of file
+            # Vectorized bucketing + built-in sum/count, shared frame untouched;
+            # cached so paging and sorting do not regroup the dataset, and
+            # contributed rows are merged into the sums instead of regrouping
+            params = dict(bucket_size=bucket_size, fields=tuple(group_selections))
+            sums = chart_cache.get_or_build(
+                data, "home.range_sums",
+                lambda: _range_sums(data, bucket_size, group_selections),
+                update=lambda sums, delta: merge_range_sums(sums, range_sums(delta, bucket_size, group_selections)),
+                **params
+            )
+            grouped, grouped_sort = chart_cache.get_or_build(
+                data, "home.range", lambda: _range_table(sums, bucket_size), **params
+            )
+            _paged_table(
+                "range", grouped, grouped_sort, None, list(grouped.columns),
+                reset_on=(bucket_size, tuple(group_selections))
+            )
\ No newline at end of file
@@ -1,69 +1,29 @@
+import time
 import streamlit as st
 import pandas as pd
-import time
-import os
-import sqlite3
-import hashlib
-from datetime import datetime
-from dotenv import load_dotenv
-import google.generativeai as genai
-
-# Load .env variables
-load_dotenv()
-GEMINI_KEY = os.getenv("GEMINI_KEY")
-GEMINI_MODEL = os.getenv("GEMINI_MODEL")
-
-# Configure Gemini
-genai.configure(api_key=GEMINI_KEY)
-
-# 👉 Initialize database and table if not exists
-def init_db():
-    conn = sqlite3.connect("salary_cache.db")
-    cursor = conn.cursor()
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS salary_cache (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            input_hash TEXT UNIQUE,
-            result TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    conn.commit()
-    conn.close()
-
-init_db()
-
-# 👉 Generate input hash key
-def generate_input_hash(job_title, employment_type, industry, company_size, years_exp, remote, location, education_level):
-    combined = f"{job_title}|{employment_type}|{industry}|{company_size}|{years_exp}|{remote}|{location}|{education_level}"
-    hash_key = hashlib.sha256(combined.encode()).hexdigest()
-    return hash_key
-
-# 👉 DB: check for existing result
-def get_cached_result(input_hash):
-    conn = sqlite3.connect("salary_cache.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT result FROM salary_cache WHERE input_hash = ?", (input_hash,))
-    row = cursor.fetchone()
-    conn.close()
-    return row[0] if row else None
-
-# 👉 DB: save result
-def save_result(input_hash, result):
-    conn = sqlite3.connect("salary_cache.db")
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT OR REPLACE INTO salary_cache (input_hash, result, created_at) VALUES (?, ?, ?)",
-        (input_hash, result, datetime.now())
-    )
-    conn.commit()
-    conn.close()
-
-# 🔮 AI call function
-def call_gemini(prompt: str):
-    model = genai.GenerativeModel(GEMINI_MODEL)
-    response = model.generate_content(prompt)
-    return response.text.strip()
+from concurrent import futures
+from services import local_model, metrics, prediction_cache
+from services.singleflight import SingleFlight
+from services.filter_index import get_index
+from services.gemini import GEMINI_TIMEOUT, build_prompt, call_gemini
+from services.llm_client import BudgetExceeded
+from services.local_model import LOCAL_MODEL_MODE
+from services.prediction_cache import generate_input_hash
+
+# Shared worker pool for model calls, reused across reruns and sessions
+_gemini_pool = futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix="gemini")
+# One upstream call per input_hash, however many sessions ask at once
+_inflight = SingleFlight(_gemini_pool)
+
+# 👉 Runs once per input_hash in flight: call the model and fill the cache
+def predict_and_cache(input_hash, prompt):
+    # A flight that just finished may already have stored this key
+    cached_result = prediction_cache.get(input_hash, record=False)
+    if cached_result:
+        return cached_result
+    result_text = call_gemini(prompt).strip()
+    prediction_cache.put(input_hash, result_text)
+    return result_text
 
 def show(data: pd.DataFrame):
     st.title("Know Your Salary (AI Predection)")
@@ -87,13 +47,14 @@ def show(data: pd.DataFrame):
     st.markdown("""<br/>""", unsafe_allow_html=True)
 
     # 👉 Extract dropdowns
-    job_titles = sorted(set(data["Job Title"].dropna()))
-    industries = sorted(set(data["Industry"].dropna()))
-    education_levels = sorted(set(data["Education Level"].dropna()))
-    locations = sorted(set(data["Location"].dropna()))
-    employment_types = sorted(set(data["Employment Type"].dropna()))
-    company_sizes = sorted(set(data["Company Size"].dropna()))
-    remote_options = sorted(set(data["Remote"].dropna()))
+    index = get_index(data)
+    job_titles = index.options("Job Title")
+    industries = index.options("Industry")
+    education_levels = index.options("Education Level")
+    locations = index.options("Location")
+    employment_types = index.options("Employment Type")
+    company_sizes = index.options("Company Size")
+    remote_options = index.options("Remote")
 
     with st.form(key="prediction_form"):
         # Row 1
@@ -110,7 +71,7 @@ def show(data: pd.DataFrame):
         with col4:
             company_size = st.selectbox("Company Size", company_sizes)
         with col5:
-            max_exp = round(data["YearsExperience"].astype(float).max(), 1)
+            max_exp = round(float(data["YearsExperience"].max()), 1)
             years_exp = st.number_input(
                 "Years of Experience",
                 min_value=0.0,
@@ -144,72 +105,104 @@ def show(data: pd.DataFrame):
             years_exp, remote, location, education_level
         )
 
-        # ✅ Check cache
-        cached_result = get_cached_result(input_hash)
-
+        profile = {
+            "job_title": job_title,
+            "industry": industry,
+            "employment_type": employment_type,
+            "company_size": company_size,
+            "years_exp": years_exp,
+            "remote": remote,
+            "location": location,
+            "education_level": education_level,
+        }
+
+        # ✅ Check cache (in-process LRU, then salary_cache.db)
+        cached_result = prediction_cache.get(input_hash)
+
+        metrics.count("prediction.requests", source="cache" if cached_result else LOCAL_MODEL_MODE)
         if cached_result:
             st.session_state["ai_salary_estimate"] = cached_result
+            st.session_state["estimate_source"] = "ai"
+            st.session_state["prediction_done"] = True
+        elif LOCAL_MODEL_MODE == "serve":
+            # ⚡ Local model answers on its own, no network round trip
+            st.session_state["ai_salary_estimate"] = local_model.get_model(data).predict_text(profile)
+            st.session_state["estimate_source"] = "local"
             st.session_state["prediction_done"] = True
         else:
+            # ⚡ Instant local range while Gemini works on the real answer
+            preview = st.empty()
+            if LOCAL_MODEL_MODE == "preview":
+                quick = local_model.get_model(data).predict_text(profile)
+                preview.info(f"⚡ **Quick estimate (local model):** {quick}\n\nWaiting for Gemini AI…")
+
             # ✅ Dynamic progress bar
             progress_bar = st.progress(0.0)
 
             # 📝 Build prompt
-            prompt = f"""
-            You are an expert salary estimator.
-            Estimate a fair salary in INR for the following:
-            - Job Title: {job_title}
-            - Industry: {industry}
-            - Employment Type: {employment_type}
-            - Company Size: {company_size}
-            - Years of Experience: {years_exp}
-            - Remote: {remote}
-            - Location: {location}
-            - Education Level: {education_level}
-
-            ONLY return the estimated annual salary range in INR, 
-            like "₹6,00,000 - ₹8,50,000 per annum" and nothing else.
-            Do not add explanations, factors, or any extra text.
-            """
-
-            import threading
-
-            ai_result = {"response": None}
-
-            def get_ai_response():
-                ai_result["response"] = call_gemini(prompt)
-
-            t = threading.Thread(target=get_ai_response)
-            t.start()
-
-            # 👉 Slider simulation
-            steps = [0.0, 0.25, 0.50, 0.75, 0.99, 1.0]
-            delays = [0.5, 1.5, 2.0, 3.0]
-
-            for i in range(1, len(steps)):
-                progress_bar.progress(steps[i - 1])
-                step_start = time.time()
-                while time.time() - step_start < delays[i - 1]:
-                    if ai_result["response"]:
-                        break
-                    time.sleep(0.1)
-                if ai_result["response"]:
-                    break
-
-            while ai_result["response"] is None:
-                time.sleep(0.2)
+            prompt = build_prompt(profile)
+
+            # 👉 Join the in-flight call for this input, or start it on the shared pool
+            future = _inflight.submit(input_hash, predict_and_cache, input_hash, prompt)
+
+            # 👉 Progress advances while we wait, but never delays a finished answer.
+            # The progress steps come out of the same GEMINI_TIMEOUT budget.
+            steps = [0.25, 0.50, 0.75, 0.99]
+            waits = [0.5, 1.5, 2.0, 3.0]
+            deadline = time.monotonic() + GEMINI_TIMEOUT
+            try:
+                with metrics.span("prediction.wait_gemini"):
+                    for step, wait in zip(steps, waits):
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        done, _ = futures.wait([future], timeout=min(wait, remaining))
+                        if done:
+                            break
+                        progress_bar.progress(step)
+                    result_text = future.result(timeout=max(0.0, deadline - time.monotonic())).strip()
+            except BudgetExceeded as e:
+                # Throttling (ours or Gemini's) is not a slow model: say which
+                progress_bar.empty()
+                metrics.count("prediction.budget_exceeded", reason=e.reason)
+                if e.reason == "rate_limit":
+                    st.error("Too many estimates are being requested right now (rate limit reached). "
+                             "Please try again in a minute.")
+                elif e.reason == "retries":
+                    st.error("Gemini is over its quota or overloaded and kept refusing the request. "
+                             "Please try again in a minute.")
+                else:
+                    st.error(f"Gemini did not answer within {GEMINI_TIMEOUT:.0f} seconds. Please try again.")
+                st.stop()
+            except futures.TimeoutError:
+                progress_bar.empty()
+                st.error(f"Gemini did not answer within {GEMINI_TIMEOUT:.0f} seconds. Please try again.")
+                st.stop()
+            except Exception as e:
+                progress_bar.empty()
+                st.error(f"Could not get an estimate from Gemini: {e}")
+                st.stop()
 
             progress_bar.progress(1.0)
-
-            # ✅ Save to cache
-            result_text = ai_result["response"].strip()
-            save_result(input_hash, result_text)
+            preview.empty()
 
             st.session_state["ai_salary_estimate"] = result_text
+            st.session_state["estimate_source"] = "ai"
             st.session_state["prediction_done"] = True
 
     # 👉 Show result
     if st.session_state.get("prediction_done", False):
         response = st.session_state.get("ai_salary_estimate", "").strip()
-        st.success(f"💰 **AI Estimated Salary:**\n\n{response}")
-        st.caption("_This is an AI generated estimate for informational purposes only._")
+        if st.session_state.get("estimate_source") == "local":
+            st.success(f"💰 **Estimated Salary (local model):**\n\n{response}")
+            st.caption("_This is a statistical estimate from the contributed data, for informational purposes only._")
+        else:
+            st.success(f"💰 **AI Estimated Salary:**\n\n{response}")
+            st.caption("_This is an AI generated estimate for informational purposes only._")
+
+    # 👉 Cache hit rate, to tune SALARY_CACHE_EXP_BUCKET against API spend
+    cache_stats = prediction_cache.stats()
+    st.sidebar.caption(
+        f"Prediction cache: {cache_stats['hit_rate']:.0%} hit rate over {cache_stats['lookups']} lookups · "
+        f"{cache_stats['misses']} misses · experience bands of {cache_stats['experience_bucket']:g} yr"
+    )
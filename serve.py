@@ -0,0 +1,182 @@
+"""Serve the app from several Streamlit worker processes behind one port.
+
+    python serve.py --workers 4 --port 8501
+
+Layout:
+  - a coordinator process (services/coordinator.py) hosts the shared
+    prediction-cache tier and is the single writer of contributions;
+  - N workers run `streamlit run app.py` on private ports. They map the same
+    Arrow snapshot of the dataset, written once here before they start, and
+    follow each other's contributions through the journal;
+  - this process accepts connections on --port and routes each one by the
+    client's address, so every connection from one browser reaches the same
+    worker. That matters beyond the session's websocket: `st.image` media
+    (/media/...) and `st.file_uploader` uploads (/_stcore/upload_file) are
+    separate HTTP requests served from the owning worker's memory. Clients
+    behind one NAT or reverse proxy therefore share a worker.
+Crashed workers are restarted.
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import secrets
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+from services import dataset
+from services.coordinator import ServiceManager, parse_address
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class Worker:
+    def __init__(self, port, env):
+        self.port = port
+        self.env = env
+        self.process = None
+        self.connections = 0
+        self.served = 0
+
+    def start(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", os.path.join(HERE, "app.py"),
+             "--server.port", str(self.port), "--server.address", "127.0.0.1",
+             "--server.headless", "true", "--browser.gatherUsageStats", "false"],
+            env=self.env, cwd=HERE,
+        )
+
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def healthy(self):
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=1) as r:
+                return r.status == 200
+        except OSError:
+            return False
+
+
+def _wait_for(check, timeout, what):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if check():
+            return
+        time.sleep(0.2)
+    raise RuntimeError(f"{what} did not come up within {timeout:.0f}s")
+
+
+def _coordinator_up(address, authkey):
+    try:
+        ServiceManager(address=parse_address(address), authkey=authkey.encode()).connect()
+        return True
+    except OSError:
+        return False
+
+
+async def _pipe(reader, writer):
+    try:
+        while True:
+            chunk = await reader.read(1 << 16)
+            if not chunk:
+                break
+            writer.write(chunk)
+            await writer.drain()
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+    finally:
+        writer.close()
+
+
+# Rendezvous hashing: a client address always ranks the workers the same
+# way, so it sticks to its first choice while that worker is up, and a
+# worker going down only moves its own clients
+def _ranked(workers, client):
+    def weight(worker):
+        return hashlib.blake2b(f"{client}|{worker.port}".encode(), digest_size=8).digest()
+    return sorted(workers, key=weight, reverse=True)
+
+
+# 👉 Sticky TCP proxy in front of the workers (affinity by client address)
+async def _proxy(workers, host, port):
+    async def handle(client_reader, client_writer):
+        peer = client_writer.get_extra_info("peername")
+        client = peer[0] if peer else ""
+        for worker in _ranked([w for w in workers if w.alive()], client):
+            try:
+                upstream_reader, upstream_writer = await asyncio.open_connection("127.0.0.1", worker.port)
+            except OSError:
+                continue
+            worker.connections += 1
+            worker.served += 1
+            try:
+                await asyncio.gather(
+                    _pipe(client_reader, upstream_writer), _pipe(upstream_reader, client_writer)
+                )
+            finally:
+                worker.connections -= 1
+            return
+        client_writer.close()
+
+    async def supervise():
+        while True:
+            await asyncio.sleep(2)
+            for worker in workers:
+                if not worker.alive():
+                    print(f"worker on :{worker.port} exited ({worker.process.returncode}); restarting")
+                    worker.start()
+
+    server = await asyncio.start_server(handle, host, port)
+    print(f"Serving on http://{host}:{port} with {len(workers)} workers")
+    async with server:
+        await asyncio.gather(server.serve_forever(), supervise())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8501)
+    parser.add_argument("--worker-port", type=int, default=8511, help="first worker port")
+    parser.add_argument("--service", default="127.0.0.1:8599", help="coordinator address")
+    args = parser.parse_args()
+
+    # Parse the CSV once and write the snapshot every worker maps
+    dataset.load_dataset()
+
+    authkey = secrets.token_hex(16)
+    env = dict(os.environ, SALARY_SERVICE_ADDR=args.service, SALARY_SERVICE_KEY=authkey)
+    coordinator = subprocess.Popen(
+        [sys.executable, "-m", "services.coordinator", "--address", args.service], env=env, cwd=HERE
+    )
+    workers = [Worker(args.worker_port + i, env) for i in range(args.workers)]
+    try:
+        _wait_for(lambda: _coordinator_up(args.service, authkey), 30, "coordinator")
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            _wait_for(worker.healthy, 60, f"worker on :{worker.port}")
+
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        asyncio.run(_proxy(workers, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        processes = [coordinator] + [worker.process for worker in workers if worker.process is not None]
+        for process in processes:
+            if process.poll() is None:
+                process.terminate()
+        # One stuck process must not leave the others running
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+
+if __name__ == "__main__":
+    main()
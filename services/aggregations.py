@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+SALARY = "Salary (in INR)"
+YEARS = "YearsExperience"
+BASE_GROUP_FIELDS = ["Job Title", "Industry"]
+
+
+# 👉 Integer bucket per row (floor(years / bucket)); -1 where years is missing
+def experience_buckets(years, bucket_size):
+    years = years.to_numpy(dtype=float)
+    codes = np.full(len(years), -1, dtype=np.int64)
+    known = ~np.isnan(years)
+    codes[known] = np.floor_divide(years[known], bucket_size).astype(np.int64)
+    return codes
+
+
+def bucket_labels(codes, bucket_size):
+    return [f"{code * bucket_size}-{code * bucket_size + bucket_size} Years" for code in codes]
+
+
+# 👉 Salary sum and row count per experience bucket and grouping fields.
+# Works on a narrow frame built on the side, so the shared dataset is never
+# modified. Sums (not means) so appended rows merge in exactly.
+def range_sums(data: pd.DataFrame, bucket_size, group_fields=()):
+    keys = BASE_GROUP_FIELDS + list(group_fields)
+    codes = experience_buckets(data[YEARS], bucket_size)
+    known = codes >= 0
+
+    work = data.loc[known, keys]
+    work.insert(0, "_bucket", codes[known])
+    # float64 accumulation for the means
+    work[SALARY] = data.loc[known, SALARY].astype("float64")
+
+    return (
+        work.groupby(["_bucket"] + keys, sort=True, observed=True)[SALARY]
+        .agg(["sum", "count"])
+        .reset_index()
+    )
+
+
+# 👉 Fold the sums of appended rows into existing sums (O(groups))
+def merge_range_sums(sums: pd.DataFrame, more: pd.DataFrame):
+    if more.empty:
+        return sums
+    keys = [col for col in sums.columns if col not in ("sum", "count")]
+    combined = pd.concat([sums, more], ignore_index=True)
+    for col in keys[1:]:
+        # Labels unseen so far widen the categories instead of going to object
+        combined[col] = combined[col].astype("category")
+    return (
+        combined.groupby(keys, sort=True, observed=True)[["sum", "count"]]
+        .sum()
+        .reset_index()
+    )
+
+
+# 👉 "Range" view: average salary and row count per experience bucket and
+# grouping fields
+def range_frame(sums: pd.DataFrame, bucket_size):
+    keys = [col for col in sums.columns if col not in ("_bucket", "sum", "count")]
+
+    # Labels are built once per distinct bucket, not once per row
+    uniques = sums["_bucket"].unique()
+    labels = pd.Categorical.from_codes(
+        np.searchsorted(uniques, sums["_bucket"].to_numpy()),
+        categories=bucket_labels(uniques, bucket_size),
+        ordered=True
+    )
+
+    result = sums[keys].copy()
+    result.insert(0, "Experience_Range", labels)
+    result["Avg_Salary"] = (sums["sum"] / sums["count"]).round(1)
+    result["Grouped"] = sums["count"]
+    return result
+
+
+def range_view(data: pd.DataFrame, bucket_size, group_fields=()):
+    return range_frame(range_sums(data, bucket_size, group_fields), bucket_size)
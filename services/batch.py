@@ -0,0 +1,165 @@
+"""Batch salary estimates for every row of a CSV.
+
+    python -m services.batch profiles.csv -o estimates.csv --workers 4 --per-prompt 5
+    python -m services.batch profiles.csv --stub   # offline, no Gemini calls
+"""
+import argparse
+import threading
+import time
+from concurrent import futures
+
+import pandas as pd
+
+from services import cache_db, prediction_cache
+from services.gemini import (
+    DATASET_COLUMNS, GeminiClient, StubClient,
+    build_batch_prompt, build_prompt, parse_batch_response,
+)
+from services.prediction_cache import generate_input_hash
+
+RESULT_COLUMN = "Estimated Salary"
+
+
+def _profiles(frame):
+    missing = [col for col in DATASET_COLUMNS if col not in frame.columns]
+    if missing:
+        raise ValueError(f"Input CSV is missing columns: {', '.join(missing)}")
+    renamed = frame[list(DATASET_COLUMNS)].rename(columns=DATASET_COLUMNS)
+    return renamed.to_dict("records")
+
+
+class BudgetExhausted(Exception):
+    pass
+
+
+class CallBudget:
+    # Upper bound on model calls, shared by every worker of a run (and by
+    # every chunk of a warm-up). Each client.generate() takes one unit,
+    # fallback prompts included; limit None means unlimited.
+    def __init__(self, limit=None):
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def take(self):
+        with self._lock:
+            if self.limit is not None and self.used >= self.limit:
+                return False
+            self.used += 1
+            return True
+
+    @property
+    def remaining(self):
+        with self._lock:
+            return None if self.limit is None else self.limit - self.used
+
+
+def _generate(client, prompt, budget):
+    if not budget.take():
+        raise BudgetExhausted()
+    return client.generate(prompt)
+
+
+def _run_pack(client, pack, budget):
+    # pack: list of (input_hash, profile)
+    if len(pack) == 1:
+        input_hash, profile = pack[0]
+        return [(input_hash, _generate(client, build_prompt(profile), budget).strip())]
+
+    answers = parse_batch_response(
+        _generate(client, build_batch_prompt([profile for _, profile in pack]), budget), len(pack)
+    )
+    if answers is None:
+        # Malformed packed answer: fall back to one prompt per profile, for
+        # as many profiles as the budget still covers
+        pairs = []
+        for item in pack:
+            try:
+                pairs.extend(_run_pack(client, [item], budget))
+            except BudgetExhausted:
+                break
+        return pairs
+    return [(input_hash, answer) for (input_hash, _), answer in zip(pack, answers)]
+
+
+# 👉 Estimate every row; only cache misses reach the client, and at most
+# budget.limit model calls are made (rows past it are left empty)
+def predict_batch(frame, client=None, max_workers=4, per_prompt=1, write_cache=True, budget=None):
+    client = client or GeminiClient()
+    budget = budget or CallBudget()
+    calls_before = budget.used
+    cache_db.init_db()
+
+    profiles = _profiles(frame)
+    hashes = [generate_input_hash(**profile) for profile in profiles]
+
+    # One query for everything already cached
+    results = cache_db.get_cached_results(set(hashes), ttl_seconds=prediction_cache.TTL_SECONDS)
+    misses = {}
+    for input_hash, profile in zip(hashes, profiles):
+        if input_hash not in results:
+            misses.setdefault(input_hash, profile)
+
+    stats = {
+        "rows": len(profiles),
+        "unique": len(set(hashes)),
+        "cached": len(set(hashes)) - len(misses),
+        "requested": len(misses),
+        "failed": 0,
+        "prompts": 0,
+    }
+
+    pending = list(misses.items())
+    packs = [pending[i:i + per_prompt] for i in range(0, len(pending), max(per_prompt, 1))]
+    fresh = []
+    with futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+        jobs = [pool.submit(_run_pack, client, pack, budget) for pack in packs]
+        stats["prompts"] = len(jobs)
+        for job in futures.as_completed(jobs):
+            try:
+                fresh.extend(job.result())
+            except BudgetExhausted:
+                pass
+            except Exception:
+                stats["failed"] += 1
+    stats["calls"] = budget.used - calls_before
+    stats["unanswered"] = len(misses) - len(fresh)
+
+    # All new answers land in the cache in one transaction
+    if fresh and write_cache:
+        prediction_cache.put_many(fresh)
+    results.update(fresh)
+
+    out = frame.copy()
+    out[RESULT_COLUMN] = [results.get(input_hash) for input_hash in hashes]
+    return out, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="CSV with the same columns as Employee_Salary_Data.csv")
+    parser.add_argument("-o", "--output", help="Where to write the estimates (default: stdout)")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent model requests")
+    parser.add_argument("--per-prompt", type=int, default=1, help="Profiles packed into one prompt")
+    parser.add_argument("--stub", action="store_true", help="Use the offline stub model")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    frame = pd.read_csv(args.input)
+    client = StubClient() if args.stub else GeminiClient()
+    out, stats = predict_batch(frame, client, max_workers=args.workers, per_prompt=args.per_prompt)
+    elapsed = time.perf_counter() - start
+
+    if args.output:
+        out.to_csv(args.output, index=False)
+    else:
+        print(out.to_csv(index=False))
+    print(
+        f"{stats['rows']} rows ({stats['unique']} unique): {stats['cached']} from cache, "
+        f"{stats['requested']} requested in {stats['prompts']} prompts ({stats['calls']} model calls), "
+        f"{stats['failed']} failed prompts, {elapsed:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from services import metrics
+
+DB_FILE = os.getenv("SALARY_CACHE_DB", "salary_cache.db")
+
+# WAL lets readers run alongside a writer; NORMAL sync is durable across
+# app crashes in WAL mode and avoids an fsync per commit.
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-8000",
+    "PRAGMA mmap_size=67108864",
+)
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS salary_cache (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        input_hash TEXT UNIQUE,
+        result TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+# Expiry and size-based eviction both scan by age
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_salary_cache_created_at ON salary_cache (created_at)",
+)
+
+
+class ConnectionPool:
+    # Process-wide pool of ready-to-use connections. Streamlit runs each
+    # script execution on its own thread, so connections are handed out per
+    # operation instead of being pinned to a thread.
+    def __init__(self, path=DB_FILE, max_size=8):
+        self.path = path
+        self.max_size = max_size
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.max_size:
+                self._created += 1
+                return self._connect()
+        return self._idle.get()
+
+    @contextmanager
+    def connection(self):
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    # 👉 Group several statements into one commit
+    @contextmanager
+    def transaction(self):
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._lock:
+            self._created = 0
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(path=DB_FILE):
+    pool = _pools.get(path)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.setdefault(path, ConnectionPool(path))
+    return pool
+
+
+# 👉 Initialize database and table if not exists
+def init_db(path=DB_FILE):
+    with get_pool(path).connection() as conn:
+        conn.execute(SCHEMA)
+        for index in INDEXES:
+            conn.execute(index)
+
+
+def _cutoff(ttl_seconds):
+    return str(datetime.now() - timedelta(seconds=ttl_seconds))
+
+
+# 👉 DB: check for existing result (ignoring rows older than ttl_seconds)
+def get_cached_result(input_hash, path=DB_FILE, ttl_seconds=None):
+    sql = "SELECT result FROM salary_cache WHERE input_hash = ?"
+    params = (input_hash,)
+    if ttl_seconds:
+        sql += " AND created_at >= ?"
+        params += (_cutoff(ttl_seconds),)
+    with metrics.span("sqlite.get"), get_pool(path).connection() as conn:
+        row = conn.execute(sql, params).fetchone()
+    return row[0] if row else None
+
+
+# 👉 DB: bulk lookup, returns {input_hash: result} for the keys that are cached
+def get_cached_results(input_hashes, path=DB_FILE, ttl_seconds=None, chunk_size=500):
+    input_hashes = list(input_hashes)
+    found = {}
+    with metrics.span("sqlite.get_many"), get_pool(path).connection() as conn:
+        for i in range(0, len(input_hashes), chunk_size):
+            chunk = input_hashes[i:i + chunk_size]
+            sql = f"SELECT input_hash, result FROM salary_cache WHERE input_hash IN ({','.join('?' * len(chunk))})"
+            params = tuple(chunk)
+            if ttl_seconds:
+                sql += " AND created_at >= ?"
+                params += (_cutoff(ttl_seconds),)
+            found.update(conn.execute(sql, params).fetchall())
+    return found
+
+
+# 👉 DB: save result
+def save_result(input_hash, result, path=DB_FILE):
+    save_results([(input_hash, result)], path)
+
+
+# 👉 DB: save many results in a single transaction
+def save_results(items, path=DB_FILE):
+    now = str(datetime.now())
+    with metrics.span("sqlite.save"), get_pool(path).transaction() as conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO salary_cache (input_hash, result, created_at) VALUES (?, ?, ?)",
+            [(input_hash, result, now) for input_hash, result in items]
+        )
+
+
+# 👉 DB: drop expired rows, then the oldest rows beyond max_rows
+def evict(path=DB_FILE, ttl_seconds=None, max_rows=None):
+    removed = 0
+    with metrics.span("sqlite.evict"), get_pool(path).transaction() as conn:
+        if ttl_seconds:
+            removed += conn.execute(
+                "DELETE FROM salary_cache WHERE created_at < ?", (_cutoff(ttl_seconds),)
+            ).rowcount
+        if max_rows:
+            (count,) = conn.execute("SELECT COUNT(*) FROM salary_cache").fetchone()
+            if count > max_rows:
+                removed += conn.execute(
+                    """
+                    DELETE FROM salary_cache WHERE id IN (
+                        SELECT id FROM salary_cache ORDER BY created_at LIMIT ?
+                    )
+                    """,
+                    (count - max_rows,)
+                ).rowcount
+    return removed
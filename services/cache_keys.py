@@ -0,0 +1,190 @@
+"""Canonical prediction-cache keys, and migration of legacy keys.
+
+    python -m services.cache_keys migrate                # dataset profiles
+    python -m services.cache_keys migrate --exhaustive   # every form combination
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import os
+import unicodedata
+
+from services import cache_db
+
+# Bump when the key layout below changes
+KEY_VERSION = 2
+# Experience is quantized to bands of this many years before hashing, so
+# nearby profiles share one answer (0 keeps it exact, to 0.1 years)
+EXPERIENCE_BUCKET = float(os.getenv("SALARY_CACHE_EXP_BUCKET", 1.0))
+
+# Profile fields, in the order the legacy hash joined them
+PROFILE_KEYS = [
+    "job_title", "employment_type", "industry", "company_size",
+    "years_exp", "remote", "location", "education_level",
+]
+# Dataset column for every profile field except years_exp
+PROFILE_COLUMNS = {
+    "job_title": "Job Title",
+    "employment_type": "Employment Type",
+    "industry": "Industry",
+    "company_size": "Company Size",
+    "remote": "Remote",
+    "location": "Location",
+    "education_level": "Education Level",
+}
+
+
+# 👉 " Data  Scientist" and "data scientist" are the same profile
+def normalize_text(value):
+    text = unicodedata.normalize("NFKC", str(value))
+    return " ".join(text.split()).casefold()
+
+
+# 👉 4.5, 4.50 and "4.5" are one value; with a bucket, the band's lower edge
+def bucket_experience(years, bucket=EXPERIENCE_BUCKET):
+    years = float(years)
+    if math.isnan(years):
+        return "unknown"
+    years = round(years, 1)
+    if bucket > 0:
+        years = math.floor(years / bucket + 1e-9) * bucket
+    return f"{years:.1f}"
+
+
+def canonical_profile(profile, bucket=EXPERIENCE_BUCKET):
+    canonical = {key: normalize_text(profile[key]) for key in PROFILE_COLUMNS}
+    canonical["years_exp"] = bucket_experience(profile["years_exp"], bucket)
+    return canonical
+
+
+# 👉 Versioned key: canonical profile + model + prompt version + bucket size
+def cache_key(profile, model, prompt_version, bucket=EXPERIENCE_BUCKET):
+    payload = json.dumps(
+        {
+            "profile": canonical_profile(profile, bucket),
+            "model": model or "",
+            "prompt": prompt_version,
+            "bucket": bucket,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return f"v{KEY_VERSION}:" + hashlib.sha256(payload.encode()).hexdigest()
+
+
+# The key generate_input_hash produced before KEY_VERSION 2
+def legacy_key(profile):
+    combined = "|".join(str(profile[key]) for key in PROFILE_KEYS)
+    return hashlib.sha256(combined.encode()).hexdigest()
+
+
+def _years_variants(years):
+    # Spellings the old key could have seen: form floats ("5.0") and
+    # integer CSV columns ("5")
+    years = round(years, 1)
+    yield str(years)
+    if years == int(years):
+        yield str(int(years))
+
+
+def _candidates(combos, years_grid):
+    for combo in combos:
+        for years in years_grid:
+            for spelled in _years_variants(years):
+                yield dict(combo, years_exp=spelled)
+
+
+def _years_grid(max_years, step):
+    return [round(i * step, 1) for i in range(int(math.ceil(max_years / step)) + 1)]
+
+
+# 👉 Re-key legacy rows. Old keys are one-way hashes, so profiles are
+# recovered by recomputing old keys over candidate profiles: the dataset's
+# own combinations at every 0.1 year, then (exhaustive) every combination
+# of the form's options at the form's 0.5 year step. Rows that cannot be
+# recovered stay until TTL/size eviction, unless drop_unrecovered is set.
+def migrate_legacy_keys(data, model, prompt_version, bucket=EXPERIENCE_BUCKET,
+                        exhaustive=False, drop_unrecovered=False, path=cache_db.DB_FILE):
+    with cache_db.get_pool(path).connection() as conn:
+        rows = conn.execute(
+            "SELECT input_hash, result, created_at FROM salary_cache WHERE input_hash NOT LIKE 'v%'"
+        ).fetchall()
+    legacy = {input_hash: (result, created_at) for input_hash, result, created_at in rows}
+    report = {"legacy_rows": len(legacy), "recovered": 0, "rekeyed": 0, "dropped": 0, "candidates": 0}
+    if not legacy:
+        return report
+
+    columns = list(PROFILE_COLUMNS.values())
+    max_years = float(data["YearsExperience"].max()) + 1
+    observed = (
+        data[columns].dropna().drop_duplicates().astype(str)
+        .rename(columns={col: key for key, col in PROFILE_COLUMNS.items()})
+        .to_dict("records")
+    )
+    searches = [(observed, _years_grid(max_years, 0.1))]
+    if exhaustive:
+        options = [sorted(data[col].dropna().astype(str).unique()) for col in columns]
+        combos = (dict(zip(PROFILE_COLUMNS, values)) for values in itertools.product(*options))
+        searches.append((combos, _years_grid(max_years, 0.5)))
+
+    recovered = {}
+    for combos, years_grid in searches:
+        for profile in _candidates(combos, years_grid):
+            report["candidates"] += 1
+            key = legacy_key(profile)
+            if key in legacy and key not in recovered:
+                recovered[key] = profile
+                if len(recovered) == len(legacy):
+                    break
+        if len(recovered) == len(legacy):
+            break
+    report["recovered"] = len(recovered)
+
+    # Newest answer wins when several legacy rows fall into one new key
+    new_rows = {}
+    for old_key in sorted(recovered, key=lambda k: legacy[k][1] or "", reverse=True):
+        new_key = cache_key(recovered[old_key], model, prompt_version, bucket)
+        new_rows.setdefault(new_key, legacy[old_key])
+
+    stale = list(recovered)
+    if drop_unrecovered:
+        stale = list(legacy)
+    with cache_db.get_pool(path).transaction() as conn:
+        # A fresh answer already stored under the new key is kept
+        report["rekeyed"] = conn.executemany(
+            "INSERT OR IGNORE INTO salary_cache (input_hash, result, created_at) VALUES (?, ?, ?)",
+            [(key, result, created_at) for key, (result, created_at) in new_rows.items()]
+        ).rowcount
+        conn.executemany("DELETE FROM salary_cache WHERE input_hash = ?", [(key,) for key in stale])
+    report["dropped"] = len(stale) - len(recovered)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["migrate"])
+    parser.add_argument("--exhaustive", action="store_true",
+                        help="also try every combination of the form's options")
+    parser.add_argument("--drop-unrecovered", action="store_true",
+                        help="delete legacy rows that could not be re-keyed")
+    args = parser.parse_args()
+
+    from services.dataset import load_dataset
+    from services.gemini import GEMINI_MODEL, PROMPT_VERSION
+
+    cache_db.init_db()
+    report = migrate_legacy_keys(
+        load_dataset(), GEMINI_MODEL, PROMPT_VERSION,
+        exhaustive=args.exhaustive, drop_unrecovered=args.drop_unrecovered,
+    )
+    print(
+        f"{report['legacy_rows']} legacy rows: {report['recovered']} recovered "
+        f"({report['candidates']:,} candidate profiles tried), {report['rekeyed']} new keys written, "
+        f"{report['dropped']} dropped"
+    )
+
+
+if __name__ == "__main__":
+    main()
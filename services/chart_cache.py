@@ -0,0 +1,170 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from services import dataset, metrics
+
+YEARS = "YearsExperience"
+SALARY = "Salary (in INR)"
+MAX_FIGURES = 32
+
+_figures = OrderedDict()
+_figures_lock = threading.Lock()
+
+
+# 👉 Figure (or any rendered artefact) cached per dataset version + params.
+# Cached figures are shared between sessions and must not be mutated.
+# With `update(value, delta) -> value`, an entry is carried over to the next
+# version when rows are appended; without it, the entry is dropped.
+def get_or_build(data: pd.DataFrame, name, builder, update=None, **params):
+    version = data.attrs.get("dataset_version")
+    if version is None:
+        with metrics.span("figure.build", figure=name):
+            return builder()
+    key = (version, name, tuple(sorted(params.items())))
+    with _figures_lock:
+        if key in _figures:
+            _figures.move_to_end(key)
+            metrics.count("figure_cache.lookups", figure=name, result="hit")
+            return _figures[key][0]
+    metrics.count("figure_cache.lookups", figure=name, result="miss")
+    with metrics.span("figure.build", figure=name):
+        figure = builder()
+    _store(key, figure, update)
+    return figure
+
+
+def _store(key, figure, update):
+    with _figures_lock:
+        _figures[key] = (figure, update)
+        while len(_figures) > MAX_FIGURES:
+            _figures.popitem(last=False)
+
+
+def _update_figures(previous_version, version, delta):
+    with _figures_lock:
+        stale = [key for key in _figures if key[0] == previous_version]
+        entries = [(key, _figures.pop(key)) for key in stale]
+    for (_, name, params), (figure, update) in entries:
+        if update is not None:
+            with metrics.span("figure.update", figure=name):
+                _store((version, name, params), update(figure, delta), update)
+
+
+class RunningStats:
+    # Aggregates behind the Contribute dashboard, kept as plain sums so a
+    # contributed row is folded in with O(1) work: counts per job title and
+    # location, salary sums per location and the OLS sufficient statistics
+    # (n, Σx, Σy, Σx², Σxy) for salary vs. years of experience.
+    def __init__(self):
+        self.job_counts = {}
+        self.location_counts = {}
+        self.location_salary = {}
+        self.location_salary_n = {}
+        self.n = 0
+        self.sx = self.sy = self.sxx = self.sxy = 0.0
+        self.rows_seen = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame):
+        stats = cls()
+        stats.rows_seen = len(data)
+        stats.job_counts = data["Job Title"].value_counts(sort=False).to_dict()
+        stats.location_counts = data["Location"].value_counts(sort=False).to_dict()
+        by_location = data.groupby("Location", observed=True)[SALARY].agg(["sum", "count"])
+        stats.location_salary = by_location["sum"].astype(float).to_dict()
+        stats.location_salary_n = by_location["count"].to_dict()
+
+        both = data[YEARS].notna() & data[SALARY].notna()
+        x = data.loc[both, YEARS].to_numpy(dtype=float)
+        y = data.loc[both, SALARY].to_numpy(dtype=float)
+        stats.n = len(x)
+        stats.sx, stats.sy = float(x.sum()), float(y.sum())
+        stats.sxx, stats.sxy = float(x @ x), float(x @ y)
+        return stats
+
+    # 👉 O(1) update for one contributed row
+    def add_row(self, row):
+        with self._lock:
+            self.rows_seen += 1
+            job, location = row["Job Title"], row["Location"]
+            self.job_counts[job] = self.job_counts.get(job, 0) + 1
+            self.location_counts[location] = self.location_counts.get(location, 0) + 1
+            salary = row.get(SALARY)
+            years = row.get(YEARS)
+            if salary is None or pd.isna(salary):
+                return
+            salary = float(salary)
+            self.location_salary[location] = self.location_salary.get(location, 0.0) + salary
+            self.location_salary_n[location] = self.location_salary_n.get(location, 0) + 1
+            if years is None or pd.isna(years):
+                return
+            years = float(years)
+            self.n += 1
+            self.sx += years
+            self.sy += salary
+            self.sxx += years * years
+            self.sxy += years * salary
+
+    def job_distribution(self):
+        with self._lock:
+            rows = [(job, count) for job, count in self.job_counts.items() if count]
+        return pd.DataFrame(rows, columns=["Job Title", "Count"])
+
+    def location_distribution(self):
+        with self._lock:
+            rows = [(loc, count) for loc, count in self.location_counts.items() if count]
+        frame = pd.DataFrame(rows, columns=["Location", "Count"])
+        return frame.sort_values("Count", ascending=False, kind="stable")
+
+    def location_average(self):
+        with self._lock:
+            rows = [
+                (loc, self.location_salary[loc] / n)
+                for loc, n in self.location_salary_n.items() if n
+            ]
+        return pd.DataFrame(rows, columns=["Location", SALARY]).sort_values("Location")
+
+    # 👉 Ordinary least squares line from the running sums
+    def ols(self):
+        with self._lock:
+            n, sx, sy, sxx, sxy = self.n, self.sx, self.sy, self.sxx, self.sxy
+        denominator = n * sxx - sx * sx
+        if n < 2 or denominator == 0:
+            return None
+        slope = (n * sxy - sx * sy) / denominator
+        intercept = (sy - slope * sx) / n
+        return slope, intercept
+
+    def trendline(self, x_min, x_max):
+        fit = self.ols()
+        if fit is None:
+            return None
+        slope, intercept = fit
+        x = np.array([x_min, x_max], dtype=float)
+        return x, intercept + slope * x
+
+
+def _add_rows(stats, delta):
+    for row in delta.to_dict("records"):
+        stats.add_row(row)
+    return stats
+
+
+# 👉 Shared running aggregates; appended rows are folded into the sums
+_stats = dataset.VersionedCache("chart_stats", RunningStats.from_frame, update=_add_rows)
+
+
+def get_stats(data: pd.DataFrame):
+    return _stats.get(data)
+
+
+# Carried-over figure entries follow the dataset to its new version
+def _apply_delta(previous_version, data, delta):
+    _update_figures(previous_version, data.attrs["dataset_version"], delta)
+
+
+dataset.on_append(_apply_delta)
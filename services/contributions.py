@@ -0,0 +1,227 @@
+import csv
+import io
+import json
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from services import coordinator, dataset, metrics
+from services.dataset import CSV_FILE, COLUMNS, INTENT_SUFFIX, JOURNAL_SUFFIX
+
+# Contributions are appended to a header-less journal next to the CSV.
+# Every append is a single write() + fsync under an exclusive file lock, so
+# concurrent sessions (and processes) never overwrite each other and a
+# submission costs O(row) instead of rewriting the whole dataset.
+# compact() periodically folds the journal into the canonical CSV.
+LOCK_SUFFIX = ".lock"
+
+# Fold the journal into the CSV once it grows past this many bytes
+COMPACT_THRESHOLD_BYTES = int(os.getenv("CONTRIB_COMPACT_BYTES", 256 * 1024))
+
+_thread_lock = threading.Lock()
+
+
+def journal_path(path=CSV_FILE):
+    return path + JOURNAL_SUFFIX
+
+
+@contextmanager
+def _locked(path):
+    # Thread lock for sessions in this process, file lock for other processes
+    with _thread_lock:
+        fd = os.open(path + LOCK_SUFFIX, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            os.close(fd)
+
+
+def _fsync_path(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_intent(path, intent):
+    tmp = path + INTENT_SUFFIX + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(intent, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path + INTENT_SUFFIX)
+
+
+def _encode_rows(rows):
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    for row in rows:
+        writer.writerow([row.get(col, "") for col in COLUMNS])
+    return buf.getvalue().encode()
+
+
+def _append_bytes(path, payload):
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, payload)
+        os.fsync(fd)
+        return os.fstat(fd).st_size
+    finally:
+        os.close(fd)
+
+
+def _ensure_canonical(path):
+    if os.path.exists(path) and os.path.getsize(path) > 0:
+        return
+    _append_bytes(path, (",".join(COLUMNS) + "\n").encode())
+
+
+# 👉 Finish (or roll back) a compaction or bulk append interrupted by a crash
+def _recover(path):
+    intent_file = path + INTENT_SUFFIX
+    if not os.path.exists(intent_file):
+        return
+    with open(intent_file) as f:
+        intent = json.load(f)
+
+    if intent["phase"] == "ingest":
+        # A bulk append is all or nothing: cut the journal back to before it
+        # (a crash before the first write may leave no journal at all)
+        if os.path.exists(journal_path(path)):
+            os.truncate(journal_path(path), intent["journal_size"])
+            _fsync_path(journal_path(path))
+        os.remove(intent_file)
+    elif intent["phase"] == "append":
+        # The CSV may hold a partial copy of the journal: cut it back and redo
+        os.truncate(path, intent["csv_size"])
+        _fsync_path(path)
+        _copy_journal(path, intent["csv_size"])
+    else:
+        # The CSV already holds the journal: only the truncate is left
+        os.truncate(journal_path(path), 0)
+        _fsync_path(journal_path(path))
+        os.remove(intent_file)
+
+
+def _copy_journal(path, csv_size):
+    # Stream the journal across so bulk uploads never sit in memory at once
+    with open(journal_path(path), "rb") as src, open(path, "ab") as dst:
+        shutil.copyfileobj(src, dst, 1 << 20)
+        dst.flush()
+        os.fsync(dst.fileno())
+        moved = os.path.getsize(path) - csv_size
+    _write_intent(path, {"phase": "truncate", "csv_size": csv_size})
+    os.truncate(journal_path(path), 0)
+    _fsync_path(journal_path(path))
+    os.remove(path + INTENT_SUFFIX)
+    return moved
+
+
+def _compact_locked(path):
+    _recover(path)
+    journal = journal_path(path)
+    if not os.path.exists(journal) or os.path.getsize(journal) == 0:
+        return 0
+
+    _ensure_canonical(path)
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            _append_bytes(path, b"\n")
+
+    # Write-ahead intent: remember where the CSV ended before we touch it
+    csv_size = os.path.getsize(path)
+    _write_intent(path, {"phase": "append", "csv_size": csv_size})
+    return _copy_journal(path, csv_size)
+
+
+# 👉 Durable O(1) append of one or more contributed rows. With several
+# worker processes the coordinator is the single writer; workers pick the
+# rows up from the journal on their next load_dataset(). The rows are only
+# written here if the coordinator was never reached; if it may have them,
+# a failure raises coordinator.CoordinatorError instead.
+@metrics.timed("contributions.append")
+def append_rows(rows, path=CSV_FILE, local=False):
+    if not local and coordinator.enabled():
+        added = coordinator.write("writer", "append_rows", list(rows), path)
+        if added is not None:
+            return added
+    payload = _encode_rows(rows)
+    with _locked(path):
+        _recover(path)
+        before = dataset.dataset_signature(path)
+        journal_size = _append_bytes(journal_path(path), payload)
+        if journal_size >= COMPACT_THRESHOLD_BYTES:
+            with metrics.span("contributions.compact"):
+                _compact_locked(path)
+        # Still under the lock, so no other writer can slip in between:
+        # the in-memory dataset and its derived state take the rows as a delta
+        dataset.apply_append(payload, before, dataset.dataset_signature(path), path)
+    metrics.count("contributions.rows", len(rows))
+    return len(rows)
+
+
+def append_row(row, path=CSV_FILE):
+    return append_rows([row], path)
+
+
+# 👉 Append a spooled, header-less CSV (journal format) as one unit: after a
+# crash either every row is in the journal or none is. Streams the file, so
+# uploads of any size never sit in memory here. Returns the rows appended.
+@metrics.timed("contributions.append_file")
+def append_file(spool_path, path=CSV_FILE, local=False):
+    if not local and coordinator.enabled():
+        added = coordinator.write("writer", "append_file", spool_path, path)
+        if added is not None:
+            return added
+    rows = 0
+    with _locked(path):
+        _recover(path)
+        before = dataset.dataset_signature(path)
+        journal = journal_path(path)
+        journal_size = os.path.getsize(journal) if os.path.exists(journal) else 0
+        _write_intent(path, {"phase": "ingest", "journal_size": journal_size})
+        with open(spool_path, "rb") as src, open(journal, "ab") as dst:
+            for chunk in iter(lambda: src.read(1 << 20), b""):
+                dst.write(chunk)
+                rows += chunk.count(b"\n")
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.remove(path + INTENT_SUFFIX)
+        if journal_size + os.path.getsize(spool_path) >= COMPACT_THRESHOLD_BYTES:
+            with metrics.span("contributions.compact"):
+                _compact_locked(path)
+        dataset.apply_append(spool_path, before, dataset.dataset_signature(path), path)
+    metrics.count("contributions.rows", rows)
+    return rows
+
+
+# 👉 Fold pending journal rows into the canonical CSV; returns bytes moved
+def compact(path=CSV_FILE):
+    with _locked(path):
+        return _compact_locked(path)
+
+
+def pending_rows(path=CSV_FILE):
+    journal = journal_path(path)
+    if not os.path.exists(journal):
+        return 0
+    with open(journal, "rb") as f:
+        return sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 16), b""))
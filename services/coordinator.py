@@ -0,0 +1,268 @@
+"""Shared services for multi-process serving (see serve.py).
+
+One coordinator process owns the state that worker processes must agree on:
+the prediction cache's memory tier and the only writer of contributions.
+Workers reach it through a multiprocessing manager; it stands in for a
+networked cache, so the address can point at another host.
+
+    SALARY_SERVICE_ADDR=127.0.0.1:8599  coordinator address (unset: single process)
+    SALARY_SERVICE_KEY=...              shared secret for the connection; required
+                                        unless the address is loopback (the
+                                        connection carries pickles)
+
+    python -m services.coordinator --address 127.0.0.1:8599
+"""
+import argparse
+import ipaddress
+import os
+import threading
+import time
+from concurrent import futures
+from multiprocessing import ProcessError
+from multiprocessing.managers import BaseManager
+
+from services import dataset, metrics
+
+SERVICE_ADDR = os.getenv("SALARY_SERVICE_ADDR")
+SERVICE_KEY = os.getenv("SALARY_SERVICE_KEY")
+# Only for a coordinator bound to (and reached on) loopback
+LOOPBACK_KEY = "salary-local"
+# Coordinator-side memory tier (shared by every worker)
+CACHE_SIZE = int(os.getenv("SALARY_SERVICE_CACHE_SIZE", 65536))
+# After a failed call, workers use their local fallbacks for this long
+RETRY_AFTER_SECONDS = float(os.getenv("SALARY_SERVICE_RETRY_SECONDS", 5))
+# How long a worker waits for an answer (writes may append a whole upload)
+CALL_TIMEOUT_SECONDS = float(os.getenv("SALARY_SERVICE_TIMEOUT", 5))
+WRITE_TIMEOUT_SECONDS = float(os.getenv("SALARY_SERVICE_WRITE_TIMEOUT", 120))
+
+
+def parse_address(text):
+    host, _, port = text.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def _loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+# 👉 The connection's shared secret. Manager connections unpickle what they
+# receive, so the built-in key is refused off loopback.
+def service_key(address):
+    if SERVICE_KEY:
+        return SERVICE_KEY
+    if _loopback(parse_address(address)[0]):
+        return LOOPBACK_KEY
+    raise RuntimeError(f"SALARY_SERVICE_KEY must be set to serve or reach the coordinator on {address}")
+
+
+class CoordinatorError(Exception):
+    # A failed coordinator call. `sent` is True when the request may have
+    # reached the coordinator: a write may or may not have been applied,
+    # so it must not be repeated locally.
+    def __init__(self, message, sent):
+        super().__init__(message)
+        self.sent = sent
+
+
+class CacheStore:
+    # Memory tier of the prediction cache, hosted by the coordinator. The
+    # LRU/TTL logic is the in-process one; only where it lives changes.
+    def __init__(self, max_size=CACHE_SIZE):
+        from services.prediction_cache import LRUCache, TTL_SECONDS
+        self._cache = LRUCache(max_size, TTL_SECONDS)
+        self._lock = threading.Lock()
+        self._stats = {"gets": 0, "hits": 0, "puts": 0}
+
+    def get(self, key):
+        value = self._cache.get(key)
+        with self._lock:
+            self._stats["gets"] += 1
+            self._stats["hits"] += value is not None
+        return value
+
+    def get_many(self, keys):
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def put_many(self, items):
+        for key, value in items:
+            self._cache.put(key, value)
+        with self._lock:
+            self._stats["puts"] += len(items)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, size=len(self._cache))
+
+
+class ContributionWriter:
+    # The single writer: every worker's contributions are appended here, one
+    # at a time. It keeps the dataset loaded so that a compaction refreshes
+    # the snapshot the workers map, instead of each re-parsing the CSV.
+    def __init__(self, path=dataset.CSV_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self.appended = 0
+        dataset.load_dataset(path)
+
+    def append_rows(self, rows, path=None):
+        from services import contributions
+        path = path or self.path
+        with self._lock:
+            dataset.load_dataset(path)
+            added = contributions.append_rows(rows, path, local=True)
+            self.appended += added
+            return added
+
+    # The spool file is on this host: workers and coordinator share a disk
+    def append_file(self, spool_path, path=None):
+        from services import contributions
+        path = path or self.path
+        with self._lock:
+            dataset.load_dataset(path)
+            added = contributions.append_file(spool_path, path, local=True)
+            self.appended += added
+            return added
+
+
+_cache_store = {"store": None}
+_writer = {"writer": None}
+
+
+def _get_cache():
+    if _cache_store["store"] is None:
+        _cache_store["store"] = CacheStore()
+    return _cache_store["store"]
+
+
+def _get_writer():
+    if _writer["writer"] is None:
+        _writer["writer"] = ContributionWriter()
+    return _writer["writer"]
+
+
+class ServiceManager(BaseManager):
+    pass
+
+
+ServiceManager.register("cache", callable=_get_cache, exposed=("get", "get_many", "put_many", "clear", "stats"))
+ServiceManager.register("writer", callable=_get_writer, exposed=("append_rows", "append_file"))
+
+
+# 👉 Run the coordinator in this process until it is killed
+def run_server(address, authkey=None):
+    authkey = authkey or service_key(address)
+    _get_cache()
+    _get_writer()
+    manager = ServiceManager(address=parse_address(address), authkey=authkey.encode())
+    manager.get_server().serve_forever()
+
+
+# Worker side. Manager proxies open one connection per calling thread, and
+# Streamlit runs every rerun on a fresh thread, so calls are funnelled
+# through a small pool: a worker process holds at most CLIENT_THREADS
+# connections to the coordinator.
+CLIENT_THREADS = int(os.getenv("SALARY_SERVICE_CLIENT_THREADS", 4))
+_client = {"manager": None, "cache": None, "writer": None, "down_until": 0.0}
+_client_lock = threading.Lock()
+_pool = futures.ThreadPoolExecutor(max_workers=CLIENT_THREADS, thread_name_prefix="coordinator")
+# A misconfigured worker fails at startup, not on its first request
+_CLIENT_KEY = service_key(SERVICE_ADDR) if SERVICE_ADDR else None
+
+
+def enabled():
+    return bool(SERVICE_ADDR) and time.monotonic() >= _client["down_until"]
+
+
+def _proxy(name):
+    proxy = _client[name]
+    if proxy is not None:
+        return proxy
+    with _client_lock:
+        if _client["manager"] is None:
+            manager = ServiceManager(address=parse_address(SERVICE_ADDR), authkey=_CLIENT_KEY.encode())
+            manager.connect()
+            _client["manager"] = manager
+        if _client[name] is None:
+            _client[name] = getattr(_client["manager"], name)()
+        return _client[name]
+
+
+def _call(name, method, args, sent):
+    proxy = _proxy(name)
+    sent.set()  # from here on the coordinator may act on the request
+    return getattr(proxy, method)(*args)
+
+
+# Unreachable, wrong key or timed out (TimeoutError is an OSError). Other
+# errors were raised on the coordinator: managers re-raise them here as
+# themselves or as RemoteError, and the connection is still good.
+_CONNECTION_ERRORS = (OSError, EOFError, ProcessError)
+
+
+def _request(name, method, args, timeout):
+    sent = threading.Event()
+    future = _pool.submit(_call, name, method, args, sent)
+    try:
+        with metrics.span("coordinator.call", method=f"{name}.{method}"):
+            return future.result(timeout=timeout)
+    except Exception as e:
+        metrics.count("coordinator.errors", error=type(e).__name__)
+        # A call still queued is dropped; one already running may yet arrive
+        maybe_sent = sent.is_set() if future.done() else not future.cancel()
+        if isinstance(e, _CONNECTION_ERRORS):
+            with _client_lock:
+                _client.update(manager=None, cache=None, writer=None,
+                               down_until=time.monotonic() + RETRY_AFTER_SECONDS)
+        raise CoordinatorError(f"coordinator call {name}.{method} failed: {type(e).__name__}: {e}", maybe_sent) from e
+
+
+# 👉 Call a shared service; returns `default` when the coordinator is not
+# configured or the call fails (workers then fall back to local behaviour
+# for RETRY_AFTER_SECONDS instead of failing requests)
+def call(name, method, *args, default=None):
+    if not enabled():
+        return default
+    try:
+        return _request(name, method, args, CALL_TIMEOUT_SECONDS)
+    except CoordinatorError:
+        return default
+
+
+# 👉 A write through the coordinator. Returns `default` only when the
+# request cannot have reached it, so the caller may write locally instead;
+# otherwise a failure raises CoordinatorError, since a local write after a
+# remote one that did land would apply it twice.
+def write(name, method, *args, default=None):
+    if not enabled():
+        return default
+    try:
+        return _request(name, method, args, WRITE_TIMEOUT_SECONDS)
+    except CoordinatorError as e:
+        if e.sent:
+            raise
+        return default
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--address", default=SERVICE_ADDR or "127.0.0.1:8599")
+    args = parser.parse_args()
+    print(f"Coordinator listening on {args.address}")
+    run_server(args.address)
+
+
+if __name__ == "__main__":
+    main()
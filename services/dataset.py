@@ -0,0 +1,395 @@
+import io
+import json
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+from services import metrics, snapshot
+
+CSV_FILE = "Employee_Salary_Data.csv"
+JOURNAL_SUFFIX = ".journal"
+# Write-ahead intent of a compaction or bulk append (services/contributions.py)
+INTENT_SUFFIX = ".compact"
+
+COLUMNS = [
+    "Job Title", "Industry", "Education Level", "Location", "Employment Type",
+    "YearsExperience", "Salary (in INR)", "Company Size", "Remote"
+]
+
+# Process-wide state: one parsed frame shared by every Streamlit session
+_lock = threading.Lock()
+_state = {
+    "frame": None,
+    "path": None,
+    "signature": None,
+    "version": 0,
+}
+_stats = {
+    "loads": 0,
+    "hits": 0,
+    "appends": 0,
+    "last_append_seconds": 0.0,
+    "last_load_seconds": 0.0,
+    "total_load_seconds": 0.0,
+    "memory_bytes": 0,
+    "bytes_per_row": 0.0,
+    "invalid_values": {},
+    "source": None,
+}
+
+
+# 👉 Cheap change detection: a stat() call instead of re-reading the file
+def file_signature(path=CSV_FILE):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+# The dataset is the canonical CSV plus any contributions still in the journal
+def dataset_signature(path=CSV_FILE):
+    return (file_signature(path), file_signature(path + JOURNAL_SUFFIX))
+
+
+# Typed in-memory schema: compact numerics, categoricals for the labels
+CATEGORICAL_COLUMNS = [
+    "Job Title", "Industry", "Education Level", "Location",
+    "Employment Type", "Company Size", "Remote"
+]
+NUMERIC_COLUMNS = ["YearsExperience", "Salary (in INR)"]
+# float32 is plenty for experience (one decimal, up to 50), but cannot hold
+# every salary the form accepts (up to 10 crore): 123456789 would read back
+# as 123456792, so salaries are float64
+NUMERIC_DTYPES = {"YearsExperience": "float32", "Salary (in INR)": "float64"}
+
+
+# 👉 Validate the columns and coerce them to the typed schema
+def apply_schema(data: pd.DataFrame):
+    missing = [col for col in COLUMNS if col not in data.columns]
+    if missing:
+        raise ValueError(f"Dataset is missing columns: {', '.join(missing)}")
+
+    invalid = {}
+    typed = {}
+    for col in NUMERIC_COLUMNS:
+        values = pd.to_numeric(data[col], errors="coerce")
+        invalid[col] = int(values.isna().sum() - data[col].isna().sum())
+        typed[col] = values.round(1).astype(NUMERIC_DTYPES[col])
+    for col in CATEGORICAL_COLUMNS:
+        values = data[col]
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype("category")
+        typed[col] = values
+    return pd.DataFrame(typed, columns=COLUMNS), invalid
+
+
+_DTYPES = {col: "category" for col in CATEGORICAL_COLUMNS}
+
+
+def _read_journal(source):
+    return pd.read_csv(source, header=None, names=COLUMNS, dtype=_DTYPES)
+
+
+# 👉 Canonical CSV, from the binary snapshot when it is up to date
+def _read_canonical(path):
+    frame = snapshot.load(path)
+    # A snapshot written under an older schema is re-read from the CSV
+    if frame is not None and all(frame[col].dtype == NUMERIC_DTYPES[col] for col in NUMERIC_COLUMNS):
+        meta = frame.attrs.pop("snapshot_meta")
+        return frame, meta.get("invalid", {}), "snapshot"
+    # Tag the snapshot with the file as it was before reading, not after:
+    # a compaction finishing in between must not be marked as included
+    source = snapshot.source_signature(path)
+    frame, invalid = apply_schema(pd.read_csv(path, dtype=_DTYPES))
+    snapshot.write(path, frame, source=source, invalid=invalid)
+    return frame, invalid, "csv"
+
+
+# Whole lines only: a write still in progress shows up as a partial last line
+def _complete_lines(payload):
+    return payload[:payload.rfind(b"\n") + 1]
+
+
+# Journal bytes [start, end), cut back to whole lines
+def _read_journal_bytes(path, start, end):
+    with open(path + JOURNAL_SUFFIX, "rb") as f:
+        f.seek(start)
+        return _complete_lines(f.read(end - start))
+
+
+# 👉 The frame for exactly `signature`: rows appended to the journal after
+# it was taken are left for the next load_dataset() to apply as growth,
+# never read twice. Returns the frame and the signature it really covers.
+def _read_and_prepare(path, signature):
+    csv_signature, journal_signature = signature
+    data, invalid, source = _read_canonical(path)
+    if journal_signature is not None and journal_signature[1] > 0:
+        payload = _read_journal_bytes(path, 0, journal_signature[1])
+        journal_signature = (journal_signature[0], len(payload))
+        pending = _read_journal(io.BytesIO(payload))
+        data, pending_invalid = apply_schema(pd.concat([data, pending], ignore_index=True))
+        invalid = {col: invalid.get(col, 0) + pending_invalid[col] for col in NUMERIC_COLUMNS}
+    _stats["source"] = source
+    _stats["invalid_values"] = invalid
+    _stats["memory_bytes"] = int(data.memory_usage(deep=True).sum())
+    _stats["bytes_per_row"] = _stats["memory_bytes"] / max(len(data), 1)
+    return data, (csv_signature, journal_signature)
+
+
+def _trim_number(values: pd.Series):
+    # 5.0 -> "5", 5.2 -> "5.2", 1462128.0 -> "1462128"
+    text = values.astype("float64").map("{:.1f}".format)
+    return text.str.removesuffix(".0").where(values.notna(), "")
+
+
+# 👉 Display formatting happens only at render time, on the rows being shown
+def format_for_display(frame: pd.DataFrame):
+    shown = frame.copy(deep=False)
+    for col in NUMERIC_COLUMNS:
+        if col in shown.columns:
+            shown[col] = _trim_number(shown[col])
+    return shown
+
+
+# Re-reads allowed when the CSV changes under a reload
+RELOAD_ATTEMPTS = 3
+
+
+# True when the CSV is still `csv_signature` and no compaction is half
+# done (between the copy into the CSV and the journal truncate, a row is
+# in both files)
+def _settled(path, csv_signature):
+    if file_signature(path) != csv_signature:
+        return False
+    try:
+        with open(path + INTENT_SUFFIX) as f:
+            return json.load(f).get("phase") == "ingest"
+    except FileNotFoundError:
+        return True
+    except ValueError:
+        return False
+
+
+# 👉 Parse the CSV once per process, reload only when mtime/size change
+def load_dataset(path=CSV_FILE):
+    signature = dataset_signature(path)
+    frame = _state["frame"]
+    if frame is not None and signature == _state["signature"]:
+        _stats["hits"] += 1
+        metrics.count("dataset.reuses")
+        return frame
+
+    with _lock:
+        # Another session may have reloaded while we waited for the lock
+        if _state["frame"] is not None and signature == _state["signature"]:
+            _stats["hits"] += 1
+            metrics.count("dataset.reuses")
+            return _state["frame"]
+
+        # Rows another process appended to the journal are applied as a delta
+        growth = _journal_growth(path, signature)
+        if growth is not None:
+            payload, covered = growth
+            return _apply(payload, _state["signature"], covered, path)
+
+        start = time.perf_counter()
+        for _ in range(RELOAD_ATTEMPTS):
+            frame, covered = _read_and_prepare(path, signature)
+            # A compaction that ran while we read moved journal rows into
+            # the CSV: what was read may hold them twice, or not at all
+            if _settled(path, signature[0]):
+                break
+            time.sleep(0.05)
+            signature = dataset_signature(path)
+        else:
+            # Still moving: keep this read, but never match the files on
+            # disk, so the next call reloads
+            covered = (None, None)
+        signature = covered
+        elapsed = time.perf_counter() - start
+
+        _state["version"] += 1
+        frame.attrs["dataset_version"] = _state["version"]
+        _state["frame"] = frame
+        _state["path"] = path
+        _state["signature"] = signature
+
+        _stats["loads"] += 1
+        metrics.observe("dataset.read", elapsed, source=_stats["source"])
+        _stats["last_load_seconds"] = elapsed
+        _stats["total_load_seconds"] += elapsed
+        return frame
+
+
+# The frame's codes are re-mapped, never re-hashed from the labels; only the
+# (small) delta is looked up. Categories are the sorted union of both
+# non-null label sets, in the frame's category dtype: a delta column that is
+# all blank has object categories even when the frame's are str.
+def _concat_categorical(old: pd.Series, new: pd.Series):
+    categories = old.cat.categories
+    added = pd.Index(new.dropna().unique(), dtype=categories.dtype).difference(categories)
+    codes = old.cat.codes.to_numpy()
+    if len(added):
+        previous, categories = categories, categories.append(added).sort_values()
+        remap = np.append(categories.get_indexer(previous), -1)
+        codes = remap[codes]  # -1 (missing) picks the appended -1
+    codes = np.concatenate([codes, categories.get_indexer(new.astype(object))])
+    return pd.Categorical.from_codes(codes, dtype=pd.CategoricalDtype(categories))
+
+
+def _concat(frame, delta):
+    columns = {}
+    for col in COLUMNS:
+        if col in CATEGORICAL_COLUMNS:
+            columns[col] = _concat_categorical(frame[col], delta[col])
+        else:
+            columns[col] = np.concatenate([frame[col].to_numpy(), delta[col].to_numpy()])
+    return pd.DataFrame(columns, columns=COLUMNS)
+
+
+# Derived structures (filter index, chart stats, local model, cached
+# aggregates) register here and are handed every appended delta:
+# listener(previous_version, data, delta), where data is the new frame
+_listeners = []
+
+
+def on_append(listener):
+    _listeners.append(listener)
+    return listener
+
+
+class VersionedCache:
+    # One shared value derived from the dataset (filter index, sort index,
+    # chart stats, local model), kept for the newest version:
+    #  - get(data) builds it once per version; frames without a version get
+    #    a private, uncached build;
+    #  - a session still rendering an older version gets its own build and
+    #    never evicts the newer value that appends are applied to;
+    #  - with `update(value, delta) -> value`, appended rows are folded into
+    #    the current value; without it (or if update fails) the value is
+    #    dropped and the next get() rebuilds.
+    def __init__(self, name, build, update=None):
+        self.name = name
+        self._build = build
+        self._update = update
+        # (version, value), replaced as a whole: a reader without the lock
+        # never pairs one version with another version's value
+        self._entry = (None, None)
+        self._lock = threading.Lock()
+        on_append(self._apply_delta)
+
+    def get(self, data: pd.DataFrame):
+        version = data.attrs.get("dataset_version")
+        if version is None:
+            return self._build(data)
+        cached_version, value = self._entry
+        if value is not None and cached_version == version:
+            return value
+        with self._lock:
+            cached_version, value = self._entry
+            if value is not None and cached_version == version:
+                return value
+            with metrics.span(f"{self.name}.build"):
+                value = self._build(data)
+            if cached_version is None or version > cached_version:
+                self._entry = (version, value)
+            return value
+
+    def _apply_delta(self, previous_version, data, delta):
+        with self._lock:
+            cached_version, value = self._entry
+            if value is None or cached_version != previous_version:
+                return  # never built, or stale: the next get() builds it
+            self._entry = (None, None)
+            if self._update is not None:
+                with metrics.span(f"{self.name}.update"):
+                    value = self._update(value, delta)
+                self._entry = (data.attrs["dataset_version"], value)
+
+
+# 👉 Apply rows just written to the journal as a delta, so the shared frame
+# moves to a new version without re-reading the dataset. `payload` is the
+# journal bytes that were appended, or a file holding them; `before`/`after`
+# are the dataset signatures around the write. If the cached frame is not
+# exactly `before`, the files changed some other way and the next
+# load_dataset() reloads.
+def apply_append(payload, before, after, path=CSV_FILE):
+    with _lock:
+        if _state["frame"] is None or _state["path"] != path or _state["signature"] != before:
+            return None
+        return _apply(payload, before, after, path)
+
+
+# Bytes appended to the journal since the cached frame was read, when that
+# is the only change on disk, and the signature they bring the frame to;
+# None otherwise
+def _journal_growth(path, signature):
+    if _state["frame"] is None or _state["path"] != path:
+        return None
+    (old_csv, old_journal), (new_csv, new_journal) = _state["signature"], signature
+    if new_csv != old_csv or new_journal is None:
+        return None
+    start = old_journal[1] if old_journal else 0
+    if new_journal[1] <= start:
+        return None
+    payload = _read_journal_bytes(path, start, new_journal[1])
+    if not payload or not _settled(path, new_csv):
+        return None
+    return payload, (new_csv, (new_journal[0], start + len(payload)))
+
+
+# Caller holds _lock and has checked that the cached frame is `before`
+def _apply(payload, before, after, path):
+    frame = _state["frame"]
+    start = time.perf_counter()
+    source = io.BytesIO(payload) if isinstance(payload, bytes) else payload
+    delta, invalid = apply_schema(_read_journal(source))
+    updated = _concat(frame, delta)
+    previous = _state["version"]
+    _state["version"] += 1
+    updated.attrs["dataset_version"] = _state["version"]
+    _stats["invalid_values"] = {
+        col: _stats["invalid_values"].get(col, 0) + invalid[col] for col in NUMERIC_COLUMNS
+    }
+    if after[0] != before[0]:
+        # The journal was folded into the CSV: the frame is the new
+        # canonical dataset, so refresh the snapshot from memory
+        snapshot.write(path, updated, invalid=_stats["invalid_values"])
+
+    _state["frame"] = updated
+    _state["signature"] = after
+    for listener in _listeners:
+        try:
+            listener(previous, updated, delta)
+        except Exception:
+            # Derived state is keyed by version: a listener that fails
+            # is simply rebuilt on its next lookup
+            name = getattr(getattr(listener, "__self__", None), "name", listener.__module__)
+            metrics.count("dataset.listener_errors", listener=name)
+
+    elapsed = time.perf_counter() - start
+    _stats["appends"] += 1
+    _stats["last_append_seconds"] = elapsed
+    _stats["memory_bytes"] = int(updated.memory_usage(deep=True).sum())
+    _stats["bytes_per_row"] = _stats["memory_bytes"] / max(len(updated), 1)
+    metrics.observe("dataset.append", elapsed)
+    return updated
+
+
+def dataset_version():
+    return _state["version"]
+
+
+def load_stats():
+    return dict(_stats, version=_state["version"])
+
+
+# 👉 Drop the cached frame so the next load_dataset() re-reads from disk
+def invalidate():
+    with _lock:
+        _state["frame"] = None
+        _state["path"] = None
+        _state["signature"] = None
@@ -0,0 +1,135 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+from services import dataset
+
+FILTER_FIELDS = [
+    "Job Title", "Industry", "Education Level",
+    "Location", "Employment Type", "Company Size", "Remote"
+]
+
+
+class FilterIndex:
+    # Built once per dataset version: for every filter field, the row codes,
+    # the sorted option list and the (sorted) row positions of each value.
+    # Filter combinations are answered from these arrays without copying or
+    # scanning the full frame.
+    def __init__(self, data: pd.DataFrame, fields=FILTER_FIELDS):
+        self.n_rows = len(data)
+        self.codes = {}
+        self.values = {}
+        self.lookup = {}
+        self.positions = {}
+        self._buffers = {}
+        self._extended = False
+        for field in fields:
+            codes, uniques = pd.factorize(data[field])
+            # Options sort by label whatever the column dtype (categorical
+            # columns would otherwise keep their category order)
+            uniques = np.asarray(uniques, dtype=object)
+            rank = np.argsort(uniques.astype(str), kind="stable")
+            remap = np.empty(len(rank), dtype=np.int64)
+            remap[rank] = np.arange(len(rank))
+            codes = np.where(codes >= 0, remap[codes], -1)
+            uniques = uniques[rank]
+            self.codes[field] = codes
+            self._buffers[field] = codes
+            self.values[field] = list(uniques)
+            self.lookup[field] = {value: code for code, value in enumerate(uniques)}
+            # One stable argsort groups the positions of every value at once
+            order = np.argsort(codes, kind="stable")
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            start = int((codes < 0).sum())  # missing values sort first (-1)
+            bounds = np.concatenate([[0], np.cumsum(counts)]) + start
+            self.positions[field] = {
+                value: order[bounds[i]:bounds[i + 1]] for i, value in enumerate(uniques)
+            }
+
+    # 👉 Index of this index's rows plus `delta` appended after them. Only the
+    # new rows are coded; existing position arrays are shared, and the row
+    # codes are re-mapped in one vectorized pass only if a new option appears.
+    # Codes live at the front of buffers with spare capacity, so appends cost
+    # amortized O(delta). Only the newest index of a chain can be extended.
+    def extended(self, delta: pd.DataFrame):
+        if self._extended:
+            raise ValueError("index was already extended; extend the newest one")
+        self._extended = True
+        index = copy.copy(self)
+        index.n_rows = self.n_rows + len(delta)
+        index.codes, index.values, index.lookup, index.positions = {}, {}, {}, {}
+        index._buffers = {}
+        index._extended = False
+        for field in self.codes:
+            codes, values, lookup = self.codes[field], self.values[field], self.lookup[field]
+            buffer = self._buffers[field]
+            inverse, uniques = pd.factorize(delta[field])
+            uniques = list(uniques)
+            added = [value for value in uniques if value not in lookup]
+            if added:
+                values = sorted(values + added, key=str)
+                lookup = {value: code for code, value in enumerate(values)}
+                if len(self.values[field]):
+                    remap = np.array([lookup[value] for value in self.values[field]], dtype=np.int64)
+                    codes = np.where(codes >= 0, remap[codes], -1)
+            if codes is not self.codes[field] or len(buffer) < index.n_rows:
+                buffer = np.empty(index.n_rows + index.n_rows // 2, dtype=np.int64)
+                buffer[:self.n_rows] = codes
+            mapped = np.array([lookup[value] for value in uniques] + [-1], dtype=np.int64)
+            buffer[self.n_rows:index.n_rows] = mapped[inverse]
+            index._buffers[field] = buffer
+            index.codes[field] = buffer[:index.n_rows]
+            index.values[field] = values
+            index.lookup[field] = lookup
+
+            # New positions all come after the old ones, so appending keeps
+            # every per-value array sorted
+            positions = dict(self.positions[field])
+            for i, value in enumerate(uniques):
+                rows = self.n_rows + np.flatnonzero(inverse == i)
+                old = positions.get(value)
+                positions[value] = rows if old is None else np.concatenate([old, rows])
+            index.positions[field] = positions
+        return index
+
+    # 👉 Sorted, de-duplicated dropdown options (NaN excluded)
+    def options(self, field):
+        return self.values[field]
+
+    def count(self, field, value):
+        rows = self.positions[field].get(value)
+        return 0 if rows is None else len(rows)
+
+    # 👉 Row positions matching every selection ("All" means no filter)
+    def filter(self, selections):
+        active = [(field, value) for field, value in selections.items() if value != "All"]
+        if not active:
+            return np.arange(self.n_rows)
+
+        lists = []
+        for field, value in active:
+            rows = self.positions[field].get(value)
+            if rows is None:
+                return np.empty(0, dtype=np.int64)
+            lists.append((len(rows), field, value, rows))
+        lists.sort(key=lambda item: item[0])
+
+        # Start from the most selective value, then check the rest by code
+        _, _, _, result = lists[0]
+        for _, field, value, _ in lists[1:]:
+            result = result[self.codes[field][result] == self.lookup[field][value]]
+        return result
+
+    def select(self, data: pd.DataFrame, selections):
+        return data.take(self.filter(selections))
+
+
+# 👉 Shared index for the current dataset version; appended rows extend it
+_indexes = dataset.VersionedCache(
+    "filter_index", FilterIndex, update=lambda index, delta: index.extended(delta)
+)
+
+
+def get_index(data: pd.DataFrame):
+    return _indexes.get(data)
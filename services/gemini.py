@@ -0,0 +1,180 @@
+import os
+import re
+import threading
+import time
+from dotenv import load_dotenv
+
+from services.llm_client import AsyncLLMClient, RetryableError
+
+# Load .env variables (cheap, and the settings below read them). The Gemini
+# SDK itself is imported and configured on the first model call: it costs
+# more at import time than the rest of the app, and most pages never need it.
+load_dotenv()
+GEMINI_KEY = os.getenv("GEMINI_KEY")
+GEMINI_MODEL = os.getenv("GEMINI_MODEL")
+# Upper bound on how long a Predict click waits for the model
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", 30))
+# Client-side rate limit matched to the API key's per-minute quota: any one
+# minute sees at most GEMINI_RPM + GEMINI_BURST calls, so keep that sum at
+# or below the quota (defaults fit the 15 RPM free tier)
+GEMINI_RPM = float(os.getenv("GEMINI_RPM", 12))
+GEMINI_BURST = int(os.getenv("GEMINI_BURST", 3))
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", 4))
+
+# Form fields in the order the prompt lists them
+PROFILE_FIELDS = [
+    ("Job Title", "job_title"),
+    ("Industry", "industry"),
+    ("Employment Type", "employment_type"),
+    ("Company Size", "company_size"),
+    ("Years of Experience", "years_exp"),
+    ("Remote", "remote"),
+    ("Location", "location"),
+    ("Education Level", "education_level"),
+]
+
+# Dataset column -> profile key, for CSV-driven callers
+DATASET_COLUMNS = {
+    "Job Title": "job_title",
+    "Industry": "industry",
+    "Employment Type": "employment_type",
+    "Company Size": "company_size",
+    "YearsExperience": "years_exp",
+    "Remote": "remote",
+    "Location": "location",
+    "Education Level": "education_level",
+}
+
+_NUMBERED_LINE = re.compile(r"^\s*(\d+)\s*[.):-]\s*(.+?)\s*$")
+
+
+# Bump whenever build_prompt / build_batch_prompt change what is asked:
+# it is part of the cache key, so old answers stop matching
+PROMPT_VERSION = 1
+
+
+# 📝 Build prompt for one profile
+def build_prompt(profile):
+    details = "\n".join(f"- {label}: {profile[key]}" for label, key in PROFILE_FIELDS)
+    return f"""
+You are an expert salary estimator.
+Estimate a fair salary in INR for the following:
+{details}
+
+ONLY return the estimated annual salary range in INR,
+like "₹6,00,000 - ₹8,50,000 per annum" and nothing else.
+Do not add explanations, factors, or any extra text.
+"""
+
+
+# 📝 Build one prompt that packs several profiles
+def build_batch_prompt(profiles):
+    blocks = []
+    for number, profile in enumerate(profiles, start=1):
+        details = "\n".join(f"   - {label}: {profile[key]}" for label, key in PROFILE_FIELDS)
+        blocks.append(f"{number}. Profile {number}\n{details}")
+    joined = "\n".join(blocks)
+    return f"""
+You are an expert salary estimator.
+Estimate a fair salary in INR for each of the following {len(profiles)} profiles:
+{joined}
+
+Return exactly {len(profiles)} lines, one per profile, in the same order,
+each like "1. ₹6,00,000 - ₹8,50,000 per annum" and nothing else.
+Do not add explanations, factors, or any extra text.
+"""
+
+
+# 👉 Split a packed answer back into one result per profile (None if malformed)
+def parse_batch_response(text, count):
+    answers = {}
+    for line in text.splitlines():
+        match = _NUMBERED_LINE.match(line)
+        if match:
+            answers[int(match.group(1))] = match.group(2)
+    if sorted(answers) != list(range(1, count + 1)):
+        return None
+    return [answers[number] for number in range(1, count + 1)]
+
+
+class GeminiBackend:
+    # One GenerativeModel per process, reused for every call. Built by
+    # get_client() on the first call, which is when the SDK is imported.
+    def __init__(self, model_name=GEMINI_MODEL):
+        import google.generativeai as genai
+        from google.api_core import exceptions as api_exceptions
+
+        genai.configure(api_key=GEMINI_KEY)
+        self.model = genai.GenerativeModel(model_name)
+        # Quota, overload and transient server errors are retried with backoff
+        self.retryable_errors = (
+            api_exceptions.ResourceExhausted,
+            api_exceptions.TooManyRequests,
+            api_exceptions.ServiceUnavailable,
+            api_exceptions.InternalServerError,
+            api_exceptions.DeadlineExceeded,
+            RetryableError,
+        )
+
+    async def generate(self, prompt):
+        response = await self.model.generate_content_async(prompt)
+        return response.text.strip()
+
+    def is_retryable(self, exc):
+        return isinstance(exc, self.retryable_errors)
+
+
+_client = {"client": None}
+_client_lock = threading.Lock()
+
+
+def get_client():
+    client = _client["client"]
+    if client is not None:
+        return client
+    with _client_lock:
+        if _client["client"] is None:
+            _client["client"] = AsyncLLMClient(
+                GeminiBackend(),
+                rate_per_minute=GEMINI_RPM,
+                burst=GEMINI_BURST,
+                max_retries=GEMINI_MAX_RETRIES,
+                budget=GEMINI_TIMEOUT,
+            )
+        return _client["client"]
+
+
+# 🔮 AI call function: rate limited, retried, bounded by GEMINI_TIMEOUT
+def call_gemini(prompt: str, budget=None):
+    return get_client().submit(prompt, budget).result()
+
+
+class GeminiClient:
+    # Anything with generate(prompt) -> str can stand in for this
+    def generate(self, prompt):
+        return call_gemini(prompt)
+
+
+class StubClient:
+    # Offline stand-in: answers every profile in a prompt with a range
+    # derived from its years of experience
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate(self, prompt):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        years = [float(y) for y in re.findall(r"Years of Experience: ([\d.]+)", prompt)]
+        ranges = [self._range(y) for y in years]
+        if len(ranges) == 1 and "Profile 1" not in prompt:
+            return ranges[0]
+        return "\n".join(f"{number}. {text}" for number, text in enumerate(ranges, start=1))
+
+    @staticmethod
+    def _range(years):
+        low = 300_000 + int(years * 100_000)
+        return f"₹{low:,} - ₹{int(low * 1.4):,} per annum"
@@ -0,0 +1,311 @@
+"""Bulk contribution uploads: stream a CSV through validation and append it.
+
+    python -m services.ingest upload.csv                  # validate and append
+    python -m services.ingest upload.csv --dry-run        # report only
+    python -m services.ingest upload.csv --rejects rejected.csv --chunk-rows 20000
+
+The file is read in chunks of INGEST_CHUNK_ROWS rows and every chunk passes
+through generator stages (read -> validate -> normalize -> deduplicate ->
+reject outliers) before it is spooled to disk. Memory is one chunk plus the
+dataset's sorted row-hash index (8 bytes per dataset row, built once per
+dataset version and shared), whatever the upload size. Duplicates are
+caught against the dataset and within each chunk; a row repeated in two
+different chunks of the same upload is not. Accepted rows are appended in
+one atomic step once the whole file has been read.
+"""
+import argparse
+import os
+import tempfile
+import time
+import unicodedata
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+from pandas.util import hash_array
+
+from services import chart_cache, contributions, dataset, metrics
+from services.cache_keys import normalize_text
+from services.dataset import CATEGORICAL_COLUMNS, COLUMNS, CSV_FILE, NUMERIC_COLUMNS, NUMERIC_DTYPES
+from services.filter_index import get_index
+
+CHUNK_ROWS = int(os.getenv("INGEST_CHUNK_ROWS", 50_000))
+# Robust z-score (median / MAD of log salary per job title) above which a row is rejected
+OUTLIER_Z = float(os.getenv("INGEST_OUTLIER_Z", 4.0))
+# Job titles with fewer rows than this are judged against the whole dataset
+MIN_GROUP_ROWS = 30
+# Same bounds as the Contribute form widgets
+BOUNDS = {"YearsExperience": (0.0, 50.0), "Salary (in INR)": (0.0, 10_00_00_000.0)}
+MAX_SAMPLES = 20
+
+SALARY = "Salary (in INR)"
+
+
+class IngestReport:
+    def __init__(self):
+        self.rows_read = 0
+        self.accepted = 0
+        self.appended = 0
+        self.chunks = 0
+        self.seconds = 0.0
+        self.rejected = Counter()
+        self.samples = []
+        self._rejects_file = None
+
+    @property
+    def rows_per_second(self):
+        return self.rows_read / self.seconds if self.seconds else 0.0
+
+    def reject(self, rows: pd.DataFrame, reason):
+        if rows.empty:
+            return
+        self.rejected[reason] += len(rows)
+        metrics.count("ingest.rejected", len(rows), reason=reason)
+        rows = rows.assign(Reason=reason)
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.extend(rows.head(MAX_SAMPLES - len(self.samples)).to_dict("records"))
+        if self._rejects_file is not None:
+            rows.to_csv(self._rejects_file, header=self._rejects_file.tell() == 0,
+                        index=False, lineterminator="\n")
+
+    def as_dict(self):
+        return {
+            "rows_read": self.rows_read,
+            "accepted": self.accepted,
+            "appended": self.appended,
+            "rejected": dict(self.rejected),
+            "chunks": self.chunks,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+# 👉 Hash of every row over the typed values, so an uploaded row and the
+# same row already in the dataset (categorical labels, stored numeric dtypes) match
+def row_hashes(frame: pd.DataFrame):
+    combined = np.zeros(len(frame), dtype=np.uint64)
+    for col in COLUMNS:
+        values = frame[col]
+        if col in NUMERIC_COLUMNS:
+            hashed = hash_array(values.to_numpy(dtype=NUMERIC_DTYPES[col]).astype("float64"))
+        elif isinstance(values.dtype, pd.CategoricalDtype):
+            # Hash each label once, then gather by code
+            labels = hash_array(np.asarray(values.cat.categories, dtype=object), categorize=False)
+            codes = values.cat.codes.to_numpy()
+            hashed = np.where(codes >= 0, labels[np.maximum(codes, 0)], np.uint64(0))
+        else:
+            hashed = hash_array(values.to_numpy(dtype=object), categorize=False)
+        combined = combined * np.uint64(1_000_003) ^ hashed
+    return combined
+
+
+def _insert_sorted(hashes, new):
+    new = np.unique(new)
+    return np.insert(hashes, np.searchsorted(hashes, new), new)
+
+
+def _contains(hashes, values):
+    pos = np.minimum(np.searchsorted(hashes, values), max(len(hashes) - 1, 0))
+    return hashes[pos] == values if len(hashes) else np.zeros(len(values), dtype=bool)
+
+
+# Sorted hashes of the dataset's rows, built once per version and carried
+# across contributions (the delta's hashes are merged in)
+def existing_hashes(data: pd.DataFrame):
+    return chart_cache.get_or_build(
+        data, "ingest.row_hashes", lambda: np.sort(row_hashes(data)),
+        update=lambda hashes, delta: _insert_sorted(hashes, row_hashes(delta)),
+    )
+
+
+# Median and MAD of log salary, per job title and overall
+def salary_bands(data: pd.DataFrame):
+    log_salary = pd.Series(np.log1p(data[SALARY].to_numpy(dtype="float64")), index=data.index)
+    jobs = data["Job Title"]
+    median = log_salary.groupby(jobs, observed=True).median()
+    deviation = (log_salary - jobs.map(median).astype("float64")).abs()
+    bands = pd.DataFrame({
+        "median": median,
+        "mad": deviation.groupby(jobs, observed=True).median(),
+        "rows": jobs.value_counts(),
+    }).dropna(subset=["median"])
+    overall = float(log_salary.median())
+    overall_mad = float((log_salary - overall).abs().median())
+    bands = bands[(bands["rows"] >= MIN_GROUP_ROWS) & (bands["mad"] > 0)]
+    if len(data) < MIN_GROUP_ROWS or not overall_mad > 0:
+        overall_mad = np.nan  # too little data to call anything an outlier
+    return bands, overall, overall_mad
+
+
+class LabelNormalizer:
+    # NFKC, collapsed whitespace and, where the label already exists in the
+    # dataset up to case, the dataset's spelling. A new label is kept as
+    # first seen and later variants in the same upload map onto it.
+    def __init__(self, data: pd.DataFrame):
+        index = get_index(data)
+        self.canonical = {
+            field: {normalize_text(label): label for label in index.options(field)}
+            for field in CATEGORICAL_COLUMNS
+        }
+        self._seen = {field: {} for field in CATEGORICAL_COLUMNS}
+
+    def label(self, field, value):
+        seen = self._seen[field]
+        if value not in seen:
+            cleaned = " ".join(unicodedata.normalize("NFKC", str(value)).split())
+            seen[value] = self.canonical[field].setdefault(normalize_text(cleaned), cleaned)
+        return seen[value]
+
+    def __call__(self, field, values: pd.Series):
+        # Distinct values per chunk are few: map those, not every row
+        uniques = values.unique()
+        return values.map({value: self.label(field, value) for value in uniques})
+
+
+# ---------------------------- pipeline stages ----------------------------
+# Each stage takes and yields chunks (DataFrames) and hands the rows it
+# drops to report.reject(rows, reason).
+
+def read_chunks(source, chunk_rows, report):
+    try:
+        reader = pd.read_csv(source, chunksize=chunk_rows, dtype=str, keep_default_na=False)
+        with reader:
+            for chunk in reader:
+                missing = [col for col in COLUMNS if col not in chunk.columns]
+                if missing:
+                    raise ValueError(f"Upload is missing columns: {', '.join(missing)}")
+                report.chunks += 1
+                report.rows_read += len(chunk)
+                yield chunk[COLUMNS].fillna("")
+    except pd.errors.EmptyDataError:
+        raise ValueError("Upload is empty") from None
+    except pd.errors.ParserError as e:
+        raise ValueError(f"Upload is not a well-formed CSV: {e}") from None
+
+
+def validate(chunks, report):
+    for chunk in chunks:
+        blank = chunk.apply(lambda col: col.str.strip() == "").any(axis=1)
+        report.reject(chunk[blank], "missing_value")
+        chunk = chunk[~blank].copy()
+        for col in NUMERIC_COLUMNS:
+            chunk[col] = pd.to_numeric(chunk[col].str.strip(), errors="coerce").round(1)
+        bad = chunk[NUMERIC_COLUMNS].isna().any(axis=1)
+        report.reject(chunk[bad], "bad_number")
+        chunk = chunk[~bad]
+        outside = np.zeros(len(chunk), dtype=bool)
+        for col, (low, high) in BOUNDS.items():
+            outside |= ~chunk[col].between(low, high).to_numpy()
+        report.reject(chunk[outside], "out_of_range")
+        yield chunk[~outside]
+
+
+def normalize(chunks, normalizer):
+    for chunk in chunks:
+        chunk = chunk.copy()
+        for col in CATEGORICAL_COLUMNS:
+            chunk[col] = normalizer(col, chunk[col])
+        yield chunk
+
+
+# Against the dataset's hash index and within the chunk only: nothing is
+# carried from one chunk to the next, so memory does not grow with the upload
+def deduplicate(chunks, existing, report):
+    for chunk in chunks:
+        hashes = row_hashes(chunk)
+        known = _contains(existing, hashes)
+        report.reject(chunk[known], "duplicate")
+        repeated = ~known & pd.Series(hashes).duplicated().to_numpy()
+        report.reject(chunk[repeated], "duplicate_in_upload")
+        yield chunk[~(known | repeated)]
+
+
+def reject_outliers(chunks, bands, report):
+    by_job, overall, overall_mad = bands
+    for chunk in chunks:
+        jobs = chunk["Job Title"]
+        median = jobs.map(by_job["median"]).astype("float64").fillna(overall).to_numpy()
+        mad = jobs.map(by_job["mad"]).astype("float64").fillna(overall_mad).to_numpy()
+        log_salary = np.log1p(chunk[SALARY].to_numpy(dtype="float64"))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = 0.6745 * np.abs(log_salary - median) / mad
+        outlier = np.nan_to_num(z, nan=0.0) > OUTLIER_Z
+        report.reject(chunk[outlier], "outlier")
+        yield chunk[~outlier]
+
+
+# 👉 Run an upload (a path or file object) through the pipeline and append
+# the accepted rows as one unit. Nothing is appended if the file is
+# malformed or dry_run is set. Raises ValueError for a wrong schema.
+@metrics.timed("ingest.run")
+def ingest(source, path=CSV_FILE, dry_run=False, chunk_rows=CHUNK_ROWS, rejects=None):
+    report = IngestReport()
+    start = time.perf_counter()
+    data = dataset.load_dataset(path)
+    existing = existing_hashes(data)
+    bands = chart_cache.get_or_build(data, "ingest.salary_bands", lambda: salary_bands(data))
+
+    # Spool next to the dataset so the append never crosses filesystems
+    spool = tempfile.NamedTemporaryFile(
+        "w", dir=os.path.dirname(os.path.abspath(path)), suffix=".ingest", delete=False, newline=""
+    )
+    rejects_file = open(rejects, "w", newline="") if rejects else None
+    report._rejects_file = rejects_file
+    try:
+        with spool:
+            chunks = read_chunks(source, chunk_rows, report)
+            chunks = validate(chunks, report)
+            chunks = normalize(chunks, LabelNormalizer(data))
+            chunks = deduplicate(chunks, existing, report)
+            chunks = reject_outliers(chunks, bands, report)
+            for chunk in chunks:
+                with metrics.span("ingest.spool"):
+                    chunk.to_csv(spool, header=False, index=False, lineterminator="\n")
+                report.accepted += len(chunk)
+        if report.accepted and not dry_run:
+            report.appended = contributions.append_file(spool.name, path)
+    finally:
+        os.remove(spool.name)
+        if rejects_file is not None:
+            rejects_file.close()
+        report._rejects_file = None
+        report.seconds = time.perf_counter() - start
+    metrics.count("ingest.rows", report.accepted, result="accepted")
+    return report
+
+
+# 👉 The same normalization for a single row from the Contribute form
+# Raises ValueError for a blank label, as validate() rejects them in uploads
+def normalize_row(row, data: pd.DataFrame):
+    blank = [
+        col for col in CATEGORICAL_COLUMNS
+        if col in row and (pd.isna(row[col]) or not str(row[col]).strip())
+    ]
+    if blank:
+        raise ValueError(f"Please fill in: {', '.join(blank)}")
+    normalizer = LabelNormalizer(data)
+    return {
+        col: normalizer.label(col, value) if col in CATEGORICAL_COLUMNS else value
+        for col, value in row.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("upload")
+    parser.add_argument("--path", default=CSV_FILE, help="dataset CSV to append to")
+    parser.add_argument("--dry-run", action="store_true", help="validate and report, append nothing")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--rejects", help="write rejected rows, with a Reason column, to this CSV")
+    args = parser.parse_args()
+
+    report = ingest(args.upload, args.path, args.dry_run, args.chunk_rows, args.rejects)
+    print(f"{report.rows_read:,} rows read in {report.chunks} chunks, {report.seconds:.2f}s "
+          f"({report.rows_per_second:,.0f} rows/s)")
+    print(f"{report.accepted:,} accepted, {report.appended:,} appended")
+    for reason, rows in report.rejected.most_common():
+        print(f"  rejected {rows:>9,}  {reason}")
+
+
+if __name__ == "__main__":
+    main()
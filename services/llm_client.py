@@ -0,0 +1,168 @@
+import asyncio
+import math
+import random
+import threading
+import time
+from collections import deque
+
+from services import metrics
+
+
+class BudgetExceeded(TimeoutError):
+    # The request (queueing, retries and backoff included) would not finish
+    # inside its latency budget. `reason` says what used it up:
+    #   "rate_limit": our own rate-limit queue is longer than the budget
+    #   "retries":    the backend kept failing (quota, overload) until no
+    #                 time was left for another attempt
+    #   "timeout":    the backend itself was too slow to answer
+    def __init__(self, message, reason="timeout"):
+        super().__init__(message)
+        self.reason = reason
+
+
+class RetryableError(Exception):
+    # Backend failure worth retrying: quota exhausted, overload, transient 5xx.
+    # retry_after (seconds) is honoured when the server suggests one.
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    # `rate` requests per second on average, up to `capacity` at once after
+    # an idle period. Callers reserve a token up front and sleep until it is
+    # theirs, so waiters are served in arrival order without a lock.
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.waits = 0
+
+    async def acquire(self, deadline=None):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        wait = max(0.0, -self.tokens / self.rate)
+        if deadline is not None and now + wait > deadline:
+            self.tokens += 1  # give the reservation back
+            raise BudgetExceeded("rate limit queue is longer than the latency budget", "rate_limit")
+        if wait:
+            self.waits += 1
+            await asyncio.sleep(wait)
+
+
+class AsyncLLMClient:
+    # Rate-limited, retrying front for one model backend. A backend has
+    # `async generate(prompt) -> str` and `is_retryable(exc) -> bool`.
+    def __init__(self, backend, rate_per_minute, burst=1, max_retries=4,
+                 backoff_base=0.5, backoff_max=8.0, budget=30.0, seed=None):
+        self.backend = backend
+        self.bucket = TokenBucket(rate_per_minute / 60.0, burst)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.budget = budget
+        self._random = random.Random(seed)
+        self.stats = {"requests": 0, "calls": 0, "retries": 0, "budget_exceeded": 0, "failures": 0}
+
+    # Full jitter: uniform in [0, min(cap, base * 2^attempt)]
+    def backoff(self, attempt):
+        return self._random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    # 👉 End to end: queueing, attempts and backoff (errors labelled by type)
+    async def generate(self, prompt, budget=None):
+        with metrics.span("llm.request"):
+            return await self._generate(prompt, budget)
+
+    async def _generate(self, prompt, budget):
+        self.stats["requests"] += 1
+        deadline = time.monotonic() + (budget or self.budget)
+        attempt = 0
+        while True:
+            try:
+                await self.bucket.acquire(deadline)
+            except BudgetExceeded:
+                self.stats["budget_exceeded"] += 1
+                raise
+            remaining = deadline - time.monotonic()
+            self.stats["calls"] += 1
+            try:
+                with metrics.span("llm.call", backend=type(self.backend).__name__):
+                    return await asyncio.wait_for(self.backend.generate(prompt), remaining)
+            except TimeoutError:
+                self.stats["budget_exceeded"] += 1
+                raise BudgetExceeded(f"no answer within {budget or self.budget:.0f}s", "timeout") from None
+            except Exception as e:
+                if not self.backend.is_retryable(e) or attempt >= self.max_retries:
+                    self.stats["failures"] += 1
+                    raise
+                delay = max(self.backoff(attempt), getattr(e, "retry_after", None) or 0)
+                if time.monotonic() + delay >= deadline:
+                    self.stats["budget_exceeded"] += 1
+                    raise BudgetExceeded(f"gave up after {attempt + 1} attempts: {e}", "retries") from e
+                self.stats["retries"] += 1
+                metrics.count("llm.retries", error=type(e).__name__)
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    # 👉 Schedule on the shared background loop; returns a concurrent Future
+    def submit(self, prompt, budget=None):
+        return asyncio.run_coroutine_threadsafe(self.generate(prompt, budget), background_loop())
+
+
+_loop = {"loop": None}
+_loop_lock = threading.Lock()
+
+
+# 👉 One event loop per process, on a daemon thread, for all model calls
+def background_loop():
+    loop = _loop["loop"]
+    if loop is not None:
+        return loop
+    with _loop_lock:
+        if _loop["loop"] is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="llm-client", daemon=True).start()
+            _loop["loop"] = loop
+        return _loop["loop"]
+
+
+class FakeBackend:
+    # Local stand-in for the model server, for load tests: log-normal
+    # latency, a fixed number of concurrent slots, its own per-second quota
+    # (answers a 429-style RetryableError above it) and random 5xx failures.
+    def __init__(self, latency=0.2, sigma=0.5, quota_per_second=None, concurrency=64,
+                 error_rate=0.0, seed=0, answer=None):
+        self.latency = latency
+        self.sigma = sigma
+        self.quota_per_second = quota_per_second
+        self.error_rate = error_rate
+        self.answer = answer or (lambda prompt: "₹6,00,000 - ₹8,50,000 per annum")
+        self._random = random.Random(seed)
+        self._slots = asyncio.Semaphore(concurrency)
+        self._window = deque()
+        self.received = 0
+        self.rejected = 0
+        self.errors = 0
+
+    async def generate(self, prompt):
+        self.received += 1
+        now = time.monotonic()
+        if self.quota_per_second:
+            while self._window and now - self._window[0] >= 1.0:
+                self._window.popleft()
+            if len(self._window) >= self.quota_per_second:
+                self.rejected += 1
+                raise RetryableError("429 quota exceeded", retry_after=1.0 - (now - self._window[0]))
+            self._window.append(now)
+        if self._random.random() < self.error_rate:
+            self.errors += 1
+            raise RetryableError("503 service unavailable")
+        async with self._slots:
+            await asyncio.sleep(self._random.lognormvariate(math.log(self.latency), self.sigma))
+        return self.answer(prompt)
+
+    def is_retryable(self, exc):
+        return isinstance(exc, RetryableError)
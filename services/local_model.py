@@ -0,0 +1,164 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from services import dataset
+
+# "preview": show the local range while Gemini is pending (default)
+# "serve":   answer from the local model and skip Gemini entirely
+# "off":     Gemini only
+LOCAL_MODEL_MODE = os.getenv("LOCAL_MODEL_MODE", "preview")
+
+CATEGORICAL_FIELDS = [
+    "Job Title", "Industry", "Education Level", "Location",
+    "Employment Type", "Company Size", "Remote"
+]
+NUMERIC_FIELD = "YearsExperience"
+TARGET = "Salary (in INR)"
+
+# Profile keys used by the Prediction form / batch API
+PROFILE_KEYS = {
+    "Job Title": "job_title",
+    "Industry": "industry",
+    "Education Level": "education_level",
+    "Location": "location",
+    "Employment Type": "employment_type",
+    "Company Size": "company_size",
+    "Remote": "remote",
+}
+
+# Small ridge penalty: keeps the full one-hot design solvable without
+# dropping a reference level, and is negligible next to real counts
+RIDGE = 1.0
+# Two-sided 80% interval for the displayed range
+Z_80 = 1.2816
+CHUNK_ROWS = 100_000
+
+
+# 👉 ₹ amounts with Indian digit grouping, e.g. 850000 -> 8,50,000
+def format_inr(amount):
+    digits = str(int(round(amount)))
+    if len(digits) <= 3:
+        return digits
+    head, tail = digits[:-3], digits[-3:]
+    groups = []
+    while len(head) > 2:
+        groups.insert(0, head[-2:])
+        head = head[:-2]
+    if head:
+        groups.insert(0, head)
+    return ",".join(groups) + "," + tail
+
+
+class SalaryModel:
+    # Ridge regression on one-hot categoricals + years of experience, kept as
+    # sufficient statistics (X'X, X'y, y'y, n): fit() on just the new rows
+    # adds them to the sums, then a tiny re-solve; no full refit.
+    def __init__(self):
+        self.levels = {field: {} for field in CATEGORICAL_FIELDS}
+        self.width = 2  # intercept + years
+        self.xtx = np.zeros((self.width, self.width))
+        self.xty = np.zeros(self.width)
+        self.yty = 0.0
+        self.n_rows = 0
+        self.coef = np.zeros(self.width)
+        self.sigma = 0.0
+        self._lock = threading.Lock()
+
+    def _grow(self, extra):
+        xtx = np.zeros((self.width + extra, self.width + extra))
+        xtx[:self.width, :self.width] = self.xtx
+        self.xtx = xtx
+        self.xty = np.concatenate([self.xty, np.zeros(extra)])
+        self.width += extra
+
+    def _column(self, field, value):
+        column = self.levels[field].get(value)
+        if column is None:
+            column = self.width
+            self.levels[field][value] = column
+            self._grow(1)
+        return column
+
+    def _design(self, frame):
+        # Vectorized one-hot: every row has the intercept, years and exactly
+        # one active column per categorical field that was seen in training
+        n = len(frame)
+        codes = []
+        for field in CATEGORICAL_FIELDS:
+            # Factorize first, then strip only the (few) distinct values.
+            # Missing labels (code -1) land on the intercept column, which is
+            # already 1, so they contribute nothing extra.
+            inverse, uniques = pd.factorize(frame[field])
+            columns = [self._column(field, str(value).strip()) for value in uniques]
+            columns = np.array(columns + [0], dtype=np.int64)
+            codes.append(columns[inverse])
+        x = np.zeros((n, self.width))
+        x[:, 0] = 1.0
+        x[:, 1] = frame[NUMERIC_FIELD].to_numpy(dtype=float)
+        rows = np.arange(n)
+        for column in codes:
+            x[rows, column] = 1.0
+        return x
+
+    def _accumulate(self, frame):
+        frame = frame[frame[TARGET].notna() & frame[NUMERIC_FIELD].notna()]
+        for start in range(0, len(frame), CHUNK_ROWS):
+            chunk = frame.iloc[start:start + CHUNK_ROWS]
+            x = self._design(chunk)
+            y = chunk[TARGET].to_numpy(dtype=float)
+            self.xtx += x.T @ x
+            self.xty += x.T @ y
+            self.yty += float(y @ y)
+            self.n_rows += len(chunk)
+
+    def _solve(self):
+        if self.n_rows == 0:
+            return
+        penalty = np.eye(self.width) * RIDGE
+        penalty[0, 0] = 0.0
+        self.coef = np.linalg.solve(self.xtx + penalty, self.xty)
+        sse = self.yty - 2 * self.coef @ self.xty + self.coef @ self.xtx @ self.coef
+        dof = max(self.n_rows - self.width, 1)
+        self.sigma = float(np.sqrt(max(sse, 0.0) / dof))
+
+    def fit(self, frame):
+        with self._lock:
+            self._accumulate(frame)
+            self._solve()
+        return self
+
+    def predict(self, profile):
+        with self._lock:
+            x = np.zeros(self.width)
+            x[0] = 1.0
+            x[1] = float(profile["years_exp"])
+            for field, key in PROFILE_KEYS.items():
+                column = self.levels[field].get(str(profile[key]).strip())
+                if column is not None:
+                    x[column] = 1.0
+            point = float(x @ self.coef)
+            sigma = self.sigma
+        low = max(point - Z_80 * sigma, 0.0)
+        high = point + Z_80 * sigma
+        return point, low, high
+
+    def predict_text(self, profile):
+        _, low, high = self.predict(profile)
+        # Round to the nearest ₹10,000 like a human estimate would
+        low, high = round(low, -4), round(high, -4)
+        return f"₹{format_inr(low)} - ₹{format_inr(high)} per annum"
+
+
+# 👉 Shared model for the current dataset version. Every appended delta is
+# fitted into it (dataset.on_append), so a full refit only happens after a
+# reload.
+_models = dataset.VersionedCache(
+    "local_model", lambda data: SalaryModel().fit(data), update=lambda model, delta: model.fit(delta)
+)
+
+
+def get_model(data: pd.DataFrame):
+    return _models.get(data)
@@ -0,0 +1,312 @@
+"""In-process timings and counters for the app's hot paths.
+
+    SALARY_METRICS=0                  switch everything off (spans become no-ops)
+    SALARY_METRICS_PORT=9108          Prometheus text at http://localhost:9108/metrics
+    SALARY_METRICS_JSONL=metrics.jsonl  one JSON line per span / counter update
+    SALARY_PROFILE_INTERVAL=0.01      sampling profiler; collapsed stacks at /profile
+"""
+import atexit
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ENABLED = os.getenv("SALARY_METRICS", "1") != "0"
+PORT = int(os.getenv("SALARY_METRICS_PORT", 0))
+JSONL_PATH = os.getenv("SALARY_METRICS_JSONL")
+PROFILE_INTERVAL = float(os.getenv("SALARY_PROFILE_INTERVAL", 0))
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PREFIX = "salary_"
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+_NOOP = nullcontext()
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+class _Span:
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        labels = self.labels
+        if exc_type is not None:
+            labels = dict(labels, error=exc_type.__name__)
+        observe(self.name, time.perf_counter() - self.start, **labels)
+        return False
+
+
+# 👉 with metrics.span("home.range_view"): ...  (a shared no-op when disabled)
+def span(name, **labels):
+    if not ENABLED:
+        return _NOOP
+    return _Span(name, labels)
+
+
+# 👉 Decorator form of span(); returns the function untouched when disabled
+def timed(name, **labels):
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        def wrapper(*args, **kwargs):
+            with _Span(name, labels):
+                return fn(*args, **kwargs)
+        wrapper.__name__ = fn.__name__
+        wrapper.__doc__ = fn.__doc__
+        wrapper.__wrapped__ = fn
+        return wrapper
+    return decorate
+
+
+def count(name, amount=1, **labels):
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+    if _jsonl is not None:
+        _jsonl.write({"type": "counter", "name": name, "labels": labels, "value": amount})
+
+
+def observe(name, seconds, **labels):
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = [0, 0.0, [0] * len(BUCKETS)]
+        histogram[0] += 1
+        histogram[1] += seconds
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                histogram[2][i] += 1
+                break
+    if _jsonl is not None:
+        _jsonl.write({"type": "span", "name": name, "labels": labels, "seconds": round(seconds, 6)})
+
+
+# 👉 Plain-dict view: {"counters": {...}, "spans": {name: {count, total, mean}}}
+def snapshot():
+    with _lock:
+        counters = dict(_counters)
+        histograms = {key: (n, total) for key, (n, total, _) in _histograms.items()}
+
+    def label(key):
+        name, labels = key
+        return name + ("{" + ",".join(f"{k}={v}" for k, v in labels) + "}" if labels else "")
+
+    return {
+        "counters": {label(key): value for key, value in counters.items()},
+        "spans": {
+            label(key): {"count": n, "total_seconds": total, "mean_seconds": total / n if n else 0.0}
+            for key, (n, total) in histograms.items()
+        },
+    }
+
+
+def _metric_name(name):
+    return PREFIX + re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def _label_value(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_label_value(v)}"' for k, v in pairs) + "}"
+
+
+# 👉 Prometheus text exposition format (counters + span histograms)
+def prometheus_text():
+    with _lock:
+        counters = sorted(_counters.items())
+        histograms = sorted((key, (n, total, list(buckets))) for key, (n, total, buckets) in _histograms.items())
+
+    lines = []
+    typed = set()
+    for (name, labels), value in counters:
+        metric = _metric_name(name) + "_total"
+        if metric not in typed:
+            typed.add(metric)
+            lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric}{_label_text(labels)} {value}")
+    for (name, labels), (n, total, buckets) in histograms:
+        metric = _metric_name(name) + "_seconds"
+        if metric not in typed:
+            typed.add(metric)
+            lines.append(f"# TYPE {metric} histogram")
+        cumulative = 0
+        for bound, hits in zip(BUCKETS, buckets):
+            cumulative += hits
+            lines.append(f"{metric}_bucket{_label_text(labels, [('le', bound)])} {cumulative}")
+        lines.append(f"{metric}_bucket{_label_text(labels, [('le', '+Inf')])} {n}")
+        lines.append(f"{metric}_sum{_label_text(labels)} {total:.6f}")
+        lines.append(f"{metric}_count{_label_text(labels)} {n}")
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+class _JsonlWriter:
+    # Buffered append-only log; flushed every second and at exit
+    def __init__(self, path, flush_every=1.0):
+        self.path = path
+        self.flush_every = flush_every
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        atexit.register(self.flush)
+
+    def write(self, record):
+        record["ts"] = time.time()
+        line = json.dumps(record, default=str)
+        with self._lock:
+            self._buffer.append(line)
+            due = time.monotonic() - self._last_flush >= self.flush_every
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+        if lines:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+
+
+_jsonl = _JsonlWriter(JSONL_PATH) if ENABLED and JSONL_PATH else None
+
+
+class SamplingProfiler:
+    # Every `interval` seconds, records the Python stack of every other
+    # thread. Counts are kept as collapsed stacks ("a;b;c N"), the input
+    # format of flamegraph.pl / speedscope.
+    def __init__(self, interval=0.01, max_depth=48):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples = 0
+        self._stacks = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+                    frame = frame.f_back
+                collapsed = ";".join(reversed(stack))
+                with self._lock:
+                    self._stacks[collapsed] = self._stacks.get(collapsed, 0) + 1
+                    self.samples += 1
+
+    def collapsed(self):
+        with self._lock:
+            stacks = sorted(self._stacks.items(), key=lambda item: -item[1])
+        return "\n".join(f"{stack} {n}" for stack, n in stacks) + "\n"
+
+    # 👉 Functions that were on top of the stack most often
+    def top(self, limit=20):
+        leaves = {}
+        with self._lock:
+            for stack, n in self._stacks.items():
+                leaf = stack.rsplit(";", 1)[-1]
+                leaves[leaf] = leaves.get(leaf, 0) + n
+        return sorted(leaves.items(), key=lambda item: -item[1])[:limit]
+
+
+_profiler = SamplingProfiler(PROFILE_INTERVAL).start() if ENABLED and PROFILE_INTERVAL > 0 else None
+
+
+def profiler():
+    return _profiler
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/metrics":
+            body, content_type = prometheus_text(), "text/plain; version=0.0.4"
+        elif self.path == "/metrics.json":
+            body, content_type = json.dumps(snapshot()), "application/json"
+        elif self.path == "/profile" and _profiler is not None:
+            body, content_type = _profiler.collapsed(), "text/plain"
+        else:
+            self.send_error(404)
+            return
+        payload = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+_server = {"server": None}
+
+
+# 👉 Local exporter on a daemon thread; started once per process
+def serve(port=PORT):
+    if _server["server"] is not None or not port:
+        return _server["server"]
+    with _lock:
+        if _server["server"] is None:
+            try:
+                server = ThreadingHTTPServer(("127.0.0.1", port), _MetricsHandler)
+            except OSError:  # another worker process already serves this port
+                return None
+            threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+            _server["server"] = server
+    return _server["server"]
+
+
+if ENABLED and PORT:
+    serve(PORT)
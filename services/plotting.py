@@ -0,0 +1,106 @@
+import os
+
+import numpy as np
+import pandas as pd
+from plotly import graph_objs as go
+
+from services import metrics
+
+YEARS = "YearsExperience"
+SALARY = "Salary (in INR)"
+
+# Up to this many rows every point is sent as its own marker
+SCATTER_ROW_THRESHOLD = int(os.getenv("SCATTER_ROW_THRESHOLD", 20_000))
+# Up to this many rows a stratified sample is drawn with WebGL; beyond it the
+# server bins the points and only the density grid goes to the browser
+SAMPLE_ROW_THRESHOLD = int(os.getenv("SAMPLE_ROW_THRESHOLD", 500_000))
+SAMPLE_SIZE = int(os.getenv("SCATTER_SAMPLE_SIZE", 10_000))
+# Hard cap on the serialized size of one figure
+MAX_FIGURE_BYTES = int(os.getenv("MAX_FIGURE_BYTES", 2 * 1024 * 1024))
+DENSITY_BINS = 80
+
+
+def plot_mode(n_rows):
+    if n_rows <= SCATTER_ROW_THRESHOLD:
+        return "markers"
+    if n_rows <= SAMPLE_ROW_THRESHOLD:
+        return "sample"
+    return "density"
+
+
+# 👉 Sample that keeps every experience band represented: each whole-year
+# band gets a share proportional to its size, but at least a few rows
+def stratified_sample(frame: pd.DataFrame, n, column=YEARS, seed=0, min_per_band=5):
+    if len(frame) <= n:
+        return frame
+    bands = np.floor(frame[column].to_numpy(dtype=float))
+    bands = np.where(np.isnan(bands), -1, bands).astype(np.int64)
+    uniques, inverse, counts = np.unique(bands, return_inverse=True, return_counts=True)
+    quota = np.maximum(np.ceil(counts * (n / len(frame))), np.minimum(counts, min_per_band))
+
+    # Rank rows inside their band in random order, keep ranks under quota
+    order = np.random.default_rng(seed).permutation(len(frame))
+    shuffled = inverse[order]
+    by_band = np.argsort(shuffled, kind="stable")
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    rank = np.empty(len(frame), dtype=np.int64)
+    rank[by_band] = np.arange(len(frame)) - starts[shuffled[by_band]]
+    keep = order[rank < quota[shuffled]]
+    return frame.iloc[np.sort(keep)]
+
+
+# 👉 Server-side 2D histogram: only the bin grid is serialized
+def density_trace(x, y, bins=DENSITY_BINS, colorscale="Viridis"):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    known = ~(np.isnan(x) | np.isnan(y))
+    counts, x_edges, y_edges = np.histogram2d(x[known], y[known], bins=bins)
+    z = counts.T
+    z[z == 0] = np.nan  # empty bins stay transparent
+    return go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        z=z,
+        colorscale=colorscale,
+        colorbar=dict(title="Rows"),
+        hovertemplate="<b>Experience:</b> %{x:.1f} years<br><b>Salary:</b> ₹%{y:,.0f}"
+                      "<br><b>Rows:</b> %{z}<extra></extra>"
+    )
+
+
+def figure_bytes(fig):
+    with metrics.span("figure.serialize"):
+        return len(fig.to_json().encode())
+
+
+# 👉 Build a figure, shrinking the sample/bins until it fits the size cap.
+# builder(mode, frame, bins) -> figure; returns (figure, caption)
+def capped_figure(data: pd.DataFrame, builder):
+    mode = plot_mode(len(data))
+    sample_size, bins = SAMPLE_SIZE, DENSITY_BINS
+    while True:
+        if mode == "markers":
+            fig, shown, note = builder(mode, data, None), len(data), "all points"
+        elif mode == "sample":
+            sample = stratified_sample(data, sample_size)
+            fig, shown, note = builder(mode, sample, None), len(sample), "stratified sample, WebGL"
+        else:
+            fig, shown, note = builder(mode, data, bins), len(data), f"{bins}×{bins} density grid"
+
+        size = figure_bytes(fig)
+        if size <= MAX_FIGURE_BYTES:
+            break
+        # Too big for one render: fall back to cheaper representations
+        if mode == "markers":
+            mode = "sample"
+        elif mode == "sample" and sample_size > 500:
+            sample_size //= 2
+        elif mode == "sample":
+            mode = "density"
+        elif bins > 10:
+            bins //= 2
+        else:
+            break
+
+    caption = f"{shown:,} of {len(data):,} rows · {note} · {size / 1024:,.0f} KiB"
+    return fig, caption
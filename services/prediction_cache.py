@@ -0,0 +1,175 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from services import cache_db, coordinator, metrics
+from services.cache_keys import EXPERIENCE_BUCKET, KEY_VERSION, cache_key
+from services.gemini import GEMINI_MODEL, PROMPT_VERSION
+
+# Persistent tier limits (salary_cache.db)
+TTL_SECONDS = int(float(os.getenv("SALARY_CACHE_TTL_HOURS", 24 * 30)) * 3600)
+MAX_ROWS = int(os.getenv("SALARY_CACHE_MAX_ROWS", 50_000))
+# In-process tier limits
+LRU_SIZE = int(os.getenv("SALARY_CACHE_LRU_SIZE", 1024))
+# Run eviction on the persistent tier every N saves
+EVICT_EVERY = int(os.getenv("SALARY_CACHE_EVICT_EVERY", 100))
+
+
+class LRUCache:
+    # Thread-safe LRU with per-entry TTL, shared by all sessions in the process
+    def __init__(self, max_size=LRU_SIZE, ttl_seconds=TTL_SECONDS):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, stored_at = entry
+            if self.ttl_seconds and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# 👉 Generate input hash key: normalized fields, experience band, model and
+# prompt version (see services/cache_keys.py)
+def generate_input_hash(job_title, employment_type, industry, company_size, years_exp, remote, location, education_level):
+    profile = {
+        "job_title": job_title,
+        "employment_type": employment_type,
+        "industry": industry,
+        "company_size": company_size,
+        "years_exp": years_exp,
+        "remote": remote,
+        "location": location,
+        "education_level": education_level,
+    }
+    return cache_key(profile, GEMINI_MODEL, PROMPT_VERSION, EXPERIENCE_BUCKET)
+
+
+_memory = LRUCache()
+_stats_lock = threading.Lock()
+_stats = {
+    "memory_hits": 0,
+    "shared_hits": 0,
+    "db_hits": 0,
+    "misses": 0,
+    "saves": 0,
+    "evicted": 0,
+}
+
+
+def _count(name, amount=1):
+    with _stats_lock:
+        _stats[name] += amount
+    metrics.count(f"prediction_cache.{name}", amount)
+
+
+# 👉 Memory first, then the coordinator's shared tier when serving with
+# several workers, then salary_cache.db; hits are promoted into the faster
+# tiers. record=False skips the hit/miss counters for internal re-checks
+def get(input_hash, record=True):
+    result = _memory.get(input_hash)
+    if result is not None:
+        if record:
+            _count("memory_hits")
+        return result
+
+    shared = coordinator.enabled()
+    if shared:
+        result = coordinator.call("cache", "get", input_hash)
+        if result is not None:
+            if record:
+                _count("shared_hits")
+            _memory.put(input_hash, result)
+            return result
+
+    result = cache_db.get_cached_result(input_hash, ttl_seconds=TTL_SECONDS)
+    if result is not None:
+        if record:
+            _count("db_hits")
+        _memory.put(input_hash, result)
+        if shared:
+            coordinator.call("cache", "put_many", [(input_hash, result)])
+        return result
+
+    if record:
+        _count("misses")
+    return None
+
+
+def put(input_hash, result):
+    put_many([(input_hash, result)])
+
+
+def put_many(items):
+    items = list(items)
+    cache_db.save_results(items)
+    for input_hash, result in items:
+        _memory.put(input_hash, result)
+    if coordinator.enabled():
+        coordinator.call("cache", "put_many", items)
+
+    with _stats_lock:
+        before = _stats["saves"]
+        _stats["saves"] += len(items)
+        due = before // EVICT_EVERY != _stats["saves"] // EVICT_EVERY
+    if due:
+        evict()
+
+
+# 👉 Keep the persistent tier bounded by age and row count
+def evict():
+    removed = cache_db.evict(ttl_seconds=TTL_SECONDS, max_rows=MAX_ROWS)
+    _count("evicted", removed)
+    return removed
+
+
+_started = {"done": False}
+_started_lock = threading.Lock()
+
+
+# 👉 Once per process, at startup: create the table if needed, then trim
+# expired rows. Later calls (every rerun of app.py) return immediately.
+def startup():
+    if _started["done"]:
+        return
+    with _started_lock:
+        if not _started["done"]:
+            cache_db.init_db()
+            evict()
+            _started["done"] = True
+
+
+def stats():
+    with _stats_lock:
+        snapshot = dict(_stats)
+    hits = snapshot["memory_hits"] + snapshot["shared_hits"] + snapshot["db_hits"]
+    lookups = hits + snapshot["misses"]
+    snapshot["memory_size"] = len(_memory)
+    snapshot["lookups"] = lookups
+    snapshot["hit_rate"] = hits / lookups if lookups else 0.0
+    # Tuning knobs the hit rate depends on
+    snapshot["key_version"] = KEY_VERSION
+    snapshot["experience_bucket"] = EXPERIENCE_BUCKET
+    return snapshot
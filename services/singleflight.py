@@ -0,0 +1,34 @@
+import threading
+
+
+class SingleFlight:
+    # Collapses concurrent calls that share a key into one execution: the
+    # first caller starts the work on the executor, everyone else arriving
+    # while it is in flight gets the same Future.
+    def __init__(self, executor):
+        self._executor = executor
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.started = 0
+        self.joined = 0
+
+    def submit(self, key, fn, *args, **kwargs):
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.joined += 1
+                return future
+            future = self._executor.submit(fn, *args, **kwargs)
+            self._calls[key] = future
+            self.started += 1
+        future.add_done_callback(lambda f: self._forget(key, f))
+        return future
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
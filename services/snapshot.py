@@ -0,0 +1,72 @@
+import json
+import os
+
+try:
+    import pyarrow as pa
+except ImportError:  # snapshots are an optimisation; fall back to the CSV
+    pa = None
+
+import pandas as pd
+
+# Uncompressed Arrow IPC file next to the CSV. Numeric buffers are mapped
+# straight from disk, so several worker processes loading the same snapshot
+# share page-cache pages instead of each parsing a private copy.
+SNAPSHOT_SUFFIX = ".arrow"
+ENABLED = os.getenv("SALARY_SNAPSHOT", "1") != "0" and pa is not None
+
+_META_KEY = b"salary_snapshot"
+
+
+def snapshot_path(csv_path):
+    return os.path.splitext(csv_path)[0] + SNAPSHOT_SUFFIX
+
+
+def source_signature(csv_path):
+    st = os.stat(csv_path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+# 👉 Typed frame from the snapshot, or None when missing/stale/disabled
+def load(csv_path):
+    if not ENABLED:
+        return None
+    path = snapshot_path(csv_path)
+    try:
+        source = pa.memory_map(path, "r")
+    except (FileNotFoundError, OSError):
+        return None
+    try:
+        reader = pa.ipc.open_file(source)
+        meta = json.loads((reader.schema.metadata or {}).get(_META_KEY, b"{}"))
+        if meta.get("source") != source_signature(csv_path):
+            return None
+        table = reader.read_all()
+    except (pa.ArrowInvalid, ValueError, FileNotFoundError):
+        return None
+    # split_blocks keeps each null-free numeric column as a view on the map
+    frame = table.to_pandas(split_blocks=True)
+    frame.attrs["snapshot_meta"] = meta
+    return frame
+
+
+# 👉 Write the snapshot atomically; extra metadata travels with it.
+# `source` is source_signature() taken before the CSV was read: if the CSV
+# has changed since, the frame is not that file and nothing is written.
+def write(csv_path, frame: pd.DataFrame, source=None, **meta):
+    if not ENABLED:
+        return False
+    current = source_signature(csv_path)
+    if source is not None and source != current:
+        return False
+    meta["source"] = current
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), _META_KEY: json.dumps(meta).encode()}
+    )
+    path = snapshot_path(csv_path)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, path)
+    return True
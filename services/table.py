@@ -0,0 +1,118 @@
+import math
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from services import dataset, metrics
+
+PAGE_SIZES = [25, 50, 100, 250, 500]
+DEFAULT_PAGE_SIZE = int(os.getenv("TABLE_PAGE_SIZE", 100))
+if DEFAULT_PAGE_SIZE not in PAGE_SIZES:
+    PAGE_SIZES = sorted(PAGE_SIZES + [DEFAULT_PAGE_SIZE])
+
+
+# 👉 Sortable key per row: numbers as-is, labels by their sorted rank,
+# missing values as NaN (argsort puts NaN last in both directions)
+def sort_keys(values: pd.Series):
+    if pd.api.types.is_numeric_dtype(values.dtype) and not isinstance(values.dtype, pd.CategoricalDtype):
+        return values.to_numpy(dtype=np.float64, na_value=np.nan)
+    if isinstance(values.dtype, pd.CategoricalDtype) and values.cat.ordered:
+        codes = values.cat.codes.to_numpy()
+        return np.where(codes >= 0, codes, np.nan)
+    codes, uniques = pd.factorize(values)
+    labels = np.asarray(uniques, dtype=object).astype(str)
+    rank = np.empty(len(labels), dtype=np.float64)
+    rank[np.argsort(labels, kind="stable")] = np.arange(len(labels))
+    return np.where(codes >= 0, rank[codes] if len(rank) else 0, np.nan)
+
+
+class SortIndex:
+    # Per-column sort keys and full orderings, built lazily on first use and
+    # shared by every session for one dataset version. A page request then
+    # only orders the filtered row positions it needs, never the frame.
+    def __init__(self, data: pd.DataFrame):
+        self.data = data
+        self.n_rows = len(data)
+        self._keys = {}
+        self._orders = {}
+        self._ranks = {}
+        self._lock = threading.Lock()
+
+    def keys(self, column):
+        keys = self._keys.get(column)
+        if keys is None:
+            with self._lock:
+                keys = self._keys.get(column)
+                if keys is None:
+                    with metrics.span("sort_index.keys"):
+                        keys = sort_keys(self.data[column])
+                    self._keys[column] = keys
+        return keys
+
+    def order(self, column, ascending=True):
+        order = self._orders.get((column, ascending))
+        if order is None:
+            keys = self.keys(column)
+            order = np.argsort(keys if ascending else -keys, kind="stable")
+            order = order.astype(_index_dtype(self.n_rows))
+            with self._lock:
+                self._orders[(column, ascending)] = order
+        return order
+
+    # rank[row] = place of the row in order(); unique, so ties stay stable
+    def rank(self, column, ascending=True):
+        rank = self._ranks.get((column, ascending))
+        if rank is None:
+            order = self.order(column, ascending)
+            rank = np.empty(self.n_rows, dtype=order.dtype)
+            rank[order] = np.arange(self.n_rows, dtype=order.dtype)
+            with self._lock:
+                self._ranks[(column, ascending)] = rank
+        return rank
+
+    # 👉 Row positions (e.g. from FilterIndex.filter) in sorted order; with
+    # a limit only the first `limit` of them are ordered (enough for a page)
+    def sort(self, positions, column, ascending=True, limit=None):
+        if column is None:
+            return positions
+        if positions is None or len(positions) == self.n_rows:
+            return self.order(column, ascending)[:limit]
+        rank = self.rank(column, ascending)[positions]
+        if limit is not None and limit < len(rank):
+            top = np.argpartition(rank, limit - 1)[:limit] if limit > 0 else rank[:0]
+            return positions[top[np.argsort(rank[top])]]
+        return positions[np.argsort(rank)]
+
+
+def _index_dtype(n_rows):
+    return np.int32 if n_rows < 2**31 else np.int64
+
+
+# 👉 Shared sort index for the current dataset version. Orders are built
+# lazily per column, so after an append only the sorted columns pay again.
+_sort_indexes = dataset.VersionedCache("sort_index", SortIndex)
+
+
+def get_sort_index(data: pd.DataFrame):
+    return _sort_indexes.get(data)
+
+
+# 👉 Clamp the page number and return (page, pages, start, stop)
+def page_bounds(total, page, page_size):
+    pages = max(1, math.ceil(total / page_size))
+    page = min(max(int(page), 1), pages)
+    start = (page - 1) * page_size
+    return page, pages, start, min(start + page_size, total)
+
+
+# 👉 Materialize only the visible rows, numbered by their place in the result
+def window(data: pd.DataFrame, positions, start, stop):
+    if positions is None:
+        rows = data.iloc[start:stop]
+    else:
+        rows = data.take(positions[start:stop])
+    rows = rows.copy(deep=False)
+    rows.index = pd.RangeIndex(start + 1, start + 1 + len(rows), name="S. No.")
+    return rows
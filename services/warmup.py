@@ -0,0 +1,148 @@
+"""Pre-fill salary_cache.db with the most requested profiles.
+
+Profiles are ranked by how often their cache key occurs in the source CSVs
+(the dataset by default, or request logs exported with the same columns).
+Keys already cached are skipped, so an interrupted run simply resumes.
+
+    python -m services.warmup --budget 200 --workers 4 --per-prompt 5
+    python -m services.warmup --source requests_log.csv --dry-run
+    python -m services.warmup --stub      # offline, no Gemini calls
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+from services import cache_db, prediction_cache
+from services.batch import CallBudget, predict_batch
+from services.cache_keys import EXPERIENCE_BUCKET
+from services.dataset import CSV_FILE
+from services.gemini import DATASET_COLUMNS, GeminiClient, StubClient
+from services.prediction_cache import generate_input_hash
+
+PROFILE_COLUMNS = [col for col in DATASET_COLUMNS if col != "YearsExperience"]
+
+
+def _band_years(years, bucket):
+    # Middle of the experience band: the prompt asks about a typical
+    # profile of the band, and the value still maps to the band's key
+    years = np.round(years.astype(float), 1)
+    if bucket <= 0:
+        return years
+    return np.floor(years / bucket + 1e-9) * bucket + bucket / 2
+
+
+# 👉 One row per cache key, most requested first, with its request count
+def rank_profiles(frames, bucket=EXPERIENCE_BUCKET):
+    counts = {}
+    representative = {}
+    for frame in frames:
+        frame = frame[list(DATASET_COLUMNS)].dropna()
+        bands = frame[PROFILE_COLUMNS].astype(str).assign(
+            YearsExperience=_band_years(frame["YearsExperience"].to_numpy(), bucket)
+        )
+        # Count per distinct (fields, band) first, then hash each group once
+        grouped = bands.groupby(list(bands.columns), sort=False).size()
+        for values, count in grouped.items():
+            row = dict(zip(grouped.index.names, values))
+            key = generate_input_hash(**{DATASET_COLUMNS[col]: value for col, value in row.items()})
+            counts[key] = counts.get(key, 0) + int(count)
+            representative.setdefault(key, row)
+
+    ranked = pd.DataFrame(
+        [dict(representative[key], input_hash=key, requests=count) for key, count in counts.items()],
+        columns=list(DATASET_COLUMNS) + ["input_hash", "requests"],
+    )
+    return ranked.sort_values("requests", ascending=False, kind="stable").reset_index(drop=True)
+
+
+# 👉 Share of keys, and of requests, the cache would answer
+def coverage(ranked, cached_keys):
+    is_cached = ranked["input_hash"].isin(cached_keys)
+    total = int(ranked["requests"].sum())
+    return {
+        "keys": len(ranked),
+        "cached_keys": int(is_cached.sum()),
+        "key_coverage": float(is_cached.mean()) if len(ranked) else 0.0,
+        "projected_hit_rate": int(ranked.loc[is_cached, "requests"].sum()) / total if total else 0.0,
+    }
+
+
+def _cached_keys(ranked):
+    return set(cache_db.get_cached_results(ranked["input_hash"], ttl_seconds=prediction_cache.TTL_SECONDS))
+
+
+# 👉 Fill the most requested missing keys with at most `budget` model calls,
+# fallback prompts for malformed packed answers included. Work is committed
+# chunk by chunk, so progress survives an interruption.
+def warm_up(ranked, client, budget, max_workers=4, per_prompt=1, chunk_prompts=20, log=print):
+    cache_db.init_db()
+    before = coverage(ranked, _cached_keys(ranked))
+    missing = ranked[~ranked["input_hash"].isin(_cached_keys(ranked))]
+    per_prompt = max(per_prompt, 1)
+    calls = CallBudget(budget)
+
+    report = {"before": before, "requested": 0, "answered": 0, "prompts": 0, "calls": 0, "failed": 0}
+    start = 0
+    # Each chunk is sized to the calls left, so planning stops with the budget
+    while start < len(missing) and calls.remaining > 0:
+        chunk = missing.iloc[start:start + min(chunk_prompts, calls.remaining) * per_prompt]
+        start += len(chunk)
+        _, stats = predict_batch(
+            chunk[list(DATASET_COLUMNS)], client, max_workers=max_workers, per_prompt=per_prompt,
+            budget=calls,
+        )
+        report["requested"] += stats["requested"]
+        report["answered"] += stats["requested"] - stats["unanswered"]
+        report["prompts"] += stats["prompts"]
+        report["failed"] += stats["failed"]
+        report["calls"] = calls.used
+        log(f"  {start:>6}/{len(missing)} profiles, {report['calls']}/{budget} model calls, "
+            f"{report['failed']} failed")
+
+    report["after"] = coverage(ranked, _cached_keys(ranked))
+    return report
+
+
+def _describe(label, cov):
+    return (f"{label}: {cov['cached_keys']:,}/{cov['keys']:,} keys cached "
+            f"({cov['key_coverage']:.1%}), projected hit rate {cov['projected_hit_rate']:.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", nargs="+", default=[CSV_FILE],
+                        help="CSVs with the dataset's columns (dataset or request logs)")
+    parser.add_argument("--budget", type=int, default=100, help="Maximum model calls for this run")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent model requests")
+    parser.add_argument("--per-prompt", type=int, default=1, help="Profiles packed into one prompt")
+    parser.add_argument("--dry-run", action="store_true", help="Only report coverage and the plan")
+    parser.add_argument("--stub", action="store_true", help="Use the offline stub model")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    cache_db.init_db()
+    ranked = rank_profiles(pd.read_csv(path) for path in args.source)
+    before = coverage(ranked, _cached_keys(ranked))
+    missing = before["keys"] - before["cached_keys"]
+    print(f"{int(ranked['requests'].sum()):,} source rows -> {len(ranked):,} cache keys "
+          f"(experience bands of {EXPERIENCE_BUCKET:g} yr)")
+    print(_describe("Before", before))
+    planned = min(missing, args.budget * max(args.per_prompt, 1))
+    print(f"Plan: {planned:,} of {missing:,} missing keys in "
+          f"{math.ceil(planned / max(args.per_prompt, 1)):,} model calls (budget {args.budget}, "
+          f"fallback calls for malformed packed answers included)")
+    if args.dry_run or not planned:
+        return
+
+    client = StubClient() if args.stub else GeminiClient()
+    report = warm_up(ranked, client, args.budget, max_workers=args.workers, per_prompt=args.per_prompt)
+    print(_describe("After", report["after"]))
+    print(f"{report['answered']}/{report['requested']} profiles answered in {report['calls']} model calls, "
+          f"{report['failed']} failed prompts, {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import os
+import tempfile
+
+# Before any service module is imported: keep the real cache DB out of the
+# tests and run single-process (no coordinator)
+os.environ["SALARY_CACHE_DB"] = os.path.join(tempfile.mkdtemp(prefix="salary-tests-"), "cache.db")
+os.environ.pop("SALARY_SERVICE_ADDR", None)
+
+import pytest  # noqa: E402
+
+from benchmarks.synthetic import write_csv  # noqa: E402
+from services import dataset  # noqa: E402
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = write_csv(str(tmp_path / "Employee_Salary_Data.csv"), 50, seed=1)
+    dataset.invalidate()
+    yield path
+    dataset.invalidate()
+
+
+def rows_on_disk(path):
+    with open(path, "rb") as f:
+        rows = f.read().count(b"\n") - 1  # header
+    journal = path + dataset.JOURNAL_SUFFIX
+    if os.path.exists(journal):
+        with open(journal, "rb") as f:
+            rows += f.read().count(b"\n")
+    return rows
@@ -0,0 +1,43 @@
+import os
+
+from benchmarks.synthetic import make_rows
+from services import contributions, dataset
+
+from conftest import rows_on_disk
+
+
+def test_interrupted_bulk_append_is_rolled_back(csv_path):
+    contributions.append_rows(make_rows(2, seed=1), csv_path)
+    journal = contributions.journal_path(csv_path)
+    size = os.path.getsize(journal)
+    contributions._write_intent(csv_path, {"phase": "ingest", "journal_size": size})
+    with open(journal, "ab") as f:
+        f.write(contributions._encode_rows(make_rows(3, seed=2))[:-20])  # crash mid-copy
+
+    contributions.append_rows(make_rows(1, seed=3), csv_path)
+    assert not os.path.exists(csv_path + dataset.INTENT_SUFFIX)
+    assert rows_on_disk(csv_path) == 53
+    dataset.invalidate()
+    assert len(dataset.load_dataset(csv_path)) == 53
+
+
+def test_bulk_append_intent_without_a_journal(csv_path):
+    # Crash after the intent was written, before the journal was created
+    contributions._write_intent(csv_path, {"phase": "ingest", "journal_size": 0})
+    contributions.append_rows(make_rows(1, seed=4), csv_path)
+    assert not os.path.exists(csv_path + dataset.INTENT_SUFFIX)
+    assert rows_on_disk(csv_path) == 51
+
+
+def test_interrupted_compaction_is_finished(csv_path):
+    contributions.append_rows(make_rows(4, seed=5), csv_path)
+    csv_size = os.path.getsize(csv_path)
+    contributions._write_intent(csv_path, {"phase": "append", "csv_size": csv_size})
+    with open(csv_path, "ab") as f:
+        f.write(b"Data Analyst,SaaS")  # partial copy of the journal
+
+    assert contributions.compact(csv_path) == 0
+    assert os.path.getsize(contributions.journal_path(csv_path)) == 0
+    assert rows_on_disk(csv_path) == 54
+    dataset.invalidate()
+    assert len(dataset.load_dataset(csv_path)) == 54
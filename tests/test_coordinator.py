@@ -0,0 +1,89 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from benchmarks.synthetic import make_rows
+from services import contributions, coordinator
+
+from conftest import rows_on_disk
+
+KEY = "test-key"
+
+
+class FakeWriter:
+    def __init__(self):
+        self.calls = 0
+
+    def append_rows(self, rows, path=None):
+        self.calls += 1
+        raise ValueError("disk full")
+
+    def append_file(self, spool_path, path=None):
+        self.calls += 1
+        time.sleep(1)
+        return 1
+
+
+def _use(monkeypatch, address):
+    monkeypatch.setattr(coordinator, "SERVICE_ADDR", address)
+    monkeypatch.setattr(coordinator, "_CLIENT_KEY", KEY)
+    monkeypatch.setattr(coordinator, "_client", dict(manager=None, cache=None, writer=None, down_until=0.0))
+
+
+@pytest.fixture
+def writer(monkeypatch):
+    # A coordinator in this process, serving a writer that fails
+    fake = FakeWriter()
+    monkeypatch.setitem(coordinator._writer, "writer", fake)
+    manager = coordinator.ServiceManager(address=("127.0.0.1", 0), authkey=KEY.encode())
+    server = manager.get_server()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    _use(monkeypatch, "%s:%d" % server.address)
+    return fake
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_unreachable_coordinator_falls_back_to_a_local_append(csv_path, monkeypatch):
+    _use(monkeypatch, f"127.0.0.1:{_free_port()}")
+    assert contributions.append_rows(make_rows(2, seed=1), csv_path) == 2
+    assert rows_on_disk(csv_path) == 52
+    assert not coordinator.enabled()  # local fallbacks for a while
+
+
+def test_failed_remote_write_is_raised_not_repeated_locally(csv_path, writer):
+    with pytest.raises(coordinator.CoordinatorError):
+        contributions.append_rows(make_rows(2, seed=1), csv_path)
+    assert writer.calls == 1
+    assert rows_on_disk(csv_path) == 50
+    # Reads still fall back quietly, and the coordinator is not marked down
+    assert coordinator.call("writer", "append_rows", [], default="local") == "local"
+    assert coordinator.enabled()
+
+
+def test_slow_remote_write_times_out(csv_path, writer, tmp_path, monkeypatch):
+    spool = tmp_path / "upload.ingest"
+    spool.write_bytes(contributions._encode_rows(make_rows(3, seed=2)))
+    monkeypatch.setattr(coordinator, "WRITE_TIMEOUT_SECONDS", 0.2)
+    with pytest.raises(coordinator.CoordinatorError):
+        contributions.append_file(str(spool), csv_path)
+    # The coordinator may still apply it, so nothing was appended here
+    assert rows_on_disk(csv_path) == 50
+
+
+def test_a_key_is_required_off_loopback(monkeypatch):
+    monkeypatch.setattr(coordinator, "SERVICE_KEY", None)
+    assert coordinator.service_key("127.0.0.1:8599") == coordinator.LOOPBACK_KEY
+    assert coordinator.service_key("localhost:8599") == coordinator.LOOPBACK_KEY
+    with pytest.raises(RuntimeError, match="SALARY_SERVICE_KEY"):
+        coordinator.service_key("0.0.0.0:8599")
+    with pytest.raises(RuntimeError):
+        coordinator.service_key("cache.internal:8599")
+    monkeypatch.setattr(coordinator, "SERVICE_KEY", "secret")
+    assert coordinator.service_key("10.0.0.5:8599") == "secret"
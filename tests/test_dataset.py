@@ -0,0 +1,144 @@
+import threading
+import time
+
+import pytest
+
+from benchmarks.synthetic import make_rows
+from services import contributions, dataset, snapshot
+
+from conftest import rows_on_disk
+
+
+def _fresh(path):
+    dataset.invalidate()
+    return dataset.load_dataset(path)
+
+
+def test_reload_racing_an_append_reads_the_row_once(csv_path, monkeypatch):
+    dataset.load_dataset(csv_path)
+    contributions.append_rows(make_rows(2, seed=2), csv_path)
+    dataset.invalidate()
+
+    read_canonical = dataset._read_canonical
+    writer = []
+
+    def racing_read(path):
+        # Another session contributes while this reload holds the lock
+        size = rows_on_disk(path)
+        thread = threading.Thread(target=contributions.append_rows, args=(make_rows(1, seed=3), path))
+        thread.start()
+        writer.append(thread)
+        while rows_on_disk(path) == size:
+            time.sleep(0.01)
+        return read_canonical(path)
+
+    monkeypatch.setattr(dataset, "_read_canonical", racing_read)
+    dataset.load_dataset(csv_path)
+    monkeypatch.setattr(dataset, "_read_canonical", read_canonical)
+    writer[0].join()
+
+    data = dataset.load_dataset(csv_path)
+    assert len(data) == rows_on_disk(csv_path) == 53
+    assert data.equals(_fresh(csv_path))
+
+
+def test_delta_append_matches_a_full_reload(csv_path):
+    dataset.load_dataset(csv_path)
+    for seed in range(5):
+        contributions.append_rows(make_rows(3, seed=seed + 10), csv_path)
+    data = dataset.load_dataset(csv_path)
+    assert dataset.load_stats()["appends"] >= 5
+    assert len(data) == rows_on_disk(csv_path) == 65
+    assert data.equals(_fresh(csv_path))
+
+
+def test_partial_journal_line_is_left_for_the_next_load(csv_path):
+    dataset.load_dataset(csv_path)
+    line = contributions._encode_rows(make_rows(1, seed=4))
+    with open(contributions.journal_path(csv_path), "ab") as f:
+        f.write(line[:10])
+    assert len(dataset.load_dataset(csv_path)) == 50
+    with open(contributions.journal_path(csv_path), "ab") as f:
+        f.write(line[10:])
+    data = dataset.load_dataset(csv_path)
+    assert len(data) == 51
+    assert data.equals(_fresh(csv_path))
+
+
+def _append_raw(path, rows):
+    # Another worker process writing the journal
+    with open(contributions.journal_path(path), "ab") as f:
+        f.write(contributions._encode_rows(rows))
+
+
+def test_append_by_another_process_during_reload_is_applied_once(csv_path, monkeypatch):
+    read_canonical = dataset._read_canonical
+
+    def racing_read(path):
+        _append_raw(path, make_rows(1, seed=5))
+        return read_canonical(path)
+
+    _append_raw(csv_path, make_rows(2, seed=6))
+    monkeypatch.setattr(dataset, "_read_canonical", racing_read)
+    dataset.load_dataset(csv_path)
+    monkeypatch.setattr(dataset, "_read_canonical", read_canonical)
+
+    data = dataset.load_dataset(csv_path)  # picks the racing row up as growth
+    assert len(data) == rows_on_disk(csv_path) == 53
+    assert data.equals(_fresh(csv_path))
+
+
+def test_compaction_during_journal_growth_falls_back_to_a_reload(csv_path, monkeypatch):
+    dataset.load_dataset(csv_path)
+    _append_raw(csv_path, make_rows(2, seed=7))
+    read_bytes = dataset._read_journal_bytes
+
+    def racing_read(path, start, end):
+        monkeypatch.setattr(dataset, "_read_journal_bytes", read_bytes)
+        contributions.compact(path)
+        _append_raw(path, make_rows(1, seed=8))
+        return read_bytes(path, start, end)
+
+    monkeypatch.setattr(dataset, "_read_journal_bytes", racing_read)
+    data = dataset.load_dataset(csv_path)
+    assert len(data) == rows_on_disk(csv_path) == 53
+    assert data.equals(_fresh(csv_path))
+
+
+def _blank_row(seed):
+    row = make_rows(1, seed=seed)[0]
+    row["Industry"] = ""  # read back as NaN: an all-missing delta column
+    return row
+
+
+@pytest.mark.parametrize("source", ["csv", "snapshot"])
+def test_appending_a_missing_label_keeps_the_dataset_loadable(csv_path, source):
+    if source == "snapshot":
+        if not snapshot.ENABLED:
+            pytest.skip("pyarrow not installed")
+        dataset.load_dataset(csv_path)  # writes the snapshot
+        dataset.invalidate()
+    dataset.load_dataset(csv_path)
+    assert dataset.load_stats()["source"] == source
+
+    contributions.append_row(_blank_row(seed=7), csv_path)
+    new_label = make_rows(1, seed=9)[0]
+    new_label["Industry"] = "Aardvarks"  # sorts first: every code moves
+    contributions.append_rows([_blank_row(seed=8), new_label], csv_path)
+    data = dataset.load_dataset(csv_path)
+    assert dataset.load_stats()["appends"] >= 2
+    assert len(data) == 53
+    assert data["Industry"].iloc[-3:-1].isna().all()
+    assert data.equals(_fresh(csv_path))
+
+
+def test_large_salaries_are_stored_exactly(csv_path):
+    dataset.load_dataset(csv_path)
+    rows = make_rows(2, seed=11)
+    rows[0]["Salary (in INR)"] = 123456789
+    rows[1]["Salary (in INR)"] = 123456792
+    contributions.append_rows(rows, csv_path)
+    for data in (dataset.load_dataset(csv_path), _fresh(csv_path)):
+        shown = dataset.format_for_display(data.tail(2))
+        assert list(shown["Salary (in INR)"]) == ["123456789", "123456792"]
+        assert data["YearsExperience"].dtype == "float32"
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import make_rows
+from services import contributions, dataset, filter_index
+from services.filter_index import FILTER_FIELDS, FilterIndex
+
+
+def _same(index, fresh):
+    assert index.n_rows == fresh.n_rows
+    for field in FILTER_FIELDS:
+        assert index.values[field] == fresh.values[field]
+        assert np.array_equal(index.codes[field], fresh.codes[field])
+        assert index.positions[field].keys() == fresh.positions[field].keys()
+        for value, rows in fresh.positions[field].items():
+            assert np.array_equal(index.positions[field][value], rows)
+
+
+def test_extended_index_matches_a_fresh_build(csv_path):
+    data = dataset.load_dataset(csv_path)
+    index = FilterIndex(data.iloc[:20])
+    # Small steps reuse the spare buffer capacity, larger ones regrow it
+    for stop in (21, 23, 30, 50):
+        index = index.extended(data.iloc[index.n_rows:stop])
+        _same(index, FilterIndex(data.iloc[:stop]))
+    selections = {field: "All" for field in FILTER_FIELDS}
+    selections["Job Title"] = data["Job Title"].iloc[-1]
+    assert np.array_equal(index.filter(selections), FilterIndex(data).filter(selections))
+
+
+def test_only_the_newest_index_can_be_extended(csv_path):
+    data = dataset.load_dataset(csv_path)
+    index = FilterIndex(data.iloc[:40])
+    index.extended(data.iloc[40:45])
+    with pytest.raises(ValueError):
+        index.extended(data.iloc[40:45])
+
+
+def test_shared_index_follows_appends(csv_path):
+    data = dataset.load_dataset(csv_path)
+    first = filter_index.get_index(data)
+    contributions.append_rows(make_rows(4, seed=20), csv_path)
+    data = dataset.load_dataset(csv_path)
+    index = filter_index.get_index(data)
+    assert first._extended  # the append extended it instead of a rebuild
+    assert index.n_rows == len(data) == 54
+    _same(index, FilterIndex(data))
@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import make_rows
+from services import dataset, ingest
+
+
+@pytest.mark.parametrize("blank", ["", "   ", None, float("nan")])
+def test_normalize_row_refuses_a_blank_label(csv_path, blank):
+    data = dataset.load_dataset(csv_path)
+    row = make_rows(1, seed=2)[0]
+    row["Industry"] = blank
+    with pytest.raises(ValueError, match="Industry"):
+        ingest.normalize_row(row, data)
+
+
+def test_normalize_row_matches_existing_labels(csv_path):
+    data = dataset.load_dataset(csv_path)
+    row = make_rows(1, seed=2)[0]
+    label = row["Job Title"]
+    row["Job Title"] = f"  {label.lower()} "
+    assert ingest.normalize_row(row, data)["Job Title"] == label
+
+
+def test_close_large_salaries_are_not_duplicates(csv_path):
+    rows = make_rows(2, seed=3)
+    rows[1] = dict(rows[0])
+    rows[0]["Salary (in INR)"] = 123456789
+    rows[1]["Salary (in INR)"] = 123456792
+    frame, _ = dataset.apply_schema(pd.DataFrame(rows))
+    first, second = ingest.row_hashes(frame)
+    assert first != second
+
+
+def test_upload_duplicates_are_skipped(csv_path, tmp_path):
+    data = dataset.load_dataset(csv_path)
+    fresh = make_rows(3, seed=4)
+    existing = data.iloc[[0]].astype(object).to_dict("records")
+    upload = tmp_path / "upload.csv"
+    # Chunks of 4: the repeat in the first chunk is caught, the one in the
+    # second chunk (a row from the first) is not
+    pd.DataFrame([fresh[0], fresh[0], fresh[1], existing[0], fresh[2], fresh[1]]).to_csv(upload, index=False)
+    report = ingest.ingest(str(upload), csv_path, dry_run=True, chunk_rows=4)
+    assert report.rejected["duplicate"] == 1
+    assert report.rejected["duplicate_in_upload"] == 1
+    assert report.accepted == 4
+    assert report.chunks == 2
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from services.llm_client import AsyncLLMClient, BudgetExceeded, RetryableError
+
+
+class Backend:
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+
+    async def generate(self, prompt):
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return f"answer to {prompt}"
+
+    def is_retryable(self, exc):
+        return isinstance(exc, RetryableError)
+
+
+def _reason(client, prompts=1, budget=0.3):
+    async def run():
+        results = await asyncio.gather(
+            *(client.generate(f"p{i}", budget) for i in range(prompts)), return_exceptions=True
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        assert errors, results
+        assert all(isinstance(e, BudgetExceeded) for e in errors)
+        return errors[-1].reason
+    return asyncio.run(run())
+
+
+def test_a_full_rate_limit_queue_is_not_reported_as_a_slow_model():
+    client = AsyncLLMClient(Backend(), rate_per_minute=6, burst=1)
+    assert _reason(client, prompts=2) == "rate_limit"
+
+
+def test_a_backend_that_keeps_refusing_is_reported_as_such():
+    client = AsyncLLMClient(Backend(error=RetryableError("quota", retry_after=1)), rate_per_minute=6000)
+    assert _reason(client) == "retries"
+
+
+def test_a_slow_backend_is_a_timeout():
+    client = AsyncLLMClient(Backend(delay=1), rate_per_minute=6000)
+    assert _reason(client) == "timeout"
+
+
+def test_budget_exceeded_is_still_a_timeout_error():
+    with pytest.raises(TimeoutError):
+        raise BudgetExceeded("no answer", "timeout")
@@ -0,0 +1,26 @@
+import pytest
+
+from benchmarks.synthetic import make_rows
+from services import contributions, dataset, local_model
+from services.local_model import PROFILE_KEYS, SalaryModel
+
+
+def _profile(row):
+    profile = {key: row[field] for field, key in PROFILE_KEYS.items()}
+    profile["years_exp"] = row["YearsExperience"]
+    return profile
+
+
+def test_shared_model_takes_appended_rows_without_a_refit(csv_path):
+    data = dataset.load_dataset(csv_path)
+    model = local_model.get_model(data)
+    rows = make_rows(5, seed=12)
+    rows[0]["Job Title"] = "Data Wrangler"  # a new level widens the model
+    contributions.append_rows(rows, csv_path)
+    data = dataset.load_dataset(csv_path)
+    assert local_model.get_model(data) is model
+    assert model.n_rows == len(data) == 55
+
+    refit = SalaryModel().fit(data)
+    for row in data.tail(10).to_dict("records"):
+        assert model.predict(_profile(row)) == pytest.approx(refit.predict(_profile(row)))
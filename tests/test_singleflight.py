@@ -0,0 +1,77 @@
+import threading
+import time
+from concurrent import futures
+
+import pytest
+
+from routes import prediction
+from services.singleflight import SingleFlight
+
+
+def test_identical_concurrent_submissions_make_one_model_call(monkeypatch):
+    prediction.prediction_cache.startup()
+    calls = []
+    calls_lock = threading.Lock()
+
+    def counting_gemini(prompt):
+        with calls_lock:
+            calls.append(prompt)
+        time.sleep(0.2)
+        return "₹6,00,000 - ₹8,50,000 per annum"
+
+    monkeypatch.setattr(prediction, "call_gemini", counting_gemini)
+    input_hash = prediction.generate_input_hash(
+        "Single Flight Tester", "Full-time", "SaaS", "Large", 4.5, "Yes", "Pune", "Masters"
+    )
+    sessions = 30
+    barrier = threading.Barrier(sessions)
+    results = []
+
+    def session():
+        barrier.wait()
+        # Same path as show(): cache miss, then join or start the flight
+        cached = prediction.prediction_cache.get(input_hash)
+        if cached is None:
+            future = prediction._inflight.submit(
+                input_hash, prediction.predict_and_cache, input_hash, "prompt"
+            )
+            cached = future.result(timeout=10)
+        results.append(cached)
+
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert len(results) == sessions and set(results) == {"₹6,00,000 - ₹8,50,000 per annum"}
+    # The answer is cached: a later session makes no call at all
+    assert prediction.prediction_cache.get(input_hash) == results[0]
+    assert len(calls) == 1
+
+
+def test_failure_reaches_every_joiner_and_is_not_kept():
+    release = threading.Event()
+    runs = []
+
+    def work():
+        runs.append(1)
+        release.wait(5)
+        raise RuntimeError("quota exceeded")
+
+    with futures.ThreadPoolExecutor(max_workers=2) as pool:
+        flights = SingleFlight(pool)
+        first = flights.submit("key", work)
+        second = flights.submit("key", work)
+        assert first is second and flights.joined == 1
+        release.set()
+        with pytest.raises(RuntimeError):
+            first.result(timeout=5)
+        # Finished flights are forgotten (by a done callback that may run
+        # just after result() returns): the next submission runs again
+        deadline = time.monotonic() + 5
+        while flights.in_flight() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert flights.submit("key", lambda: "ok").result(timeout=5) == "ok"
+    assert len(runs) == 1 and flights.started == 2
@@ -0,0 +1,45 @@
+import pytest
+
+from benchmarks.synthetic import make_rows
+from services import contributions, dataset, snapshot
+
+from conftest import rows_on_disk
+
+pytestmark = pytest.mark.skipif(not snapshot.ENABLED, reason="pyarrow not installed")
+
+
+def test_snapshot_round_trip(csv_path):
+    data = dataset.load_dataset(csv_path)
+    frame = snapshot.load(csv_path)
+    assert frame is not None
+    frame.attrs.pop("snapshot_meta")
+    assert frame.equals(data)
+
+
+def test_compaction_between_read_and_snapshot_write(csv_path, monkeypatch):
+    with open(contributions.journal_path(csv_path), "ab") as f:
+        f.write(contributions._encode_rows(make_rows(2, seed=1)))
+    apply_schema = dataset.apply_schema
+
+    def racing_schema(frame):
+        # Another process folds the journal into the CSV after our read
+        monkeypatch.setattr(dataset, "apply_schema", apply_schema)
+        contributions.compact(csv_path)
+        return apply_schema(frame)
+
+    monkeypatch.setattr(dataset, "apply_schema", racing_schema)
+    assert len(dataset.load_dataset(csv_path)) == rows_on_disk(csv_path) == 52
+
+    # A new process maps the snapshot: it must hold the compacted rows
+    dataset.invalidate()
+    assert len(dataset.load_dataset(csv_path)) == 52
+    assert dataset.load_stats()["source"] == "snapshot"
+
+
+def test_snapshot_from_an_older_schema_is_not_used(csv_path):
+    data = dataset.load_dataset(csv_path)
+    snapshot.write(csv_path, data.astype({"Salary (in INR)": "float32"}), invalid={})
+    dataset.invalidate()
+    data = dataset.load_dataset(csv_path)
+    assert dataset.load_stats()["source"] == "csv"
+    assert data["Salary (in INR)"].dtype == "float64"
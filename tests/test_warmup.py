@@ -0,0 +1,47 @@
+import threading
+
+
+from benchmarks.synthetic import make_frame
+from services import warmup
+from services.batch import CallBudget, predict_batch
+from services.gemini import StubClient
+
+
+class GarbledPackClient(StubClient):
+    # Answers packed prompts with text that cannot be parsed, so every
+    # profile falls back to a prompt of its own
+    def generate(self, prompt):
+        answer = super().generate(prompt)
+        return "no idea" if "Profile 1" in prompt else answer
+
+
+def test_budget_counts_fallback_calls():
+    client = GarbledPackClient()
+    ranked = warmup.rank_profiles([make_frame(400, seed=1)])
+    report = warmup.warm_up(ranked, client, budget=7, max_workers=1, per_prompt=5, log=lambda *_: None)
+    assert client.calls == report["calls"] == 7
+    # Packed prompt, its five fallbacks, then one more packed prompt with no
+    # budget left for its fallbacks
+    assert report["answered"] == 5
+
+
+def test_budget_is_shared_by_concurrent_workers():
+    client = StubClient(latency=0.01)
+    frame = make_frame(200, seed=2)
+    budget = CallBudget(10)
+    out, stats = predict_batch(frame, client, max_workers=8, write_cache=False, budget=budget)
+    assert client.calls == stats["calls"] == 10
+    assert stats["unanswered"] == stats["requested"] - 10
+    assert out["Estimated Salary"].notna().sum() >= 10
+
+
+def test_call_budget_never_overshoots():
+    budget = CallBudget(100)
+    taken = []
+    threads = [threading.Thread(target=lambda: taken.extend(budget.take() for _ in range(50)))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sum(taken) == 100 and budget.remaining == 0